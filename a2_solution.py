@@ -2,14 +2,29 @@
 A model of a zombie survival game wherein the player has to reach
 the hospital whilst evading zombies.
 """
-from typing import Tuple, Optional, Dict, List
+from typing import (Tuple, Optional, Dict, List, Type, Iterable, Iterator, NamedTuple,
+                    TYPE_CHECKING)
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+import argparse
+import copy
+import math
+import mmap
+import os
 import random
+import re
+import time
+from binary_map import MAGIC, BinaryMap, parse_binary_map
 from constants import *
 
+if TYPE_CHECKING:
+    # replay imports this module, so Recorder is only imported for typing.
+    from replay import Recorder
+
 
 ## Support code
 
-def random_directions() -> List[Tuple[int, int]]:
+def random_directions(rng: Optional[random.Random] = None) -> List[Tuple[int, int]]:
     """
     Return a randomly sorted list of directions.
 
@@ -18,8 +33,12 @@ def random_directions() -> List[Tuple[int, int]]:
 
     Each direction is represented by an offset that is the change
     in (x, y) coordinates that results from moving in the direction.
+
+    Parameters:
+        rng: The random number generator to draw from, e.g. the game's,
+             or the global generator of the `random` module if None.
     """
-    return random.sample(OFFSETS, k=4)
+    return (rng or random).sample(OFFSETS, k=4)
 
 
 def first_in_direction(
@@ -34,16 +53,14 @@ def first_in_direction(
     Returns: A tuple of a position and the first entity found in the
         given direction, None if no entity found
     """
-    position = start.add(offset)
-
-    while grid.in_bounds(position):
-        entity = grid.get_entity(position)
-        if entity is not None:
-            return position, entity
+    return grid.first_in_direction(start, offset)
 
-        position = position.add(offset)
 
-    return None
+_POSITION_INTERN_LIMIT = 1 << 18
+"""
+The maximum number of distinct coordinates kept in the Position interning
+table. Coordinates beyond the limit still work, they are just not shared.
+"""
 
 
 class Position:
@@ -54,6 +71,10 @@ class Position:
     The x and y coordinates are assumed to be non-negative whole numbers which
     represent a square in a 2D grid.
 
+    Positions are immutable value objects. They use __slots__, cache their
+    hash and are interned, so constructing the same coordinates again returns
+    the shared instance instead of allocating a new one.
+
     Examples:
         >>> position = Position(2, 4)
         >>> position
@@ -62,19 +83,51 @@ class Position:
         2
         >>> position.get_y()
         4
+        >>> Position(2, 4) is position
+        True
     """
 
-    def __init__(self, x: int, y: int):
+    __slots__ = ("_x", "_y", "_hash")
+
+    _interned: Dict[Tuple[int, int], "Position"] = {}
+
+    def __new__(cls, x: int, y: int) -> "Position":
         """
         The position class is constructed from the x and y coordinate which the
         position represents.
 
+        If a position with the same coordinates has already been interned, that
+        instance is returned instead of a new one.
+
         Parameters:
             x: The x coordinate of the position
             y: The y coordinate of the position
         """
-        self._x = x
-        self._y = y
+        key = (x, y)
+        position = cls._interned.get(key)
+        if position is None:
+            position = object.__new__(cls)
+            object.__setattr__(position, "_x", x)
+            object.__setattr__(position, "_y", y)
+            object.__setattr__(position, "_hash", hash(key))
+            if len(cls._interned) < _POSITION_INTERN_LIMIT:
+                cls._interned[key] = position
+        return position
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Positions are immutable, so setting an attribute always fails."""
+        raise AttributeError(f"{self!r} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Positions are immutable, so deleting an attribute always fails."""
+        raise AttributeError(f"{self!r} is immutable")
+
+    def __reduce__(self) -> Tuple[type, Tuple[int, int]]:
+        """
+        Pickle and copy positions through the constructor so that unpickled
+        positions are interned as well.
+        """
+        return self.__class__, (self._x, self._y)
 
     def get_x(self) -> int:
         """Returns the x coordinate of the position."""
@@ -143,7 +196,7 @@ class Position:
             A new position representing the current position plus
             the given position.
         """
-        return Position(self._x + position.get_x(), self._y + position.get_y())
+        return Position(self._x + position._x, self._y + position._y)
 
     def __eq__(self, other: object) -> bool:
         """
@@ -159,9 +212,11 @@ class Position:
         # an __eq__ method needs to support any object for example
         # so it can handle `Position(1, 2) == 2`
         # https://www.pythontutorial.net/python-oop/python-__eq__/
+        if self is other:
+            return True
         if not isinstance(other, Position):
             return False
-        return self.get_x() == other.get_x() and self.get_y() == other.get_y()
+        return self._x == other._x and self._y == other._y
 
     def __hash__(self) -> int:
         """
@@ -172,11 +227,12 @@ class Position:
         A hash should be based on the unique data of a class, in the case
         of the position class, the unique data is the x and y values.
         Therefore, we can calculate an appropriate hash by hashing a tuple of
-        the x and y values.
+        the x and y values. Positions are immutable, so the hash is computed
+        once on construction and cached.
         
         Reference: https://stackoverflow.com/questions/17585730/what-does-hash-do-in-python
         """
-        return hash((self.get_x(), self.get_y()))
+        return self._hash
 
     def __repr__(self) -> str:
         """
@@ -276,6 +332,155 @@ def load_map(filename: str) -> Tuple[EntityLocations, int]:
     return result, len(contents)
 
 
+# Matches every map character which is not empty space.
+_MAP_TOKEN = re.compile(rb"[^ ]")
+# Matches the line endings which `open` splits lines at, as in `load_map`.
+_LINE_END = re.compile(rb"\r\n|\r|\n")
+
+
+class MapFile:
+    """
+    A MapFile reads a text map file through a memory map, so the whole file
+    is never held in memory as lines or as a dictionary.
+
+    The file is opened and mapped once. The bounds of every line are found
+    from the line endings when the file is opened, without copying any
+    line, which gives the map's height and width before any entity is read.
+    Lines are split like `load_map` splits them. Binary map files, see
+    `binary_map`, are recognised from their header instead.
+
+    A MapFile is used as a context manager, which closes the file.
+
+    Examples:
+        >>> with MapFile("maps/basic.txt") as map_file:
+        ...     map_file.get_height(), map_file.get_width()
+        ...     list(map_file.entities())[:2]
+        (5, 5)
+        [(0, 1, 'P'), (4, 4, 'H')]
+    """
+
+    def __init__(self, filename: str):
+        """
+        Parameters:
+            filename: Path where the map file should be found.
+        """
+        self._file = open(filename, "rb")
+        self._contents: Optional[mmap.mmap] = None
+        self._filename = filename
+        self._lines: List[Tuple[int, int]] = []
+        if os.fstat(self._file.fileno()).st_size == 0:
+            return
+        self._contents = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        if self.is_binary():
+            return
+        contents = self._contents
+        start = 0
+        for match in _LINE_END.finditer(contents):
+            self._lines.append((start, _strip_end(contents, start,
+                                                  match.start())))
+            start = match.end()
+        if start < len(contents):
+            self._lines.append((start, _strip_end(contents, start,
+                                                  len(contents))))
+
+    def __enter__(self) -> "MapFile":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def get_height(self) -> int:
+        """Return the number of lines in the map file."""
+        return len(self._lines)
+
+    def get_width(self) -> int:
+        """
+        Return the length of the longest line in the map file, leaving out
+        trailing spaces, which may differ from the height for ragged map
+        files.
+        """
+        return max((end - start for start, end in self._lines), default=0)
+
+    def get_size(self) -> int:
+        """
+        Return the size of the map, which is its number of lines as in
+        `load_map`.
+        """
+        return self.get_height()
+
+    def is_binary(self) -> bool:
+        """Return true if the file is a binary map file."""
+        return (self._contents is not None
+                and self._contents[:len(MAGIC)] == MAGIC)
+
+    def read_binary(self) -> BinaryMap:
+        """
+        Read the file as a binary map file, see `binary_map`.
+
+        Raises:
+            ValueError: If the file is not a binary map of a supported
+                        version.
+        """
+        return parse_binary_map(self._contents or b"", self._filename)
+
+    def entities(self) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield the (x, y, token) of every non-empty map cell, in the same
+        order as `load_map`.
+
+        Each line is copied out of the memory map before its entities are
+        yielded, so the file can be closed while this is suspended.
+        """
+        for y, (start, end) in enumerate(self._lines):
+            line = self._contents[start:end]
+            for match in _MAP_TOKEN.finditer(line):
+                yield match.start(), y, chr(line[match.start()])
+
+    def close(self) -> None:
+        """Close the map file."""
+        if self._contents is not None:
+            self._contents.close()
+            self._contents = None
+        self._file.close()
+
+
+def _strip_end(contents: mmap.mmap, start: int, end: int) -> int:
+    """
+    Return the end of the line between start and end with its trailing
+    spaces left out.
+    """
+    while end > start and contents[end - 1] == ord(" "):
+        end -= 1
+    return end
+
+
+def measure_map(filename: str) -> Tuple[int, int]:
+    """
+    Return the height and width of a map file, see `MapFile`.
+
+    Parameters:
+        filename: Path where the map file should be found.
+    """
+    with MapFile(filename) as map_file:
+        return map_file.get_height(), map_file.get_width()
+
+
+def stream_map(filename: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Yield the entities of a map file one at a time, in the same order as
+    `load_map`, without building a dictionary of the whole map.
+
+    Parameters:
+        filename: Path where the map file should be found.
+
+    Returns:
+        An iterator of (x, y, token) tuples for every non-empty map cell.
+    """
+    with MapFile(filename) as map_file:
+        yield from map_file.entities()
+
+
 ## Task 1
 class Entity:
     """
@@ -318,6 +523,31 @@ class Entity:
         """
         raise NotImplementedError()
 
+    def clone(self) -> "Entity":
+        """
+        Return a copy of this entity to place in another grid.
+
+        Entities without any state of their own can safely appear in many
+        grids, so the abstract Entity class returns itself. Subclasses with
+        state return an independent copy.
+
+        Examples:
+            >>> hospital = Hospital()
+            >>> hospital.clone() is hospital
+            True
+        """
+        return self
+
+    def restore(self, state: "Entity") -> None:
+        """
+        Restore the state of this entity from a copy of it made earlier with
+        `clone`. The abstract Entity class has no state to restore.
+
+        Parameters:
+            state: A copy of this entity holding the state to restore.
+        """
+        pass
+
     def __repr__(self) -> str:
         """
         Return a representation of this entity.
@@ -390,6 +620,50 @@ class Hospital(Entity):
         return HOSPITAL
 
 
+class GridObserver:
+    """
+    A GridObserver is notified of every change made to the grids it
+    observes, see `Grid.add_observer`.
+
+    The abstract GridObserver ignores every change.
+    """
+
+    def entity_added(self, position: Position, entity: Entity,
+                     replaced: Optional[Entity]) -> None:
+        """
+        Called after an entity is added to the grid.
+
+        Parameters:
+            position: The position the entity was added at.
+            entity: The added entity.
+            replaced: The entity previously at the position, if any.
+        """
+        pass
+
+    def entity_removed(self, position: Position, entity: Entity) -> None:
+        """
+        Called after an entity is removed from the grid.
+
+        Parameters:
+            position: The position the entity was removed from.
+            entity: The removed entity.
+        """
+        pass
+
+    def entity_moved(self, start: Position, end: Position, entity: Entity,
+                     replaced: Optional[Entity]) -> None:
+        """
+        Called after an entity is moved within the grid.
+
+        Parameters:
+            start: The position the entity was moved from.
+            end: The position the entity was moved to.
+            entity: The moved entity.
+            replaced: The entity previously at the end position, if any.
+        """
+        pass
+
+
 class Grid:
     """
     The Grid class is used to represent the 2D grid of entities.
@@ -427,7 +701,22 @@ class Grid:
             size: The length and width of the grid.
         """
         self._size = size
-        self._tiles: Dict[Position, Entity] = {}
+        # Entities indexed by their display character, then by position.
+        self._by_type: Dict[str, Dict[Position, Entity]] = defaultdict(dict)
+        # Entities that do something during the step event.
+        self._stepping: Dict[Position, Entity] = {}
+        # Changes whenever an entity outside of the step event changes.
+        self._static_version = 0
+        # Sorted x coordinates of the entities in each row, and sorted
+        # y coordinates of the entities in each column.
+        self._rows: Dict[int, List[int]] = defaultdict(list)
+        self._columns: Dict[int, List[int]] = defaultdict(list)
+        # The display character of the entity in each cell, see
+        # `get_occupancy`.
+        self._occupancy = bytearray(size * size)
+        self._observers: List[GridObserver] = []
+        self._journal: Optional["GridJournal"] = None
+        self._create_storage()
 
     def get_size(self) -> int:
         """Returns the size of the grid."""
@@ -493,7 +782,12 @@ class Grid:
             >>> grid.get_entity(Position(-1, 0))
         """
         if self.in_bounds(position):
-            self._tiles[position] = entity
+            replaced = self._place(position, entity)
+            if replaced is not None:
+                self._forget(position, replaced, replacing=True)
+            self._track(position, entity)
+            for observer in self._observers:
+                observer.entity_added(position, entity, replaced)
 
     def remove_entity(self, position: Position) -> None:
         """
@@ -511,7 +805,12 @@ class Grid:
             >>> grid.remove_entity(Position(0, 0))
             >>> grid.get_entity(Position(0, 0))
         """
-        self._tiles.pop(position, None)
+        if self.in_bounds(position):
+            entity = self._take(position)
+            if entity is not None:
+                self._forget(position, entity)
+                for observer in self._observers:
+                    observer.entity_removed(position, entity)
 
     def get_entity(self, position: Position) -> Optional[Entity]:
         """
@@ -568,6 +867,111 @@ class Grid:
         """
         return list(self._tiles.values())
 
+    def get_step_mapping(self) -> Dict[Position, Entity]:
+        """
+        Return a dictionary with position instances as the keys and entity
+        instances as the values, for the entities which take part in the
+        _step_ event.
+
+        Entities whose class does not override `Entity.step`, e.g. hospitals
+        and pickups lying on the grid, are left out because stepping them
+        does nothing.
+
+        The entities are in the order they arrived at their positions, as in
+        `get_mapping` for Grid, and an entity replacing a stepping entity
+        takes its place in the order. An entity replacing one which does not
+        step, e.g. the player walking onto the hospital, comes last.
+
+        Updating the returned dictionary should have no side-effects.
+
+        Examples:
+            >>> grid = Grid(4)
+            >>> grid.add_entity(Position(0, 0), HoldingPlayer())
+            >>> grid.add_entity(Position(1, 1), Garlic())
+            >>> grid.add_entity(Position(2, 2), Zombie())
+            >>> grid.add_entity(Position(3, 3), Hospital())
+            >>> grid.get_step_mapping()
+            {Position(0, 0): HoldingPlayer(), Position(2, 2): Zombie()}
+            >>> grid.add_entity(Position(0, 0), TrackingZombie())
+            >>> list(grid.get_step_mapping().values())
+            [TrackingZombie(), Zombie()]
+        """
+        return self._stepping.copy()
+
+    def first_in_direction(
+        self, start: Position, offset: Position
+    ) -> Optional[Tuple[Position, Entity]]:
+        """
+        Return the first entity, and its position, found by repeatedly adding
+        an offset to a start position until leaving the grid.
+
+        For the four unit direction offsets, the nearest entity is found by
+        bisecting the sorted coordinates of the entities in the start's row
+        or column, instead of walking the grid cell by cell.
+
+        Parameters:
+            start: Point of reference, which itself is not checked.
+            offset: Position offset representing a direction to look at.
+
+        Returns: A tuple of a position and the first entity found in the
+            given direction, None if no entity found
+
+        Examples:
+            >>> grid = Grid(10)
+            >>> grid.add_entity(Position(2, 5), Zombie())
+            >>> grid.add_entity(Position(7, 5), Hospital())
+            >>> grid.first_in_direction(Position(4, 5), Position(1, 0))
+            (Position(7, 5), Hospital())
+            >>> grid.first_in_direction(Position(4, 5), Position(-1, 0))
+            (Position(2, 5), Zombie())
+            >>> grid.first_in_direction(Position(4, 5), Position(0, 1))
+        """
+        position = start.add(offset)
+        if not self.in_bounds(position):
+            return None
+
+        dx = offset.get_x()
+        dy = offset.get_y()
+        x = start.get_x()
+        y = start.get_y()
+        if dy == 0 and dx in (-1, 1):
+            line, along, fixed = self._rows.get(y), x, y
+        elif dx == 0 and dy in (-1, 1):
+            line, along, fixed = self._columns.get(x), y, x
+        else:
+            while self.in_bounds(position):
+                entity = self.get_entity(position)
+                if entity is not None:
+                    return position, entity
+                position = position.add(offset)
+            return None
+
+        if not line:
+            return None
+        if dx + dy > 0:
+            index = bisect_right(line, along)
+        else:
+            index = bisect_left(line, along) - 1
+        if not 0 <= index < len(line):
+            return None
+
+        if dy == 0:
+            found = Position(line[index], fixed)
+        else:
+            found = Position(fixed, line[index])
+        return found, self.get_entity(found)
+
+    def get_static_version(self) -> int:
+        """
+        Return a number that changes whenever an entity which does not take
+        part in the _step_ event, e.g. a hospital or a pickup, is added,
+        removed or moved.
+
+        This lets callers reuse results that only depend on the static
+        layout of the grid.
+        """
+        return self._static_version
+
     def move_entity(self, start: Position, end: Position) -> None:
         """
         Move an entity from the given start position to the given end position.
@@ -596,10 +1000,47 @@ class Grid:
         if start == end:
             return
         if self.in_bounds(start) and self.in_bounds(end):
-            entity = self.get_entity(start)
+            entity = self._take(start)
             if entity is not None:
-                self._tiles[end] = entity
-                del self._tiles[start]
+                self._forget(start, entity)
+                replaced = self._place(end, entity)
+                if replaced is not None:
+                    self._forget(end, replaced, replacing=True)
+                self._track(end, entity)
+                for observer in self._observers:
+                    observer.entity_moved(start, end, entity, replaced)
+
+    def add_observer(self, observer: GridObserver) -> None:
+        """
+        Notify an observer of every later change made to this grid.
+
+        Parameters:
+            observer: The observer to notify.
+        """
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: GridObserver) -> None:
+        """
+        Stop notifying an observer of changes made to this grid.
+
+        Parameters:
+            observer: The observer to stop notifying.
+        """
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+    def enable_journal(self) -> "GridJournal":
+        """
+        Start journaling the changes made to this grid, if not already
+        journaling, and return the grid's journal. See `GridJournal`.
+        """
+        if self._journal is None:
+            self._journal = GridJournal(self)
+        return self._journal
+
+    def get_journal(self) -> Optional["GridJournal"]:
+        """Return the grid's journal, or None if it is not journaling."""
+        return self._journal
 
     def find_player(self) -> Optional[Position]:
         """
@@ -609,18 +1050,68 @@ class Grid:
         
         If the grid has multiple players (which it should not),
         returning any of the player positions is sufficient.
+
+        Player positions are tracked as entities are added, removed and
+        moved, so this does not scan the grid.
         
         Examples:
             >>> grid = Grid(10)
             >>> grid.add_entity(Position(4, 6), Player())
             >>> grid.find_player()
             Position(4, 6)
+            >>> grid.move_entity(Position(4, 6), Position(4, 7))
+            >>> grid.find_player()
+            Position(4, 7)
         """
-        for position, entity in self._tiles.items():
-            if entity.display() == PLAYER:
-                return position
+        for position in self._by_type[PLAYER]:
+            return position
         return None
 
+    def find_entities(self, *tokens: str) -> Dict[Position, Entity]:
+        """
+        Return a dictionary of the positions and entities in the grid whose
+        display character is one of the given tokens.
+
+        Entities are indexed by type as the grid is updated, so this only
+        visits the matching entities.
+
+        Updating the returned dictionary should have no side-effects.
+
+        Parameters:
+            tokens: Display characters of the entity types to find.
+
+        Examples:
+            >>> grid = Grid(5)
+            >>> grid.add_entity(Position(0, 0), Zombie())
+            >>> grid.add_entity(Position(1, 1), Garlic())
+            >>> grid.add_entity(Position(2, 2), TrackingZombie())
+            >>> grid.find_entities(ZOMBIE, TRACKING_ZOMBIE)
+            {Position(0, 0): Zombie(), Position(2, 2): TrackingZombie()}
+        """
+        found = {}
+        for token in tokens:
+            found.update(self._by_type.get(token, {}))
+        return found
+
+    def count_entities(self, *tokens: str) -> int:
+        """
+        Return the number of entities in the grid whose display character is
+        one of the given tokens.
+
+        Parameters:
+            tokens: Display characters of the entity types to count.
+
+        Examples:
+            >>> grid = Grid(5)
+            >>> grid.add_entity(Position(0, 0), Zombie())
+            >>> grid.add_entity(Position(2, 2), TrackingZombie())
+            >>> grid.count_entities(*ZOMBIES)
+            2
+            >>> grid.count_entities(HOSPITAL)
+            0
+        """
+        return sum(len(self._by_type.get(token, ())) for token in tokens)
+
     def serialize(self) -> Dict[Tuple[int, int], str]:
         """
         Serialize the grid into a dictionary that maps tuples to characters.
@@ -647,6 +1138,558 @@ class Grid:
 
         return serialized
 
+    def get_occupancy(self) -> bytearray:
+        """
+        Return a flat array describing which cells of the grid are occupied.
+
+        The array has `size * size` bytes, where the byte at `y * size + x`
+        is the character code of the entity's display character at (x, y),
+        or 0 if the cell is empty.
+
+        The array is kept up to date as the grid is updated, so this only
+        copies it. Updating the returned array should have no side-effects.
+
+        Examples:
+            >>> grid = Grid(2)
+            >>> grid.add_entity(Position(1, 0), Player())
+            >>> grid.get_occupancy()
+            bytearray(b'\\x00P\\x00\\x00')
+        """
+        return bytearray(self._occupancy)
+
+    def clone(self) -> "Grid":
+        """
+        Return an independent copy of this grid.
+
+        Entities are copied with `Entity.clone`, so stateless entities are
+        shared with this grid while players and pickups are copied. The
+        indexes are copied directly rather than rebuilt entity by entity.
+        Observers of this grid do not observe the copy.
+
+        Examples:
+            >>> grid = Grid(3)
+            >>> grid.add_entity(Position(0, 0), VulnerablePlayer())
+            >>> copied = grid.clone()
+            >>> copied.move_entity(Position(0, 0), Position(1, 0))
+            >>> grid.find_player(), copied.find_player()
+            (Position(0, 0), Position(1, 0))
+            >>> grid.add_entity(Position(2, 2), Garlic())
+            >>> copied = grid.clone()
+            >>> copied.get_entity(Position(2, 2)).toggle_active()
+            >>> [each.get_entity(Position(2, 2)).is_active()
+            ...  for each in (grid, copied)]
+            [False, True]
+        """
+        clone = copy.copy(self)
+        copied = clone._clone_storage()
+        clone._by_type = defaultdict(dict, {
+            token: dict(entities) for token, entities in self._by_type.items()
+        })
+        clone._stepping = dict(self._stepping)
+        for position, entity in copied.items():
+            clone._by_type[entity.display()][position] = entity
+            if position in clone._stepping:
+                clone._stepping[position] = entity
+        clone._rows = defaultdict(list, {y: xs[:]
+                                         for y, xs in self._rows.items()})
+        clone._columns = defaultdict(list, {x: ys[:]
+                                            for x, ys in self._columns.items()})
+        clone._occupancy = bytearray(self._occupancy)
+        clone._observers = []
+        clone._journal = None
+        return clone
+
+    def _track(self, position: Position, entity: Entity) -> None:
+        """
+        Update the grid's indexes after an entity is placed at a position.
+        """
+        token = entity.display()
+        self._by_type[token][position] = entity
+        x = position.get_x()
+        y = position.get_y()
+        insort(self._rows[y], x)
+        insort(self._columns[x], y)
+        self._occupancy[y * self._size + x] = ord(token)
+        if type(entity).step is not Entity.step:
+            # Assigning keeps the place of a stepping entity just replaced.
+            self._stepping[position] = entity
+        else:
+            self._stepping.pop(position, None)
+            self._static_version += 1
+
+    def _forget(self, position: Position, entity: Entity,
+                replacing: bool = False) -> None:
+        """
+        Update the grid's indexes after an entity leaves a position.
+
+        If another entity is replacing it, a stepping entity keeps its place
+        in the step order for `_track` to hand to the new entity.
+        """
+        del self._by_type[entity.display()][position]
+        x = position.get_x()
+        y = position.get_y()
+        row = self._rows[y]
+        del row[bisect_left(row, x)]
+        column = self._columns[x]
+        del column[bisect_left(column, y)]
+        self._occupancy[y * self._size + x] = 0
+        if type(entity).step is Entity.step:
+            self._static_version += 1
+        elif not replacing:
+            del self._stepping[position]
+
+    def _create_storage(self) -> None:
+        """
+        Create the empty entity storage. Storage backends override this
+        together with `_place` and `_take`.
+        """
+        self._tiles: Dict[Position, Entity] = {}
+
+    def _clone_storage(self) -> Dict[Position, Entity]:
+        """
+        Replace the storage of a freshly copied grid by a copy holding
+        clones of its entities. Returns, by position, the clones which are
+        new copies rather than shared stateless entities.
+        """
+        copied = {}
+        for position, entity in self._tiles.items():
+            clone = entity.clone()
+            if clone is not entity:
+                copied[position] = clone
+        self._tiles = dict(self._tiles)
+        self._tiles.update(copied)
+        return copied
+
+    def _place(self, position: Position, entity: Entity) -> Optional[Entity]:
+        """
+        Store an entity at an in-bounds position and return the entity it
+        replaced, if any.
+        """
+        replaced = self._tiles.get(position)
+        self._tiles[position] = entity
+        return replaced
+
+    def _take(self, position: Position) -> Optional[Entity]:
+        """
+        Remove and return the entity stored at an in-bounds position,
+        or None if the position is empty.
+        """
+        return self._tiles.pop(position, None)
+
+
+class DenseGrid(Grid):
+    """
+    DenseGrid is an array-backed alternative to the dictionary based Grid.
+
+    Occupancy is kept in a flat bytearray indexed by `y * size + x`, where
+    each cell holds the display character of its entity (0 when empty).
+    The entity objects themselves live in a side table keyed by the same
+    flat index, so lookups never hash a Position instance.
+
+    The public API, including the iteration order of `get_mapping`, is the
+    same as Grid.
+
+    Examples:
+        >>> grid = DenseGrid(5)
+        >>> grid.add_entity(Position(2, 2), Hospital())
+        >>> grid.add_entity(Position(4, 1), Player())
+        >>> grid.get_entity(Position(2, 2))
+        Hospital()
+        >>> grid.move_entity(Position(4, 1), Position(4, 0))
+        >>> grid.find_player()
+        Position(4, 0)
+        >>> grid.serialize()
+        {(2, 2): 'H', (4, 0): 'P'}
+    """
+
+    def _create_storage(self) -> None:
+        self._entities: Dict[int, Entity] = {}
+
+    def _clone_storage(self) -> Dict[Position, Entity]:
+        copied = {}
+        for index, entity in self._entities.items():
+            clone = entity.clone()
+            if clone is not entity:
+                copied[index] = clone
+        self._entities = dict(self._entities)
+        self._entities.update(copied)
+        return {self._position(index): entity
+                for index, entity in copied.items()}
+
+    def _position(self, index: int) -> Position:
+        """Return the position represented by a flat array index."""
+        y, x = divmod(index, self._size)
+        return Position(x, y)
+
+    def get_entity(self, position: Position) -> Optional[Entity]:
+        x = position.get_x()
+        y = position.get_y()
+        size = self._size
+        if 0 <= x < size and 0 <= y < size:
+            index = y * size + x
+            if self._occupancy[index]:
+                return self._entities[index]
+        return None
+
+    def get_mapping(self) -> Dict[Position, Entity]:
+        return {self._position(index): entity
+                for index, entity in self._entities.items()}
+
+    def get_entities(self) -> List[Entity]:
+        return list(self._entities.values())
+
+    def serialize(self) -> Dict[Tuple[int, int], str]:
+        serialized = {}
+        occupancy = self._occupancy
+        size = self._size
+
+        for index in self._entities:
+            y, x = divmod(index, size)
+            serialized[(x, y)] = chr(occupancy[index])
+
+        return serialized
+
+    def _place(self, position: Position, entity: Entity) -> Optional[Entity]:
+        index = position.get_y() * self._size + position.get_x()
+        replaced = self._entities.get(index)
+        self._entities[index] = entity
+        return replaced
+
+    def _take(self, position: Position) -> Optional[Entity]:
+        index = position.get_y() * self._size + position.get_x()
+        return self._entities.pop(index, None)
+
+
+class JournalEntry(NamedTuple):
+    """
+    A change recorded by a GridJournal.
+
+    `kind` is one of GridJournal.ADDED, REMOVED or MOVED. `start` is the
+    position the entity left and `end` the position it arrived at; `start`
+    is None for additions and `end` is None for removals. `entity_id` is the
+    `id` of the entity and `token` its display character.
+    """
+    kind: str
+    start: Optional[Position]
+    end: Optional[Position]
+    entity_id: int
+    token: str
+
+
+class JournalCursor:
+    """
+    A JournalCursor marks how far one consumer has read a GridJournal, so
+    that each consumer only pulls the changes made since it last looked.
+    """
+
+    def __init__(self, journal: "GridJournal", position: int):
+        """
+        Parameters:
+            journal: The journal this cursor reads.
+            position: The sequence number of the next entry to read.
+        """
+        self._journal = journal
+        self._position = position
+
+    def get_position(self) -> int:
+        """Return the sequence number of the next entry to read."""
+        return self._position
+
+    def pull(self) -> List[JournalEntry]:
+        """
+        Return the entries recorded since the last pull, oldest first, and
+        move the cursor past them.
+        """
+        entries = self._journal.entries_since(self._position)
+        self._position += len(entries)
+        self._journal.trim()
+        return entries
+
+    def close(self) -> None:
+        """Stop reading the journal, so it no longer keeps entries for us."""
+        self._journal.close_cursor(self)
+
+
+class GridJournal(GridObserver):
+    """
+    A GridJournal records every add, remove and move made to a grid, see
+    `Grid.enable_journal`, for consumers that update themselves from the
+    changes instead of scanning the whole grid.
+
+    Each consumer opens its own cursor and pulls the entries recorded since
+    its last pull. Entries every cursor has read are dropped, and nothing is
+    kept while no cursor is open.
+
+    Replacing an entity is journaled as the removal of the replaced entity
+    followed by the addition or move.
+
+    Examples:
+        >>> grid = Grid(4)
+        >>> journal = grid.enable_journal()
+        >>> cursor = journal.open_cursor()
+        >>> grid.add_entity(Position(0, 0), Player())
+        >>> grid.add_entity(Position(1, 0), Hospital())
+        >>> grid.move_entity(Position(0, 0), Position(1, 0))
+        >>> [(entry.kind, entry.start, entry.end, entry.token)
+        ...  for entry in cursor.pull()]  # doctest: +NORMALIZE_WHITESPACE
+        [('add', None, Position(0, 0), 'P'), ('add', None, Position(1, 0), 'H'),
+         ('remove', Position(1, 0), None, 'H'),
+         ('move', Position(0, 0), Position(1, 0), 'P')]
+        >>> cursor.pull()
+        []
+    """
+
+    ADDED = "add"
+    REMOVED = "remove"
+    MOVED = "move"
+
+    def __init__(self, grid: Grid):
+        """
+        A journal starts observing the grid straight away.
+
+        Parameters:
+            grid: The grid to journal.
+        """
+        self._grid = grid
+        self._entries: List[JournalEntry] = []
+        # Sequence number of the first kept entry.
+        self._offset = 0
+        self._cursors: List[JournalCursor] = []
+        grid.add_observer(self)
+
+    def get_grid(self) -> Grid:
+        """Return the grid this journal records."""
+        return self._grid
+
+    def get_sequence(self) -> int:
+        """Return the sequence number the next recorded entry will get."""
+        return self._offset + len(self._entries)
+
+    def open_cursor(self) -> JournalCursor:
+        """Return a new cursor which reads the entries recorded from now on."""
+        cursor = JournalCursor(self, self.get_sequence())
+        self._cursors.append(cursor)
+        return cursor
+
+    def close_cursor(self, cursor: JournalCursor) -> None:
+        """
+        Forget a cursor, dropping the entries only it had left to read.
+
+        Parameters:
+            cursor: The cursor to close.
+        """
+        if cursor in self._cursors:
+            self._cursors.remove(cursor)
+            self.trim()
+
+    def entries_since(self, sequence: int) -> List[JournalEntry]:
+        """
+        Return the kept entries from a sequence number onwards.
+
+        Parameters:
+            sequence: The sequence number of the first entry to return.
+        """
+        return self._entries[max(0, sequence - self._offset):]
+
+    def trim(self) -> None:
+        """Drop the entries which every open cursor has already read."""
+        if self._cursors:
+            read = min(cursor.get_position() for cursor in self._cursors)
+        else:
+            read = self.get_sequence()
+        if read > self._offset:
+            del self._entries[:read - self._offset]
+            self._offset = read
+
+    def _record(self, kind: str, start: Optional[Position],
+                end: Optional[Position], entity: Entity) -> None:
+        """Record an entry, unless no cursor would ever read it."""
+        if self._cursors:
+            self._entries.append(JournalEntry(kind, start, end, id(entity),
+                                              entity.display()))
+        else:
+            self._offset += 1
+
+    def entity_added(self, position: Position, entity: Entity,
+                     replaced: Optional[Entity]) -> None:
+        if replaced is not None:
+            self._record(self.REMOVED, position, None, replaced)
+        self._record(self.ADDED, None, position, entity)
+
+    def entity_removed(self, position: Position, entity: Entity) -> None:
+        self._record(self.REMOVED, position, None, entity)
+
+    def entity_moved(self, start: Position, end: Position, entity: Entity,
+                     replaced: Optional[Entity]) -> None:
+        if replaced is not None:
+            self._record(self.REMOVED, end, None, replaced)
+        self._record(self.MOVED, start, end, entity)
+
+
+# Translation table mapping a cell's display code to 1 if the cell blocks
+# pursuit and 0 otherwise. Zombies move, so only other entities block.
+_BLOCKING_CELLS = bytes(
+    0 if code in (0, ord(PLAYER), ord(ZOMBIE), ord(TRACKING_ZOMBIE)) else 1
+    for code in range(256)
+)
+
+
+class DistanceField:
+    """
+    A DistanceField holds the walking distance from cells of a grid to the
+    nearest player, going around the entities that zombies cannot walk
+    through. Zombies themselves do not block, since they move every step.
+
+    The field is computed with a breadth first search starting from every
+    player at once, one distance layer at a time. When goal positions are
+    given, the search stops as soon as the distances of all goals and their
+    neighbours are known.
+
+    Examples:
+        >>> grid = Grid(3)
+        >>> grid.add_entity(Position(0, 0), Player())
+        >>> grid.add_entity(Position(1, 0), Hospital())
+        >>> grid.add_entity(Position(1, 1), Hospital())
+        >>> field = DistanceField(grid)
+        >>> field.distance(Position(2, 0))
+        6
+        >>> field.distance(Position(1, 0))
+        >>> field.distance(Position(2, 3))
+        >>> field.directions(Position(2, 1))
+        [(0, 1), (0, -1), (-1, 0), (1, 0)]
+    """
+
+    def __init__(self, grid: Grid, goals: Optional[List[Position]] = None):
+        """
+        Compute the distance field of a grid.
+
+        Parameters:
+            grid: The grid to compute distances over.
+            goals: Positions whose neighbours need a distance. If None, the
+                   distance of every reachable cell is computed.
+        """
+        size = grid.get_size()
+        last_row = size * size - size
+        self._size = size
+        self._target = grid.find_player()
+        self._static_version = grid.get_static_version()
+        self._distances: Dict[int, int] = {}
+        # The largest distance computed, or None if every cell was reached.
+        self._radius: Optional[int] = None
+
+        # Cells that are blocked or already reached are marked as visited.
+        visited = grid.get_occupancy().translate(_BLOCKING_CELLS)
+        frontier = []
+        for position in grid.find_entities(PLAYER):
+            index = position.get_y() * size + position.get_x()
+            visited[index] = 1
+            frontier.append(index)
+
+        remaining = None
+        if goals is not None:
+            remaining = {position.get_y() * size + position.get_x()
+                         for position in goals if grid.in_bounds(position)}
+
+        distance = 0
+        last_layer = None
+        while frontier:
+            self._distances.update(dict.fromkeys(frontier, distance))
+            if distance == last_layer:
+                self._radius = distance
+                break
+            if remaining is not None:
+                remaining.difference_update(frontier)
+                if not remaining:
+                    # One more layer, so that the goals' neighbours are known.
+                    last_layer = distance + 1
+                    remaining = None
+
+            candidates = [index - 1 for index in frontier if index % size]
+            candidates += [index + 1 for index in frontier
+                           if (index + 1) % size]
+            candidates += [index - size for index in frontier
+                           if index >= size]
+            candidates += [index + size for index in frontier
+                           if index < last_row]
+
+            frontier = []
+            for index in candidates:
+                if not visited[index]:
+                    visited[index] = 1
+                    frontier.append(index)
+            distance += 1
+
+    def is_valid(self, grid: Grid, goals: List[Position]) -> bool:
+        """
+        Return true if this field still holds for the grid, i.e. the player
+        and the static entities have not moved, and the distances of the
+        goals' neighbours are known.
+
+        Parameters:
+            grid: The grid the field was computed over.
+            goals: Positions whose neighbours need a distance.
+        """
+        if (grid.find_player() != self._target
+                or grid.get_static_version() != self._static_version):
+            return False
+        if self._radius is None:
+            return True
+
+        size = self._size
+        for position in goals:
+            distance = self._distances.get(
+                position.get_y() * size + position.get_x())
+            if distance is None or distance >= self._radius:
+                return False
+        return True
+
+    def distance(self, position: Position) -> Optional[int]:
+        """
+        Return the walking distance from a position to the nearest player,
+        or None if the position is out of bounds, blocked or was not reached.
+
+        Parameters:
+            position: The position to look up.
+        """
+        x = position.get_x()
+        y = position.get_y()
+        size = self._size
+        if not (0 <= x < size and 0 <= y < size):
+            return None
+        return self._distances.get(y * size + x)
+
+    def directions(self, position: Position) -> List[Tuple[int, int]]:
+        """
+        Return the direction offsets sorted from the best to the worst
+        direction to move in from a position to approach the player.
+
+        Directions are ranked by walking distance, then by manhattan distance
+        to the player, then by the offset itself.
+
+        Parameters:
+            position: The position to move from.
+        """
+        x = position.get_x()
+        y = position.get_y()
+        size = self._size
+        distances = self._distances
+        target_x = target_y = 0
+        if self._target is not None:
+            target_x = self._target.get_x()
+            target_y = self._target.get_y()
+
+        ranked = []
+        for direction in OFFSETS:
+            new_x = x + direction[0]
+            new_y = y + direction[1]
+            walking = math.inf
+            if 0 <= new_x < size and 0 <= new_y < size:
+                walking = distances.get(new_y * size + new_x, math.inf)
+            manhattan = abs(new_x - target_x) + abs(new_y - target_y)
+            ranked.append((walking, manhattan, direction))
+        ranked.sort()
+        return [direction for _, _, direction in ranked]
+
 
 class MapLoader:
     """
@@ -659,6 +1702,16 @@ class MapLoader:
     entities.
     """
 
+    def __init__(self, grid_class: Type[Grid] = Grid):
+        """
+        A map loader is constructed with the Grid implementation used to
+        store loaded maps, e.g. DenseGrid for very large maps.
+
+        Parameters:
+            grid_class: The Grid class (or subclass) to instantiate.
+        """
+        self._grid_class = grid_class
+
     def load(self, filename: str) -> Grid:
         """
         Load a new Grid instance from a map file.
@@ -671,15 +1724,32 @@ class MapLoader:
         
         \\textbf{Hint:} The `load_map` function in the support code may be helpful.
         
+        Map files are opened once, through a memory map, see `MapFile`.
+        The grid is as large as the map has lines, as in `load_map`.
+        Binary map files, see `binary_map`, are recognised from their header
+        and loaded from their sparse entity table instead.
+        
         Parameters:
             filename: Path where the map file should be found.
         """
-        mapping, size = load_map(filename)
+        with MapFile(filename) as map_file:
+            if map_file.is_binary():
+                binary = map_file.read_binary()
+                return self.build(binary.get_size(), binary.entities())
+            return self.build(map_file.get_size(), map_file.entities())
 
-        grid = Grid(size)
-        for position, entity in mapping.items():
-            grid.add_entity(Position(*position), self.create_entity(entity))
+    def build(self, size: int, entities: Iterable[Tuple[int, int, str]]) -> Grid:
+        """
+        Create a new Grid instance of the given size holding the given
+        entities, e.g. entities generated rather than read from a file.
 
+        Parameters:
+            size: The size of the grid.
+            entities: The (x, y, token) of every entity.
+        """
+        grid = self._grid_class(size)
+        for x, y, token in entities:
+            grid.add_entity(Position(x, y), self.create_entity(token))
         return grid
 
     def create_entity(self, token: str) -> Entity:
@@ -740,26 +1810,45 @@ class Game:
     within the grid so that the player can be controlled.
     """
 
-    def __init__(self, grid: Grid):
+    def __init__(self, grid: Grid, seed: Optional[int] = None):
         """
         The construction of a Game instance takes the grid upon which the game
         is being played.
-        
+
+        Every game owns the random number generator its entities draw from,
+        so a game played with the same seed and actions always plays out the
+        same way, whatever else runs in the same process.
+
         Preconditions:
             The grid has a player, i.e. `grid.find_player()` is not None.
             
         Parameters:
             grid (Grid): The game's grid.
+            seed: The seed of the game's random number generator. If None, a
+                  seed is drawn from the global generator of `random`.
         """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self._seed = seed
+        self._random = random.Random(seed)
         self._grid = grid
-        self._player_position = grid.find_player()
         self._steps = 0
         self._moves = 0
+        self._distance_field: Optional[DistanceField] = None
+        self._distance_field_key: Optional[Tuple[int, Position]] = None
 
     def get_grid(self) -> Grid:
         """Return the grid on which this game is being played."""
         return self._grid
 
+    def get_seed(self) -> int:
+        """Return the seed the game's random number generator started from."""
+        return self._seed
+
+    def get_random(self) -> random.Random:
+        """Return the random number generator of this game."""
+        return self._random
+
     def get_player(self) -> Optional[Player]:
         """
         Return the instance of the Player class in the grid.
@@ -769,13 +1858,40 @@ class Game:
         If there are multiple players in the grid, returning any player is
         sufficient.
         """
-        if self._player_position is None:
+        position = self._grid.find_player()
+        if position is None:
             return None
 
-        player = self.get_grid().get_entity(self._player_position)
+        player = self.get_grid().get_entity(position)
 
         return player  # type: ignore
 
+    def clone(self) -> "Game":
+        """
+        Return an independent copy of this game, e.g. to keep as a snapshot.
+
+        The grid is copied with `Grid.clone` and the copy's random number
+        generator continues from the same state. The distance field is
+        shared, as it is never changed once computed and the copied grid has
+        the same layout.
+
+        Examples:
+            >>> grid = Grid(3)
+            >>> grid.add_entity(Position(0, 0), Player())
+            >>> game = Game(grid)
+            >>> snapshot = game.clone()
+            >>> game.move_player(Position(1, 0))
+            >>> game.get_moves(), snapshot.get_moves()
+            (1, 0)
+            >>> snapshot.get_grid().find_player()
+            Position(0, 0)
+        """
+        clone = copy.copy(self)
+        clone._grid = self._grid.clone()
+        clone._random = random.Random()
+        clone._random.setstate(self._random.getstate())
+        return clone
+
     def step(self) -> None:
         """
         The _step_ method of the game will be called after every action
@@ -785,13 +1901,51 @@ class Game:
         of every entity in the grid. When the entity's step method is called,
         it should pass the entity's current position and this game as parameters.
 
+        Only entities that override `Entity.step` are visited, see
+        `Grid.get_step_mapping`, since stepping the others does nothing.
+
         Note: Do not call this method in the `move_player` method.
         """
-        for position, entity in self._grid.get_mapping().items():
+        for position, entity in self._grid.get_step_mapping().items():
             entity.step(position, self)
         self._steps += 1
 
 
+    def get_distance_field(self) -> Optional[DistanceField]:
+        """
+        Return the distance field towards the player for the current step,
+        or None if there is no player in the grid.
+
+        The field is checked once per _step_ event and player position, and
+        shared by every tracking zombie, see `TrackingZombie`. It is only
+        recomputed when the player or a static entity has moved, or when
+        a tracking zombie has left the part of the grid it covers.
+        """
+        target = self._grid.find_player()
+        if target is None:
+            return None
+
+        key = (self._steps, target)
+        if self._distance_field_key != key:
+            goals = list(self._grid.find_entities(TRACKING_ZOMBIE))
+            field = self._distance_field
+            if field is None or not field.is_valid(self._grid, goals):
+                self._distance_field = DistanceField(self._grid, goals)
+            self._distance_field_key = key
+        return self._distance_field
+
+    def restore_counters(self, steps: int, moves: int) -> None:
+        """
+        Set the step and move counters, e.g. when rewinding the game.
+
+        Parameters:
+            steps: The number of steps to restore.
+            moves: The number of moves to restore.
+        """
+        self._steps = steps
+        self._moves = moves
+        self._distance_field_key = None
+
     def get_steps(self) -> int:
         """
         Return the amount of steps made in the game,
@@ -819,11 +1973,11 @@ class Game:
             offset: A position to add to the player's current position
                     to produce the player's new desired position.
         """
-        if self._player_position is not None:
-            destination = self._player_position.add(offset)
+        position = self._grid.find_player()
+        if position is not None:
+            destination = position.add(offset)
             if self._grid.in_bounds(destination):
-                self._grid.move_entity(self._player_position, destination)
-                self._player_position = destination
+                self._grid.move_entity(position, destination)
         self._moves += 1
 
     def direction_to_offset(self, direction: str) -> Optional[Position]:
@@ -870,7 +2024,7 @@ class Game:
         The player wins the game by stepping onto the hospital. When the player
         steps on the hospital, there will be no hospital entity in the grid.
         """
-        return HOSPITAL not in self._grid.serialize().values()
+        return self._grid.count_entities(HOSPITAL) == 0
 
     def has_lost(self) -> bool:
         """
@@ -900,6 +2054,17 @@ class TextInterface(GameInterface):
             size (int): The size of the game to be displayed and played.
         """
         self._size = size
+        self._recorder: Optional["Recorder"] = None
+
+    def set_recorder(self, recorder: Optional["Recorder"]) -> None:
+        """
+        Record the games played and the actions taken with the given
+        recorder, see `replay.Recorder`, or stop recording if None.
+
+        Parameters:
+            recorder: The recorder to record with.
+        """
+        self._recorder = recorder
 
     def draw(self, game: Game) -> None:
         """
@@ -948,6 +2113,8 @@ class TextInterface(GameInterface):
         """
         won_game = False
         lost_game = False
+        if self._recorder is not None:
+            self._recorder.start(game)
 
         while not won_game and not lost_game:
             self.draw(game)
@@ -963,6 +2130,9 @@ class TextInterface(GameInterface):
                 print(LOSE_MESSAGE)
                 lost_game = True
 
+        if self._recorder is not None:
+            self._recorder.finish(game)
+
     def handle_action(self, game: Game, action: str) -> None:
         """
         The handle_action method is used to process the actions entered
@@ -981,6 +2151,9 @@ class TextInterface(GameInterface):
             game: The game that is currently being played.
             action: An action entered by the player during the game loop.
         """
+        if self._recorder is not None:
+            self._recorder.record(RECORD_ACTION,
+                                  action if action in DIRECTIONS else "")
         if action in DIRECTIONS:
             offset = game.direction_to_offset(action)
 
@@ -1027,6 +2200,16 @@ class VulnerablePlayer(Player):
         """Return the current infected state of the player."""
         return self._infected
 
+    def clone(self) -> "VulnerablePlayer":
+        """Return a copy of this player with the same infected state."""
+        clone = type(self)()
+        clone._infected = self._infected
+        return clone
+
+    def restore(self, state: "VulnerablePlayer") -> None:
+        """Restore the infected state of this player from a copy of it."""
+        self._infected = state.is_infected()
+
 
 class Zombie(Entity):
     """
@@ -1047,7 +2230,7 @@ class Zombie(Entity):
             position: current position of this zombie
             game: current game being played
         """
-        return random_directions()
+        return random_directions(game.get_random())
 
     def step(self, position: Position, game: Game) -> None:
         """
@@ -1168,21 +2351,19 @@ class TrackingZombie(Zombie):
     """
     The TrackingZombie is a more intelligent type of zombie which is able
     to see the player and move towards them.
+
+    Tracking zombies walk around obstacles, using the distance field that
+    the game computes once per step and shares between all of them.
     """
 
     def _directions(
         self, position: Position, game: Game
     ) -> List[Tuple[int, int]]:
-        target = game.get_grid().find_player()
-        if target is None:
+        field = game.get_distance_field()
+        if field is None:
             return []  # Should never happen.
 
-        def distance(direction):
-            new_position = position.add(Position(*direction))
-            return new_position.distance(target), direction
-
-        best_directions = sorted(OFFSETS, key=distance)
-        return best_directions
+        return field.directions(position)
 
     def step(self, position: Position, game: Game) -> None:
         """
@@ -1302,6 +2483,18 @@ class Pickup(Entity):
         """
         self._using = not self._using
 
+    def clone(self) -> "Pickup":
+        """Return a copy of this pickup with the same lifetime and state."""
+        clone = type(self)()
+        clone._lifetime = self._lifetime
+        clone._using = self._using
+        return clone
+
+    def restore(self, state: "Pickup") -> None:
+        """Restore the lifetime and active state of this pickup from a copy."""
+        self._lifetime = state.get_lifetime()
+        self._using = state.is_active()
+
     def __repr__(self) -> str:
         """
         Return a string that represents the entity, the representation
@@ -1505,6 +2698,80 @@ class Inventory:
                 return True
         return False
 
+    def remove_items(self, pickup_id: str) -> None:
+        """
+        Remove every item which returns the given pickup_id from the
+        item's `display` method.
+
+        Examples:
+            >>> inventory = Inventory()
+            >>> inventory.add_item(Garlic())
+            >>> inventory.add_item(Crossbow())
+            >>> inventory.remove_items("G")
+            >>> inventory.get_items()
+            [Crossbow(5)]
+        """
+        self._items = [item for item in self._items
+                       if item.display() != pickup_id]
+
+    def select(self, index: int) -> Pickup:
+        """
+        Toggle the item at the given index, as the graphical interfaces do
+        when an item is clicked. Activating an item deactivates the item
+        which was active, so at most one item is active at a time.
+
+        Parameters:
+            index: The index of the item in the inventory.
+
+        Returns:
+            The toggled item.
+
+        Examples:
+            >>> inventory = Inventory()
+            >>> inventory.add_item(Garlic())
+            >>> inventory.add_item(Crossbow())
+            >>> inventory.select(0).is_active()
+            True
+            >>> inventory.select(1).is_active()
+            True
+            >>> [item.is_active() for item in inventory.get_items()]
+            [False, True]
+        """
+        item = self._items[index]
+        if not item.is_active():
+            for active_item in self._items:
+                if active_item.is_active():
+                    active_item.toggle_active()
+                    break
+        item.toggle_active()
+        return item
+
+    def clone(self) -> "Inventory":
+        """
+        Return a copy of this inventory holding copies of its items.
+
+        Examples:
+            >>> inventory = Inventory()
+            >>> inventory.add_item(Garlic())
+            >>> copied = inventory.clone()
+            >>> copied.get_items()[0].toggle_active()
+            >>> inventory.has_active("G"), copied.has_active("G")
+            (False, True)
+        """
+        clone = Inventory()
+        clone._items = [item.clone() for item in self._items]
+        return clone
+
+    def restore(self, state: "Inventory") -> None:
+        """
+        Replace the items of this inventory by copies of the items held by
+        another inventory, e.g. one made earlier with `clone`.
+
+        Parameters:
+            state: The inventory holding the items to restore.
+        """
+        self._items = [item.clone() for item in state.get_items()]
+
 
 class HoldingPlayer(VulnerablePlayer):
     """
@@ -1525,6 +2792,17 @@ class HoldingPlayer(VulnerablePlayer):
         """
         return self._inventory
 
+    def clone(self) -> "HoldingPlayer":
+        """Return a copy of this player holding a copy of its inventory."""
+        clone = super().clone()
+        clone._inventory = self._inventory.clone()
+        return clone
+
+    def restore(self, state: "HoldingPlayer") -> None:
+        """Restore the infected state and inventory of this player."""
+        super().restore(state)
+        self._inventory.restore(state.get_inventory())
+
     def infect(self) -> None:
         """
         Extend the existing infect method so that the player is
@@ -1563,8 +2841,9 @@ class AdvancedGame(IntermediateGame):
             offset: A position to add to the player's current position
                     to produce the player's new desired position.
         """
-        if self._player_position is not None:
-            destination = self._player_position.add(offset)
+        position = self._grid.find_player()
+        if position is not None:
+            destination = position.add(offset)
             if self._grid.in_bounds(destination):
                 entity = self._grid.get_entity(destination)
                 if entity is not None and isinstance(entity, Pickup):
@@ -1607,6 +2886,75 @@ class AdvancedMapLoader(IntermediateMapLoader):
         return super().create_entity(token)
 
 
+class MapCache:
+    """
+    A MapCache keeps a template Grid for every map file it has loaded and
+    hands out clones of it, so loading the same map again skips reading and
+    parsing the file.
+
+    Templates are keyed by the map file's absolute path, its modification
+    time and the Grid class, so an edited map file is read again. The least
+    recently used templates are dropped once the cache is full.
+    """
+
+    def __init__(self, capacity: int = 8):
+        """
+        Parameters:
+            capacity: The maximum number of template grids to keep.
+        """
+        self._capacity = capacity
+        self._templates: Dict[Tuple[str, int, Type[Grid]], Grid] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def load(self, filename: str, grid_class: Type[Grid] = Grid) -> Grid:
+        """
+        Return a new grid for a map file, cloned from the cached template
+        when the file has not changed since it was last loaded.
+
+        Parameters:
+            filename: Path where the map file should be found.
+            grid_class: The Grid implementation to load the map into.
+        """
+        path = os.path.abspath(filename)
+        key = (path, os.stat(path).st_mtime_ns, grid_class)
+
+        template = self._templates.pop(key, None)
+        if template is None:
+            self._misses += 1
+            for stale in [cached for cached in self._templates
+                          if cached[0] == path and cached[2] is grid_class]:
+                del self._templates[stale]
+            template = AdvancedMapLoader(grid_class).load(path)
+            while len(self._templates) >= self._capacity:
+                del self._templates[next(iter(self._templates))]
+        else:
+            self._hits += 1
+
+        self._templates[key] = template
+        return template.clone()
+
+    def clear(self) -> None:
+        """Drop every cached template."""
+        self._templates.clear()
+
+    def get_hits(self) -> int:
+        """Return the number of loads served from a cached template."""
+        return self._hits
+
+    def get_misses(self) -> int:
+        """Return the number of loads which had to read the map file."""
+        return self._misses
+
+
+_map_cache = MapCache()
+
+
+def get_map_cache() -> MapCache:
+    """Return the map cache used by `advanced_game`."""
+    return _map_cache
+
+
 class AdvancedTextInterface(TextInterface):
     """
     A text-based interface between the user and the game instance.
@@ -1705,54 +3053,134 @@ class AdvancedTextInterface(TextInterface):
                 return  # Should never happen.
 
             # Ensure player has a weapon that they can fire.
+            direction = ""
             if player.get_inventory().contains(CROSSBOW):
                 direction = input(FIRE_PROMPT)
-
-                # Fire the weapon in the indicated direction, if possible.
-                if direction in DIRECTIONS:
-                    start = game.get_grid().find_player()
-                    offset = game.direction_to_offset(direction)
-                    if start is None or offset is None:
-                        return  # Should never happen.
-
-                    # Find the first entity in the direction player fired.
-                    first = first_in_direction(
-                        game.get_grid(), start, offset
-                    )
-
-                    # If the entity is a zombie, kill it.
-                    if first is not None and first[1].display() in ZOMBIES:
-                        position, entity = first
-                        game.get_grid().remove_entity(position)
-                    else:
-                        print(NO_ZOMBIE_MESSAGE)
-
-                else:
-                    print(INVALID_FIRING_MESSAGE)
+                message = fire_crossbow(game, direction)
             else:
-                print(NO_WEAPON_MESSAGE)
+                message = NO_WEAPON_MESSAGE
+            if self._recorder is not None:
+                self._recorder.record(RECORD_ACTION, FIRE + direction)
+            if message is not None:
+                print(message)
             game.step()
         else:
             super().handle_action(game, action)
 
 
-def advanced_game(filename: str) -> AdvancedGame:
+def fire_crossbow(game: Game, direction: str) -> Optional[str]:
+    """
+    Fire the player's crossbow in the given direction, killing the first
+    entity in that direction if it is a zombie. The _step_ event is not
+    triggered.
+
+    Parameters:
+        game: The game that is currently being played.
+        direction: The direction to fire in, one of 'W', 'A', 'S' or 'D'.
+
+    Returns:
+        The message to show the player if no zombie was killed, otherwise None.
+
+    Examples:
+        >>> grid = Grid(4)
+        >>> player = HoldingPlayer()
+        >>> grid.add_entity(Position(0, 0), player)
+        >>> grid.add_entity(Position(0, 3), Zombie())
+        >>> game = AdvancedGame(grid)
+        >>> fire_crossbow(game, DOWN)
+        'You are not holding anything to fire!'
+        >>> player.get_inventory().add_item(Crossbow())
+        >>> fire_crossbow(game, RIGHT)
+        'No zombie in that direction!'
+        >>> fire_crossbow(game, DOWN)
+        >>> grid.serialize()
+        {(0, 0): 'P'}
+    """
+    player = game.get_player()
+    if not isinstance(player, HoldingPlayer) \
+            or not player.get_inventory().contains(CROSSBOW):
+        return NO_WEAPON_MESSAGE
+
+    # Fire the weapon in the indicated direction, if possible.
+    if direction not in DIRECTIONS:
+        return INVALID_FIRING_MESSAGE
+
+    start = game.get_grid().find_player()
+    offset = game.direction_to_offset(direction)
+    if start is None or offset is None:
+        return None  # Should never happen.
+
+    # Find the first entity in the direction player fired.
+    first = first_in_direction(game.get_grid(), start, offset)
+
+    # If the entity is a zombie, kill it.
+    if first is not None and first[1].display() in ZOMBIES:
+        position, entity = first
+        game.get_grid().remove_entity(position)
+        return None
+    return NO_ZOMBIE_MESSAGE
+
+
+def remove_time_machines(game: Game) -> None:
+    """
+    Remove every time machine from the game's grid and the player's
+    inventory, since a time machine can only be used once.
+
+    Parameters:
+        game: The game being played.
+    """
+    grid = game.get_grid()
+    for position in grid.find_entities(TIME_MACHINE):
+        grid.remove_entity(position)
+    player = game.get_player()
+    if isinstance(player, HoldingPlayer):
+        player.get_inventory().remove_items(TIME_MACHINE)
+
+
+def advanced_game(filename: str, grid_class: Type[Grid] = Grid,
+                  use_cache: bool = True,
+                  seed: Optional[int] = None) -> AdvancedGame:
     """
     Return an initialised advanced game corresponding to task 3
     in assignment two.
+
+    Parameters:
+        filename: Path where the map file should be found.
+        grid_class: The Grid implementation to load the map into.
+        use_cache: If true, clone the map from the shared map cache instead
+                   of reading the map file every time.
+        seed: The seed of the game's random number generator, see `Game`.
     """
-    loader = AdvancedMapLoader()
-    grid = loader.load(filename)
-    return AdvancedGame(grid)
+    if use_cache:
+        grid = _map_cache.load(filename, grid_class)
+    else:
+        grid = AdvancedMapLoader(grid_class).load(filename)
+    return AdvancedGame(grid, seed)
 
 
 def main() -> None:
     """Entry point to gameplay."""
+    parser = argparse.ArgumentParser(description="Play EndOfDayz in text.")
+    parser.add_argument("--record", nargs="?", const=time.strftime(REPLAY_FILE),
+                        metavar="LOG",
+                        help="record the session to a log file, by default one named after the current time")
+    arguments = parser.parse_args()
+
     map_file = input("Map: ")
     game = advanced_game(map_file)
 
     app = AdvancedTextInterface(game.get_grid().get_size())
-    app.play(game)
+    if arguments.record is None:
+        app.play(game)
+        return
+
+    from replay import Recorder
+    recorder = Recorder(map_file, arguments.record)
+    app.set_recorder(recorder)
+    try:
+        app.play(game)
+    finally:
+        recorder.close()
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ the hospital whilst evading zombies.
 __author__ = "<Your Name>, <Your Student Number>"
 __email__ = "<Your Student Email>"
 
+import argparse
+import time
 import tkinter as tk
 from a2_solution import *
 from constants import *
@@ -17,11 +19,21 @@ from typing import Tuple, Optional, Dict, List
 from task1 import BasicGraphicalInterface
 from task2 import ImageGraphicalInterface
 from csse7030 import MastersGraphicalInterface
+from replay import Recorder
 
 
 def main() -> None:
     """Entry point to gameplay."""
+    parser = argparse.ArgumentParser(description="Play EndOfDayz.")
+    parser.add_argument("--record", nargs="?", const=time.strftime(REPLAY_FILE),
+                        metavar="LOG",
+                        help="record the session to a log file, by default one named after the current time")
+    arguments = parser.parse_args()
+
     game = advanced_game(MAP_FILE)
+    recorder = None
+    if arguments.record is not None:
+        recorder = Recorder(MAP_FILE, arguments.record)
 
     root = tk.Tk()
     root.title('EndOfDayz')
@@ -31,7 +43,7 @@ def main() -> None:
         gui = ImageGraphicalInterface
     else:
         gui = MastersGraphicalInterface
-    app = gui(root, game.get_grid().get_size())
+    app = gui(root, game.get_grid().get_size(), recorder)
     app.play(game)
     root.mainloop()
 
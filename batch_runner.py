@@ -0,0 +1,315 @@
+"""
+Running many headless games over a pool of processes.
+
+A batch is every combination of a set of maps, seeds and policies, see
+`headless.POLICIES`. The games are handed to worker processes in chunks,
+and every worker returns running statistics of its chunk rather than one
+result per game, so neither the memory used nor the traffic between
+processes grows with the number of games.
+
+Run with `python batch_runner.py <map> ... --games <n>` to play a batch and
+print a summary of every map and policy.
+"""
+
+import argparse
+import itertools
+import math
+import multiprocessing
+import time
+from collections import deque
+from multiprocessing.pool import AsyncResult
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from a2_solution import *
+from constants import *
+from headless import LOST, POLICIES, UNFINISHED, WON, run_game
+
+# A game to play: the map file, the seed and the name of the policy.
+Job = Tuple[str, int, str]
+
+
+class RunningStats:
+    """
+    RunningStats keeps the count, mean, variance, minimum and maximum of a
+    stream of values in constant memory, using Welford's algorithm.
+
+    Examples:
+        >>> stats = RunningStats()
+        >>> for value in (2, 4, 4, 4, 5, 5, 7, 9):
+        ...     stats.add(value)
+        >>> stats.get_count(), stats.get_mean(), stats.get_stdev()
+        (8, 5.0, 2.0)
+        >>> other = RunningStats()
+        >>> other.add(11)
+        >>> stats.merge(other)
+        >>> stats.get_count(), stats.get_mean(), stats.get_max()
+        (9, 5.666666666666667, 11)
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._mean = 0.0
+        self._squares = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the stream.
+
+        Parameters:
+            value: The value to add.
+        """
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._squares += delta * (value - self._mean)
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        """
+        Add the values of another stream, e.g. one kept by another process.
+
+        Parameters:
+            other: The statistics of the other stream.
+        """
+        if other._count == 0:
+            return
+        count = self._count + other._count
+        delta = other._mean - self._mean
+        self._mean += delta * other._count / count
+        self._squares += (other._squares
+                          + delta * delta * self._count * other._count / count)
+        self._count = count
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+    def get_count(self) -> int:
+        """Return the number of values added."""
+        return self._count
+
+    def get_mean(self) -> float:
+        """Return the mean of the values, 0 if there are none."""
+        return self._mean
+
+    def get_variance(self) -> float:
+        """Return the population variance of the values."""
+        return self._squares / self._count if self._count else 0.0
+
+    def get_stdev(self) -> float:
+        """Return the population standard deviation of the values."""
+        return math.sqrt(self.get_variance())
+
+    def get_min(self) -> float:
+        """Return the smallest value added."""
+        return self._min
+
+    def get_max(self) -> float:
+        """Return the largest value added."""
+        return self._max
+
+
+class Summary:
+    """
+    A Summary counts the outcomes of a group of games, and keeps running
+    statistics of their steps, moves, pickups used and play time.
+    """
+
+    STATISTICS = ("steps", "moves", "uses", "seconds")
+
+    def __init__(self):
+        self._outcomes: Dict[str, int] = {}
+        self._stats = {name: RunningStats() for name in self.STATISTICS}
+
+    def add(self, outcome: str, steps: int, moves: int, uses: int,
+            seconds: float) -> None:
+        """
+        Add the result of a game.
+
+        Parameters:
+            outcome: How the game ended, see `headless`.
+            steps: The steps the game took.
+            moves: The moves the player made.
+            uses: The number of times the player used a pickup, see
+                  `headless.uses_pickup`.
+            seconds: The time taken to play the game.
+        """
+        self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+        for name, value in zip(self.STATISTICS,
+                               (steps, moves, uses, seconds)):
+            self._stats[name].add(value)
+
+    def merge(self, other: "Summary") -> None:
+        """
+        Add the games of another summary.
+
+        Parameters:
+            other: The summary to add.
+        """
+        for outcome, count in other._outcomes.items():
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + count
+        for name in self.STATISTICS:
+            self._stats[name].merge(other._stats[name])
+
+    def get_games(self) -> int:
+        """Return the number of games summarised."""
+        return sum(self._outcomes.values())
+
+    def get_outcomes(self) -> Dict[str, int]:
+        """Return the number of games of every outcome."""
+        return dict(self._outcomes)
+
+    def get_stats(self, name: str) -> RunningStats:
+        """
+        Return the statistics of one of the STATISTICS.
+
+        Parameters:
+            name: The name of the statistic.
+        """
+        return self._stats[name]
+
+
+def run_jobs(jobs: List[Job], max_ticks: int = HEADLESS_MAX_TICKS,
+             ) -> Dict[Tuple[str, str], Summary]:
+    """
+    Play the games of a chunk of jobs and summarise them by map and policy.
+
+    Parameters:
+        jobs: The games to play.
+        max_ticks: The number of ticks after which a game is unfinished.
+    """
+    summaries: Dict[Tuple[str, str], Summary] = {}
+    for map_file, seed, policy in jobs:
+        game = advanced_game(map_file, seed=seed)
+        result = run_game(game, POLICIES[policy](seed), max_ticks)
+        summary = summaries.setdefault((map_file, policy), Summary())
+        summary.add(result.outcome, result.steps, result.moves, result.uses,
+                    result.elapsed)
+    return summaries
+
+
+def _run_chunk(arguments: Tuple[List[Job], int],
+               ) -> Dict[Tuple[str, str], Summary]:
+    """Run a chunk of jobs in a worker process, see `run_jobs`."""
+    return run_jobs(*arguments)
+
+
+def make_jobs(maps: Iterable[str], seeds: Iterable[int],
+              policies: Iterable[str]) -> Iterator[Job]:
+    """
+    Yield a job for every combination of map, seed and policy.
+
+    Parameters:
+        maps: The map files to play.
+        seeds: The seeds to play every map and policy with.
+        policies: The names of the policies to play with.
+    """
+    return itertools.product(maps, seeds, policies)
+
+
+def _chunks(jobs: Iterator[Job], size: int) -> Iterator[List[Job]]:
+    """Yield lists of at most size jobs until the jobs run out."""
+    while True:
+        chunk = list(itertools.islice(jobs, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(jobs: Iterable[Job], processes: Optional[int] = None,
+              max_ticks: int = HEADLESS_MAX_TICKS, chunk_size: int = 64,
+              ) -> Dict[Tuple[str, str], Summary]:
+    """
+    Play a batch of games over a pool of worker processes and summarise
+    them by map and policy.
+
+    Jobs are read lazily, a few chunks ahead of the workers, so a batch may
+    be a generator of any length.
+
+    Parameters:
+        jobs: The games to play.
+        processes: The number of worker processes, by default one per CPU.
+                   With one process the games are played in this process.
+        max_ticks: The number of ticks after which a game is unfinished.
+        chunk_size: The number of games handed to a worker at a time.
+
+    Examples:
+        >>> summaries = run_batch(make_jobs(["maps/basic.txt"], range(5),
+        ...                                 ["idle", "autopilot"]),
+        ...                       processes=1)
+        >>> summaries["maps/basic.txt", "autopilot"].get_outcomes()
+        {'won': 5}
+        >>> summaries["maps/basic.txt", "idle"].get_outcomes()
+        {'unfinished': 5}
+    """
+    chunks = ((chunk, max_ticks)
+              for chunk in _chunks(iter(jobs), chunk_size))
+    summaries: Dict[Tuple[str, str], Summary] = {}
+
+    def merge(partial: Dict[Tuple[str, str], Summary]) -> None:
+        for key, summary in partial.items():
+            summaries.setdefault(key, Summary()).merge(summary)
+
+    if processes == 1:
+        for chunk in chunks:
+            merge(_run_chunk(chunk))
+        return summaries
+
+    with multiprocessing.Pool(processes) as pool:
+        # Pool.imap would read every job up front, so only a few chunks per
+        # worker are handed out at a time.
+        limit = 4 * (processes or multiprocessing.cpu_count())
+        pending: Deque[AsyncResult] = deque()
+        for chunk in chunks:
+            if len(pending) == limit:
+                merge(pending.popleft().get())
+            pending.append(pool.apply_async(_run_chunk, (chunk,)))
+        while pending:
+            merge(pending.popleft().get())
+    return summaries
+
+
+def main() -> None:
+    """Play the batch given on the command line and print a summary."""
+    parser = argparse.ArgumentParser(
+        description="Play a batch of headless games over many processes.")
+    parser.add_argument("maps", nargs="+", help="the map files to play")
+    parser.add_argument("--games", type=int, default=1000,
+                        help="the number of games of every map and policy")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="the seed of the first game")
+    parser.add_argument("--policies", nargs="+", default=["random"],
+                        choices=sorted(POLICIES),
+                        help="the policies to play with")
+    parser.add_argument("--processes", type=int,
+                        help="the number of worker processes")
+    parser.add_argument("--max-ticks", type=int, default=HEADLESS_MAX_TICKS,
+                        help="the ticks after which a game is unfinished")
+    arguments = parser.parse_args()
+
+    seeds = range(arguments.seed, arguments.seed + arguments.games)
+    started = time.perf_counter()
+    summaries = run_batch(
+        make_jobs(arguments.maps, seeds, arguments.policies),
+        arguments.processes, arguments.max_ticks)
+    elapsed = time.perf_counter() - started
+
+    games = sum(summary.get_games() for summary in summaries.values())
+    print(f"{games} games in {elapsed:.2f}s ({games / elapsed:.0f} games/s)")
+    print(f"{'map':<20} {'policy':<8} {'won':>6} {'lost':>6} {'unfin':>6}"
+          f" {'steps':>13} {'moves':>13} {'uses':>8}")
+    for (map_file, policy), summary in sorted(summaries.items()):
+        outcomes = summary.get_outcomes()
+        steps = summary.get_stats("steps")
+        moves = summary.get_stats("moves")
+        print(f"{map_file:<20} {policy:<8} {outcomes.get(WON, 0):>6}"
+              f" {outcomes.get(LOST, 0):>6}"
+              f" {outcomes.get(UNFINISHED, 0):>6}"
+              f" {steps.get_mean():>6.1f}±{steps.get_stdev():<6.1f}"
+              f" {moves.get_mean():>6.1f}±{moves.get_stdev():<6.1f}"
+              f" {summary.get_stats('uses').get_mean():>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
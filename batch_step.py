@@ -0,0 +1,211 @@
+"""
+Vectorized stepping of wandering zombies for games with very many zombies.
+
+BatchGame computes the moves of every wandering zombie in a tick at once
+with NumPy arrays, instead of calling `Zombie.step` one zombie at a time.
+NumPy is optional: without it, every BatchGame steps sequentially.
+"""
+
+import copy
+from typing import List, Optional, Type
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from a2_solution import *
+from constants import *
+
+_OFFSETS = np.array(OFFSETS, dtype=np.int64) if np is not None else None
+
+
+def is_wandering(entity: Entity) -> bool:
+    """
+    Return true if the entity is a zombie that wanders at random,
+    i.e. a zombie but not a tracking zombie.
+
+    Parameters:
+        entity: The entity to check.
+    """
+    return (isinstance(entity, Zombie)
+            and not isinstance(entity, TrackingZombie))
+
+
+class BatchGame(AdvancedGame):
+    """
+    BatchGame extends AdvancedGame by moving all wandering zombies of a tick
+    in one vectorized batch.
+
+    Each wandering zombie picks a random order of the four directions and
+    moves to the first available cell, infecting the player instead if the
+    player is in the way, just like `Zombie.step`. The batch is resolved in
+    rounds, one direction per round: zombies whose candidate cell is out of
+    bounds or occupied fall through to their next direction, and when
+    several zombies pick the same free cell the one earliest in the grid's
+    step order wins it.
+
+    Unlike the sequential step, cells vacated by zombies during a tick only
+    become available on the next tick. Tracking zombies and the player are
+    stepped sequentially after the batch.
+
+    With `sequential` set, or when NumPy is not installed, the game steps
+    exactly like AdvancedGame, one entity at a time in the grid's step order.
+
+    Examples:
+        >>> batched = batch_game("maps/basic3.txt", sequential=True, seed=3)
+        >>> reference = advanced_game("maps/basic3.txt", seed=3)
+        >>> for _ in range(20):
+        ...     batched.step()
+        ...     reference.step()
+        >>> batched.get_grid().serialize() == reference.get_grid().serialize()
+        True
+
+        Where every zombie has a single free cell to move to, batched zombies
+        move just like stepping them one at a time.
+
+        >>> def cornered(game_class):
+        ...     grid = Grid(3)
+        ...     for x in range(3):
+        ...         for y in range(3):
+        ...             grid.add_entity(Position(x, y), Garlic())
+        ...     for x, y in ((0, 0), (2, 2)):
+        ...         grid.add_entity(Position(x, y), Zombie())
+        ...     for x, y in ((0, 1), (2, 1)):
+        ...         grid.remove_entity(Position(x, y))
+        ...     return game_class(grid, seed=5)
+        >>> batched, reference = cornered(BatchGame), cornered(AdvancedGame)
+        >>> batched.step()
+        >>> reference.step()
+        >>> grid = batched.get_grid()
+        >>> grid.get_entity(Position(0, 1)), grid.get_entity(Position(2, 1))
+        (Zombie(), Zombie())
+        >>> batched.get_grid().serialize() == reference.get_grid().serialize()
+        True
+    """
+
+    def __init__(self, grid: Grid, sequential: bool = False,
+                 seed: Optional[int] = None):
+        """
+        Parameters:
+            grid: The game's grid.
+            sequential: If true, step entities one at a time like AdvancedGame.
+                        Always true when NumPy is not installed.
+            seed: The seed of the game's random number generator, see `Game`,
+                  also used to seed the random directions of batched zombies.
+        """
+        super().__init__(grid, seed)
+        self._sequential = sequential or np is None
+        self._batch_random = (np.random.default_rng(self.get_seed())
+                              if np is not None else None)
+
+    def is_sequential(self) -> bool:
+        """Return true if this game steps entities one at a time."""
+        return self._sequential
+
+    def clone(self) -> "BatchGame":
+        """
+        Return an independent copy of this game, including the state of the
+        random generator used by batched zombies.
+        """
+        clone = super().clone()
+        clone._batch_random = copy.deepcopy(self._batch_random)
+        return clone
+
+    def step(self) -> None:
+        """
+        Trigger the _step_ event, moving all wandering zombies in one batch
+        before stepping the remaining entities in the grid's step order.
+        """
+        if self._sequential:
+            super().step()
+            return
+
+        mapping = self._grid.get_step_mapping()
+        wandering = [position for position, entity in mapping.items()
+                     if is_wandering(entity)]
+        if wandering:
+            self._step_wandering(wandering)
+
+        for position, entity in mapping.items():
+            if not is_wandering(entity):
+                entity.step(position, self)
+        self._steps += 1
+
+    def _step_wandering(self, positions: List[Position]) -> None:
+        """
+        Move the wandering zombies at the given positions.
+
+        Parameters:
+            positions: The zombie positions, in the grid's step order.
+        """
+        grid = self._grid
+        size = grid.get_size()
+        count = len(positions)
+
+        coordinates = np.array([(position.get_x(), position.get_y())
+                                for position in positions], dtype=np.int64)
+
+        # A random order of the four directions for every zombie.
+        order = np.argsort(self._batch_random.random((count, 4)), axis=1)
+        destinations = coordinates[:, None, :] + _OFFSETS[order]
+        xs = destinations[:, :, 0]
+        ys = destinations[:, :, 1]
+        inside = (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size)
+        cells = np.where(inside, ys * size + xs, -1)
+
+        occupancy = np.frombuffer(grid.get_occupancy(), dtype=np.uint8).copy()
+        player = ord(PLAYER)
+        zombie = ord(ZOMBIE)
+
+        undecided = np.ones(count, dtype=bool)
+        targets = np.full(count, -1, dtype=np.int64)
+        infected = False
+
+        for choice in range(4):
+            zombies = np.flatnonzero(undecided)
+            if zombies.size == 0:
+                break
+            candidates = cells[zombies, choice]
+            valid = candidates >= 0
+            codes = np.zeros(zombies.size, dtype=np.uint8)
+            codes[valid] = occupancy[candidates[valid]]
+
+            # Zombies that reach the player infect them and stay put.
+            reached = valid & (codes == player)
+            if reached.any():
+                infected = True
+                undecided[zombies[reached]] = False
+
+            # The first zombie, in step order, to pick a free cell claims it.
+            free = valid & (codes == 0)
+            claimed, first = np.unique(candidates[free], return_index=True)
+            winners = zombies[free][first]
+            targets[winners] = claimed
+            occupancy[claimed] = zombie
+            undecided[winners] = False
+
+        if infected:
+            player_entity = self.get_player()
+            if isinstance(player_entity, VulnerablePlayer):
+                player_entity.infect()
+
+        for index in np.flatnonzero(targets >= 0):
+            y, x = divmod(int(targets[index]), size)
+            grid.move_entity(positions[index], Position(x, y))
+
+
+def batch_game(filename: str, sequential: bool = False,
+               seed: Optional[int] = None,
+               grid_class: Type[Grid] = DenseGrid) -> BatchGame:
+    """
+    Return an initialised batch game for the given map file.
+
+    Parameters:
+        filename: Path where the map file should be found.
+        sequential: If true, step entities one at a time like AdvancedGame.
+        seed: The seed of the game's random number generators.
+        grid_class: The Grid implementation to load the map into.
+    """
+    grid = AdvancedMapLoader(grid_class).load(filename)
+    return BatchGame(grid, sequential, seed)
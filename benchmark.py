@@ -0,0 +1,993 @@
+"""
+Micro-benchmarks for the game model.
+
+Run with `python benchmark.py` to print timings for the model hot paths, or
+with `python benchmark.py --json <file>` to run the benchmark suite over a
+range of map sizes and entity densities and write the results as JSON, so
+they can be compared between commits.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from a2_solution import *
+from batch_runner import make_jobs, run_batch
+from binary_map import convert_text_map, read_binary_map
+from constants import *
+from csse7030 import MastersGraphicalInterface
+from history import History
+from map_generator import generate_grid, generate_map
+from model_class import BasicMap, ImageMap, InventoryView
+from planner import plan_route
+from task1 import BasicGraphicalInterface
+from task2 import ImageGraphicalInterface
+
+SUITE_SIZES = [10, 50, 200]
+SUITE_DENSITIES = [0.01, 0.1]
+
+
+class ScanningGrid(Grid):
+    """
+    A Grid that finds the player by scanning every tile, as Grid did before
+    player positions were indexed. Used as the baseline for comparisons.
+    """
+
+    def find_player(self) -> Optional[Position]:
+        for position, entity in self._tiles.items():
+            if entity.display() == PLAYER:
+                return position
+        return None
+
+
+class SortingTrackingZombie(TrackingZombie):
+    """
+    A TrackingZombie that sorts the directions by their manhattan distance to
+    the player, as tracking zombies did before the shared distance field.
+    Used as the baseline for comparisons.
+    """
+
+    def _directions(
+        self, position: Position, game: Game
+    ) -> List[Tuple[int, int]]:
+        target = game.get_grid().find_player()
+        if target is None:
+            return []
+
+        def distance(direction):
+            new_position = position.add(Position(*direction))
+            return new_position.distance(target), direction
+
+        return sorted(OFFSETS, key=distance)
+
+
+class StubCanvas:
+    """
+    A stand-in for tk.Canvas which keeps its items in a dictionary and counts
+    the items created and the calls made, so views can be measured without a
+    display.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._next_item = 1
+        self._created = 0
+        self._calls = 0
+
+    def get_created(self) -> int:
+        """Return the number of items created."""
+        return self._created
+
+    def get_calls(self) -> int:
+        """Return the number of calls made to the canvas."""
+        return self._calls
+
+    def get_item_count(self) -> int:
+        """Return the number of items currently on the canvas."""
+        return len(self._items)
+
+    def _create(self, *coords, **options) -> int:
+        item = self._next_item
+        self._next_item += 1
+        self._items[item] = [list(coords), options]
+        self._created += 1
+        self._calls += 1
+        return item
+
+    create_rectangle = create_text = create_image = _create
+
+    def delete(self, *items) -> None:
+        self._calls += 1
+        for item in items:
+            if item == "all":
+                self._items.clear()
+            elif isinstance(item, str):
+                for tagged in [tagged for tagged, (_, options)
+                               in self._items.items()
+                               if options.get("tags") == item]:
+                    del self._items[tagged]
+            else:
+                self._items.pop(item, None)
+
+    def coords(self, item: int, *coords) -> None:
+        self._calls += 1
+        self._items[item][0] = list(coords)
+
+    def itemconfigure(self, item: int, **options) -> None:
+        self._calls += 1
+        self._items[item][1].update(options)
+
+    def pack(self, **options) -> None:
+        self._calls += 1
+
+
+class StubBasicMap(BasicMap):
+    """A BasicMap drawing on a StubCanvas instead of a Tk canvas."""
+
+    def __init__(self, size: int):
+        self._rows = self._cols = size
+        self._rec_width = self._rec_height = CELL_SIZE
+        self._width = self._height = CELL_SIZE * size
+        self._basic_map_canvas = StubCanvas()
+        self._init_cells()
+
+    def get_canvas(self) -> StubCanvas:
+        """Return the stub canvas the map draws on."""
+        return self._basic_map_canvas
+
+    def redraw(self, grid: Grid) -> None:
+        """
+        Draw the grid the way the Task 1 interface did before incremental
+        rendering: clear the canvas and draw every occupied cell.
+        """
+        self._basic_map_canvas.delete("all")
+        mapping = grid.serialize()
+        for y in range(self._rows):
+            for x in range(self._cols):
+                tile = mapping.get((x, y), " ")
+                if tile != " ":
+                    self.draw_entity(Position(x, y), tile)
+
+
+class StubImageMap(ImageMap):
+    """
+    An ImageMap drawing on a StubCanvas instead of a Tk canvas, with image
+    file names in place of images.
+    """
+
+    def __init__(self, size: int):
+        self._rows = self._cols = size
+        self._rec_width = self._rec_height = CELL_SIZE
+        self._width = self._height = CELL_SIZE * size
+        self._basic_map_canvas = StubCanvas()
+        self._init_cells()
+
+    def get_canvas(self) -> StubCanvas:
+        """Return the stub canvas the map draws on."""
+        return self._basic_map_canvas
+
+    def _get_image(self, tile_type: str) -> str:
+        return self._entity_image_dict[tile_type]
+
+
+class StubInventoryView(InventoryView):
+    """An InventoryView drawing on a StubCanvas instead of a Tk canvas."""
+
+    def __init__(self, rows: int):
+        self._rows_y = rows
+        self._cols_x = 2
+        self._rec_height = CELL_SIZE
+        self._rec_width = INVENTORY_WIDTH // self._cols_x
+        self._width = INVENTORY_WIDTH
+        self._height = self._rec_height * self._rows_y
+        self._inventory_view_canvas = StubCanvas()
+        self._init_rows()
+
+    def get_canvas(self) -> StubCanvas:
+        """Return the stub canvas the inventory draws on."""
+        return self._inventory_view_canvas
+
+    def redraw(self, inventory: Inventory) -> None:
+        """
+        Draw the inventory the way the interfaces did before incremental
+        updates: delete every row and create four items for each item.
+        """
+        canvas = self._inventory_view_canvas
+        canvas.delete("pickup")
+        for row_y, item in enumerate(inventory.get_items(), start=1):
+            color = DARK_PURPLE if item.is_active() else LIGHT_PURPLE
+            for col_x, text in ((0, item.__class__.__name__),
+                                (1, item.get_lifetime())):
+                position = Position(col_x, row_y)
+                canvas.create_rectangle(*self.get_bbox(position), fill=color,
+                                        outline=color, tags="pickup")
+                center = self.get_position_center(position)
+                canvas.create_text(center.get_x(), center.get_y(), text=text,
+                                   tags="pickup")
+        canvas.pack(side="top")
+
+
+def time_call(function: Callable[[], None], repeat: int = 5) -> float:
+    """
+    Return the best wall-clock time, in seconds, of calling a function.
+
+    Parameters:
+        function: The function to time.
+        repeat: How many times to call the function.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def zombie_game(size: int, zombies: int, tracking: bool = True,
+                grid_class: Type[Grid] = Grid, seed: int = 0,
+                tracking_class: Type[Zombie] = TrackingZombie) -> AdvancedGame:
+    """
+    Return a game with a player in the top left corner, a hospital in the
+    bottom right corner and the given number of zombies placed at random.
+
+    The player is added last, as it would be after its first move, so that
+    it is at the end of the grid's iteration order.
+
+    Parameters:
+        size: The size of the grid.
+        zombies: The number of zombies to place.
+        tracking: Whether to place tracking zombies or wandering zombies.
+        grid_class: The Grid implementation to use.
+        seed: Seed for the zombie placement and for the game.
+        tracking_class: The class used for tracking zombies.
+    """
+    grid = grid_class(size)
+    grid.add_entity(Position(size - 1, size - 1), Hospital())
+
+    free = [(x, y) for y in range(size) for x in range(size)
+            if (x, y) != (0, 0) and grid.get_entity(Position(x, y)) is None]
+    for x, y in random.Random(seed).sample(free, zombies):
+        grid.add_entity(Position(x, y),
+                        tracking_class() if tracking else Zombie())
+
+    grid.add_entity(Position(0, 0), HoldingPlayer())
+    return AdvancedGame(grid, seed=seed)
+
+
+def with_zombies(grid: Grid, zombie_class: Type[Zombie]) -> Grid:
+    """
+    Return a copy of a grid in which every zombie, wandering or tracking, is
+    replaced by a zombie of the given class.
+
+    Parameters:
+        grid: The grid to copy.
+        zombie_class: The class of zombie to place.
+    """
+    copied = grid.clone()
+    for token in ZOMBIES:
+        for position in copied.find_entities(token):
+            copied.add_entity(position, zombie_class())
+    return copied
+
+
+def time_tick(make_game: Callable[[], Game], repeat: int = 3) -> float:
+    """
+    Return the best time, in seconds, of the first tick of freshly made games.
+
+    Parameters:
+        make_game: Function returning a new game to step.
+        repeat: How many games to make and step.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        game = make_game()
+        best = min(best, time_call(game.step, repeat=1))
+    return best
+
+
+def bench_tracking_tick(counts: List[int], density: float = 0.1,
+                        ) -> List[Tuple[int, float, float]]:
+    """
+    Time one game tick with a growing number of tracking zombies, using the
+    indexed find_player and the scanning baseline.
+
+    The map grows with the zombie count so that the zombie density stays
+    fixed. Returns (zombies, indexed seconds, scanning seconds) tuples.
+
+    Parameters:
+        counts: The zombie counts to measure.
+        density: The fraction of the map occupied by zombies.
+    """
+    results = []
+    for count in counts:
+        size = max(3, int((count / density) ** 0.5) + 1)
+        timings = []
+        for grid_class in (Grid, ScanningGrid):
+            timings.append(time_tick(
+                lambda: zombie_game(size, count, grid_class=grid_class)))
+        results.append((count, timings[0], timings[1]))
+    return results
+
+
+def bench_pursuit_tick(counts: List[int], density: float = 0.1,
+                       ticks: int = 5) -> List[Tuple[int, float, float]]:
+    """
+    Time the average game tick, over several consecutive ticks, with
+    tracking zombies steered by the shared distance field and by the
+    per-zombie sort baseline.
+
+    The map grows with the zombie count so that the zombie density stays
+    fixed. Returns (zombies, field seconds, sorting seconds) tuples.
+
+    Parameters:
+        counts: The zombie counts to measure.
+        density: The fraction of the map occupied by zombies.
+        ticks: The number of consecutive ticks to average over.
+    """
+    results = []
+    for count in counts:
+        size = max(3, int((count / density) ** 0.5) + 1)
+        timings = []
+        for zombie_class in (TrackingZombie, SortingTrackingZombie):
+            game = zombie_game(size, count, tracking_class=zombie_class)
+
+            def run_ticks():
+                for _ in range(ticks):
+                    game.step()
+
+            timings.append(time_call(run_ticks, repeat=1) / ticks)
+        results.append((count, timings[0], timings[1]))
+    return results
+
+
+def bench_map_parse(sizes: List[int], density: float = 0.01,
+                    ) -> List[Tuple[int, float, float, float]]:
+    """
+    Time parsing a sparse map of wandering zombies with `load_map`, with
+    `stream_map` and from the equivalent binary map file.
+
+    Only reading the entities is timed, not building the grid, which costs
+    the same whichever way the map is read.
+
+    Returns (size, load_map seconds, stream_map seconds, binary seconds)
+    tuples.
+
+    Parameters:
+        sizes: The map sizes to measure.
+        density: The fraction of the map occupied by zombies.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            text = os.path.join(directory, f"{size}.txt")
+            binary = os.path.join(directory, f"{size}.map")
+            rows = [[" "] * size for _ in range(size)]
+            cells = random.Random(0).sample(range(1, size * size),
+                                            int(size * size * density))
+            for cell in cells:
+                rows[cell // size][cell % size] = ZOMBIE
+            rows[0][0] = PLAYER
+            with open(text, "w") as map_file:
+                map_file.writelines("".join(row) + "\n" for row in rows)
+            convert_text_map(text, binary)
+
+            results.append((
+                size,
+                time_call(lambda: load_map(text), repeat=3),
+                time_call(lambda: list(stream_map(text)), repeat=3),
+                time_call(lambda: list(read_binary_map(binary).entities()),
+                          repeat=3),
+            ))
+    return results
+
+
+def bench_restart(size: int = 1000, density: float = 0.05,
+                  ) -> Tuple[float, float]:
+    """
+    Time starting a new game on a large text map, reading the map file
+    every time and cloning it from the map cache.
+
+    Returns (uncached seconds, cached seconds).
+
+    Parameters:
+        size: The map size.
+        density: The fraction of the map occupied by zombies.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "restart.txt")
+        rows = [[" "] * size for _ in range(size)]
+        for cell in random.Random(0).sample(range(1, size * size),
+                                            int(size * size * density)):
+            rows[cell // size][cell % size] = ZOMBIE
+        rows[0][0] = PLAYER
+        with open(filename, "w") as map_file:
+            map_file.writelines("".join(row) + "\n" for row in rows)
+
+        uncached = time_call(
+            lambda: advanced_game(filename, use_cache=False), repeat=3)
+        advanced_game(filename)
+        cached = time_call(lambda: advanced_game(filename), repeat=3)
+        get_map_cache().clear()
+    return uncached, cached
+
+
+def _duplication_dict(game_dict: Dict) -> Dict:
+    """
+    Return a dictionary copy of a game's __dict__, the way the time machine
+    snapshotted games before `Game.clone`. Kept as a baseline to compare
+    clone snapshots against.
+
+    Parameters:
+        game_dict: The game.__dict__ to copy.
+    """
+    duplication_dict = {}
+    for key, item in game_dict.items():
+        if isinstance(item, int) or isinstance(item, str) or isinstance(item, bool):
+            duplication_dict[key] = item
+        elif isinstance(item, dict):
+            duplication_dict[key] = _duplication_dict(item)
+        elif isinstance(item, list):
+            temp = []
+            for list_item in item:
+                if not hasattr(list_item, '__dict__'):
+                    temp.append(list_item)
+                    continue
+                tmp = list_item.__dict__
+                tmp['class_name'] = list_item.__class__.__name__
+                temp.append(tmp)
+            duplication_dict[key] = temp
+        elif isinstance(item, Position) or not hasattr(item, '__dict__'):
+            # Positions, tuples and None are immutable, so they can be shared.
+            duplication_dict[key] = item
+        else:
+            duplication_dict[key] = _duplication_dict(game_dict[key].__dict__)
+            duplication_dict[key]['class_name'] = game_dict[key].__class__.__name__
+    return duplication_dict
+
+
+def _game_from_dict(game_dict: Dict) -> Game:
+    """
+    Rebuild a game, without its time machines, from a dictionary made by
+    `_duplication_dict`, the way the time machine restored snapshots before
+    `Game.clone`.
+
+    Parameters:
+        game_dict: The dictionary copy of the game.
+    """
+    grid = Grid(game_dict['_grid']['_size'])
+    for key, item in game_dict['_grid']['_tiles'].items():
+        if item['class_name'] == 'Crossbow':
+            crossbow = Crossbow()
+            crossbow._lifetime = item['_lifetime']
+            crossbow._using = item['_using']
+            grid.add_entity(key, crossbow)
+        elif item['class_name'] == 'Garlic':
+            garlic = Garlic()
+            garlic._lifetime = item['_lifetime']
+            garlic._using = item['_using']
+            grid.add_entity(key, garlic)
+        elif item['class_name'] == 'Zombie':
+            grid.add_entity(key, Zombie())
+        elif item['class_name'] == 'TrackingZombie':
+            grid.add_entity(key, TrackingZombie())
+        elif item['class_name'] == 'Hospital':
+            grid.add_entity(key, Hospital())
+        elif item['class_name'] == 'HoldingPlayer':
+            player = HoldingPlayer()
+            player._infected = item['_infected']
+            pickup_item_list = []
+            for pick in item['_inventory']['_items']:
+                if pick['class_name'] == 'Crossbow':
+                    crossbow = Crossbow()
+                    crossbow._lifetime = pick['_lifetime']
+                    crossbow._using = pick['_using']
+                    pickup_item_list.append(crossbow)
+                elif pick['class_name'] == 'Garlic':
+                    garlic = Garlic()
+                    garlic._lifetime = pick['_lifetime']
+                    garlic._using = pick['_using']
+                    pickup_item_list.append(garlic)
+            player.get_inventory()._items = pickup_item_list
+            grid.add_entity(key, player)
+    game = AdvancedGame(grid)
+    game._steps = game_dict['_steps']
+    game._moves = game_dict['_moves']
+    return game
+
+
+def clone_snapshot(game: Game) -> Game:
+    """
+    Return a time machine snapshot of a game: a clone without its time
+    machines.
+
+    Parameters:
+        game: The game to snapshot.
+    """
+    snapshot = game.clone()
+    remove_time_machines(snapshot)
+    return snapshot
+
+
+def bench_snapshot(counts: List[int], density: float = 0.1,
+                   ) -> List[Tuple[int, float, float]]:
+    """
+    Time taking a time machine snapshot of a game, with `Game.clone` and
+    with the dictionary round trip it replaced.
+
+    The map grows with the zombie count so that the zombie density stays
+    fixed. Returns (zombies, clone seconds, dict seconds) tuples.
+
+    Parameters:
+        counts: The zombie counts to measure.
+        density: The fraction of the map occupied by zombies.
+    """
+    results = []
+    for count in counts:
+        size = max(3, int((count / density) ** 0.5) + 1)
+        game = zombie_game(size, count, tracking=False)
+        inventory = game.get_player().get_inventory()
+        inventory.add_item(Garlic())
+        inventory.add_item(Crossbow())
+
+        results.append((
+            count,
+            time_call(lambda: clone_snapshot(game)),
+            time_call(lambda: _game_from_dict(
+                _duplication_dict(game.__dict__))),
+        ))
+    return results
+
+
+def bench_history(counts: List[int], density: float = 0.1, moves: int = 20,
+                  ) -> List[Tuple[int, float, float]]:
+    """
+    Time the time machine bookkeeping of a move followed by a tick, either
+    recording deltas in a History or taking a clone snapshot. Wandering
+    zombies are used, so every zombie may move every tick.
+
+    The map grows with the zombie count so that the zombie density stays
+    fixed. Returns (zombies, history seconds, clone seconds) tuples, where
+    the seconds are the average cost per move on top of the move and tick.
+
+    Parameters:
+        counts: The zombie counts to measure.
+        density: The fraction of the map occupied by zombies.
+        moves: The number of moves to average over.
+    """
+    results = []
+    for count in counts:
+        size = max(3, int((count / density) ** 0.5) + 1)
+        timings = []
+        for snapshot in ("none", "history", "clone"):
+
+            def play():
+                game = zombie_game(size, count, tracking=False)
+                history = History(game) if snapshot == "history" else None
+                start = time.perf_counter()
+                for move in range(moves):
+                    if history is not None:
+                        history.checkpoint()
+                    game.move_player(Position(0, move % 2 * 2 - 1))
+                    game.step()
+                    if snapshot == "clone":
+                        clone_snapshot(game)
+                return time.perf_counter() - start
+
+            timings.append(min(play() for _ in range(3)) / moves)
+        results.append((count, timings[1] - timings[0],
+                        timings[2] - timings[0]))
+    return results
+
+
+def bench_history_memory(count: int = 1000, density: float = 0.1,
+                         depth: int = 200) -> Tuple[int, int]:
+    """
+    Measure the memory held by a full time machine history after as many
+    moves as the history is deep, with tracking zombies that keep moving.
+
+    Returns (history bytes, clone snapshots bytes).
+
+    Parameters:
+        count: The number of zombies.
+        density: The fraction of the map occupied by zombies.
+        depth: The number of moves kept in the history.
+    """
+    size = max(3, int((count / density) ** 0.5) + 1)
+    results = []
+    for snapshot in ("history", "clone"):
+        game = zombie_game(size, count)
+        tracemalloc.start()
+        history = History(game, depth)
+        snapshots = []
+        for move in range(depth):
+            if snapshot == "history":
+                history.checkpoint()
+            game.move_player(Position(0, move % 2 * 2 - 1))
+            game.step()
+            if snapshot == "clone":
+                snapshots.append(clone_snapshot(game))
+        results.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        history.close()
+    return results[0], results[1]
+
+
+def bench_render_items(size: int = 100, zombies: int = 1000,
+                       ticks: int = 50, restart_every: int = 10,
+                       ) -> List[Tuple[str, float, float]]:
+    """
+    Count the canvas items created and canvas calls made per tick by the
+    Task 1 map, redrawing everything and rendering incrementally with item
+    pooling. A zombie is shot every tick and the game restarts regularly,
+    so cells are vacated and refilled.
+
+    Returns (mode, items created per tick, canvas calls per tick) tuples.
+
+    Parameters:
+        size: The map size.
+        zombies: The number of wandering zombies.
+        ticks: The number of ticks to play.
+        restart_every: How many ticks to play before restarting.
+    """
+    results = []
+    for mode in ("redraw", "pooled"):
+        view = StubBasicMap(size)
+        canvas = view.get_canvas()
+        game = None
+        for tick in range(ticks):
+            if tick % restart_every == 0:
+                game = zombie_game(size, zombies, tracking=False, seed=tick)
+            grid = game.get_grid()
+            game.step()
+            shot = next(iter(grid.find_entities(ZOMBIE)), None)
+            if shot is not None:
+                grid.remove_entity(shot)
+            if mode == "redraw":
+                view.redraw(grid)
+            else:
+                view.render(grid)
+            if tick == 0:
+                # The first draw is the same for both modes.
+                created = canvas.get_created()
+                calls = canvas.get_calls()
+        results.append((mode, (canvas.get_created() - created) / (ticks - 1),
+                        (canvas.get_calls() - calls) / (ticks - 1)))
+    return results
+
+
+def bench_plan_route(densities: List[float], size: int = 100,
+                     maps: int = 20) -> List[Tuple[float, float, float]]:
+    """
+    Time planning a route to the hospital on random maps, one fifth of whose
+    zombies are tracking zombies.
+
+    Returns (zombie density, median seconds, slowest seconds) tuples.
+
+    Parameters:
+        densities: The zombie densities to measure.
+        size: The map size.
+        maps: The number of maps to plan on for every density.
+    """
+    results = []
+    for density in densities:
+        times = []
+        for seed in range(maps):
+            grid = generate_grid(size, zombies=density * 0.8,
+                                 tracking_zombies=density * 0.2, garlic=0,
+                                 crossbows=0, seed=seed)
+            times.append(time_call(lambda: plan_route(grid)))
+        times.sort()
+        results.append((density, times[len(times) // 2], times[-1]))
+    return results
+
+
+def bench_batch_scaling(counts: List[int], games: int = 2000,
+                        map_file: str = "maps/basic2.txt",
+                        ) -> List[Tuple[int, float]]:
+    """
+    Time a batch of random games played over pools of worker processes.
+    With one process the games are played in this process, without a pool.
+
+    Returns (processes, games per second) tuples.
+
+    Parameters:
+        counts: The numbers of worker processes to measure.
+        games: The number of games in the batch.
+        map_file: The map to play.
+    """
+    results = []
+    for processes in counts:
+        start = time.perf_counter()
+        run_batch(make_jobs([map_file], range(games), ["random"]), processes)
+        results.append((processes, games / (time.perf_counter() - start)))
+    return results
+
+
+def write_map(filename: str, size: int, density: float,
+              seed: int = 0) -> None:
+    """
+    Write a random text map whose entities are two fifths zombies and one
+    fifth each tracking zombies, garlic and crossbows.
+
+    Parameters:
+        filename: Path of the map file to write.
+        size: The map size.
+        density: The fraction of the map occupied by entities.
+        seed: Seed for the entity placement.
+    """
+    generate_map(filename, size, zombies=density * 0.4,
+                 tracking_zombies=density * 0.2, garlic=density * 0.2,
+                 crossbows=density * 0.2, seed=seed)
+
+
+def stub_interface(interface_class: type, size: int):
+    """
+    Return a graphical interface of the given class, without a Tk window,
+    drawing on stub canvases.
+
+    Parameters:
+        interface_class: The graphical interface class.
+        size: The map size.
+    """
+    interface = interface_class.__new__(interface_class)
+    if interface_class is BasicGraphicalInterface:
+        interface._basic_map = StubBasicMap(size)
+    else:
+        interface._basic_map = StubImageMap(size)
+    interface._inventory_view = StubInventoryView(size)
+    return interface
+
+
+def bench_suite(sizes: List[int], densities: List[float], ticks: int = 10,
+                ) -> List[Dict[str, object]]:
+    """
+    Time the model and render hot paths for every map size and density.
+
+    Every result is a dictionary holding the name of the benchmark, the map
+    size, the entity density, the number of zombies and the best time, in
+    seconds, of one call.
+
+    Parameters:
+        sizes: The map sizes to measure.
+        densities: The fractions of the map occupied by entities.
+        ticks: The number of ticks to average drawing over.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for density in densities:
+                filename = os.path.join(directory, f"{size}-{density}.txt")
+                write_map(filename, size, density)
+
+                def record(name: str, seconds: float, zombies: int) -> None:
+                    results.append({"benchmark": name, "size": size,
+                                    "density": density, "zombies": zombies,
+                                    "seconds": seconds})
+
+                grid = AdvancedMapLoader().load(filename)
+                zombies = len(grid.find_entities(ZOMBIE))
+                tracking = len(grid.find_entities(TRACKING_ZOMBIE))
+                total = zombies + tracking
+                record("load_map", time_call(lambda: load_map(filename)),
+                       total)
+                record("MapLoader.load", time_call(
+                    lambda: AdvancedMapLoader().load(filename)), total)
+
+                # Every zombie of the map wanders, or every zombie tracks.
+                for name, zombie_class in (("Game.step wandering", Zombie),
+                                           ("Game.step tracking",
+                                            TrackingZombie)):
+                    stepped = with_zombies(grid, zombie_class)
+                    record(name, time_tick(
+                        lambda: AdvancedGame(stepped.clone(), seed=0)), total)
+
+                game = AdvancedGame(grid)
+                player = grid.find_player()
+                record("find_player", time_call(grid.find_player), total)
+                record("serialize", time_call(grid.serialize), total)
+                record("has_won", time_call(game.has_won), total)
+                offsets = [Position(*offset) for offset in OFFSETS]
+                record("first_in_direction", time_call(
+                    lambda: [first_in_direction(grid, player, offset)
+                             for offset in offsets]) / len(offsets), total)
+
+                for interface_class in (BasicGraphicalInterface,
+                                        ImageGraphicalInterface,
+                                        MastersGraphicalInterface):
+                    game = AdvancedGame(grid.clone(), seed=0)
+                    interface = stub_interface(interface_class, size)
+                    name = interface_class.__name__
+                    record(f"{name}.draw first",
+                           time_call(lambda: interface.draw(game), repeat=1),
+                           total)
+                    elapsed = 0.0
+                    for _ in range(ticks):
+                        game.step()
+                        elapsed += time_call(lambda: interface.draw(game),
+                                             repeat=1)
+                    record(f"{name}.draw tick", elapsed / ticks, total)
+
+    for items in (1, 10, 100):
+        results.append({"benchmark": "Inventory.step", "items": items,
+                        "seconds": time_inventory_step(items)})
+    return results
+
+
+def time_inventory_step(items: int, repeat: int = 100) -> float:
+    """
+    Return the mean time, in seconds, of stepping an inventory holding the
+    given number of items, half of them active.
+
+    Parameters:
+        items: The number of items in the inventory.
+        repeat: The number of inventories to step.
+    """
+    inventory = Inventory()
+    for index in range(items):
+        inventory.add_item(Garlic() if index % 2 else Crossbow())
+        if index % 2:
+            inventory.get_items()[-1].toggle_active()
+    inventories = [inventory.clone() for _ in range(repeat)]
+    start = time.perf_counter()
+    for inventory in inventories:
+        inventory.step()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_hud_calls(items: int = 5, ticks: int = 100,
+                    ) -> List[Tuple[str, float, float]]:
+    """
+    Count the canvas calls made per tick by the inventory view, redrawing
+    every row and updating only changed rows. The interfaces draw the
+    inventory on every tick but items only age when the player moves, so
+    the inventory changes every other tick.
+
+    Returns (mode, canvas calls per tick, canvas calls per unchanged tick)
+    tuples.
+
+    Parameters:
+        items: The number of items held, one of them active.
+        ticks: The number of ticks to draw.
+    """
+    results = []
+    for mode in ("redraw", "updated"):
+        view = StubInventoryView(10)
+        canvas = view.get_canvas()
+        inventory = Inventory()
+        for _ in range(items):
+            inventory.add_item(Crossbow())
+        inventory.get_items()[0].toggle_active()
+        unchanged = 0
+        for tick in range(ticks):
+            if tick % 2:
+                inventory.step()
+            calls = canvas.get_calls()
+            if mode == "redraw":
+                view.redraw(inventory)
+            else:
+                view.draw(inventory)
+            if tick % 2 == 0 and tick > 0:
+                unchanged += canvas.get_calls() - calls
+        results.append((mode, canvas.get_calls() / ticks,
+                        unchanged / (ticks // 2 - 1)))
+    return results
+
+
+def write_suite(filename: str, sizes: List[int],
+                densities: List[float]) -> None:
+    """
+    Run the benchmark suite and write its results as JSON.
+
+    Parameters:
+        filename: Path of the JSON file to write, '-' for standard output.
+        sizes: The map sizes to measure.
+        densities: The fractions of the map occupied by entities.
+    """
+    report = {"python": platform.python_version(),
+              "platform": platform.platform(),
+              "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+              "results": bench_suite(sizes, densities)}
+    if filename == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        with open(filename, "w") as json_file:
+            json.dump(report, json_file, indent=2)
+
+
+def main() -> None:
+    """Run the benchmarks and print a report, or write the suite as JSON."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the game model and views.")
+    parser.add_argument("--json", metavar="FILE",
+                        help="run the benchmark suite and write it to FILE"
+                             " as JSON, '-' for standard output")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SUITE_SIZES,
+                        help="the map sizes of the benchmark suite")
+    parser.add_argument("--densities", type=float, nargs="+",
+                        default=SUITE_DENSITIES,
+                        help="the entity densities of the benchmark suite")
+    arguments = parser.parse_args()
+    if arguments.json is not None:
+        write_suite(arguments.json, arguments.sizes, arguments.densities)
+        return
+
+    print("Tick cost with tracking zombies (10% density)")
+    print(f"{'zombies':>8} {'indexed ms':>11} {'scanning ms':>12}"
+          f" {'indexed us/zombie':>18}")
+    for count, indexed, scanning in bench_tracking_tick([100, 200, 400,
+                                                          800, 1600]):
+        print(f"{count:>8} {indexed * 1e3:>11.2f} {scanning * 1e3:>12.2f}"
+              f" {indexed / count * 1e6:>18.2f}")
+
+    print()
+    print("Tick cost of tracking zombie pursuit (10% density)")
+    print(f"{'zombies':>8} {'field ms':>9} {'sorting ms':>11}")
+    for count, field, sorting in bench_pursuit_tick([1000, 10000]):
+        print(f"{count:>8} {field * 1e3:>9.2f} {sorting * 1e3:>11.2f}")
+
+    print()
+    print("Map parse time (1% density)")
+    print(f"{'size':>8} {'load_map ms':>12} {'stream ms':>10}"
+          f" {'binary ms':>10}")
+    for size, text, stream, binary in bench_map_parse([500, 1000, 2000]):
+        print(f"{size:>8} {text * 1e3:>12.2f} {stream * 1e3:>10.2f}"
+              f" {binary * 1e3:>10.2f}")
+
+    print()
+    print("Time machine snapshot (10% density)")
+    print(f"{'zombies':>8} {'clone ms':>9} {'dict ms':>9}")
+    for count, cloned, round_trip in bench_snapshot([10, 100, 1000, 10000]):
+        print(f"{count:>8} {cloned * 1e3:>9.3f} {round_trip * 1e3:>9.3f}")
+
+    print()
+    print("Time machine bookkeeping per move (10% density)")
+    print(f"{'zombies':>8} {'history ms':>11} {'clone ms':>9}")
+    for count, recorded, cloned in bench_history([100, 1000, 10000]):
+        print(f"{count:>8} {recorded * 1e3:>11.3f} {cloned * 1e3:>9.3f}")
+    recorded, cloned = bench_history_memory()
+    print(f"Memory for 200 moves with 1000 tracking zombies:"
+          f" history {recorded / 1e6:.1f} MB, clones {cloned / 1e6:.1f} MB")
+
+    print()
+    print("Task 1 map canvas churn per tick (100x100, 1000 zombies)")
+    print(f"{'mode':>8} {'items created':>14} {'canvas calls':>13}")
+    for mode, created, calls in bench_render_items():
+        print(f"{mode:>8} {created:>14.1f} {calls:>13.1f}")
+
+    print()
+    print("Inventory canvas calls per tick (5 items, 1 active)")
+    print(f"{'mode':>8} {'all ticks':>10} {'unchanged':>10}")
+    for mode, calls, unchanged in bench_hud_calls():
+        print(f"{mode:>8} {calls:>10.1f} {unchanged:>10.1f}")
+
+    print()
+    print("Route planning on a 100x100 map")
+    print(f"{'zombies':>8} {'median ms':>10} {'slowest ms':>11}")
+    for density, median, slowest in bench_plan_route([0.0, 0.05, 0.1, 0.2]):
+        print(f"{density:>8.0%} {median * 1e3:>10.3f} {slowest * 1e3:>11.3f}")
+
+    print()
+    cpus = multiprocessing.cpu_count()
+    counts = sorted({1 << power for power in range(cpus.bit_length())} | {cpus})
+    print(f"Batch of random games on maps/basic2.txt ({cpus} CPUs)")
+    print(f"{'processes':>10} {'games/s':>8} {'speedup':>8}")
+    scaling = bench_batch_scaling(counts)
+    for processes, rate in scaling:
+        print(f"{processes:>10} {rate:>8.0f} {rate / scaling[0][1]:>8.2f}")
+
+    print()
+    uncached, cached = bench_restart()
+    print("New game on a 1000x1000 map (5% density)")
+    print(f"{'uncached ms':>12} {'cached ms':>10}")
+    print(f"{uncached * 1e3:>12.2f} {cached * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
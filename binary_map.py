@@ -0,0 +1,223 @@
+"""
+A compact binary format for game maps.
+
+A binary map file starts with a header holding the map size and the number
+of entities of each type, followed by a sparse entity table: the flat cell
+index (y * size + x) of every entity in row-major order, then the token of
+every entity in the same order. Empty cells take no space at all.
+
+Run with `python binary_map.py <text map> <binary map>` to convert a text
+map file into a binary map file.
+"""
+
+import argparse
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, Tuple
+
+MAGIC = b"EODM"
+VERSION = 1
+
+# Magic, version, map size and the number of distinct entity tokens.
+_HEADER = struct.Struct("<4sHIH")
+# An entity token and how many entities of that type are in the map.
+_COUNT = struct.Struct("<cI")
+
+
+def _index_array(data: bytes = b"") -> array:
+    """
+    Return an array of unsigned 32 bit cell indices read from little endian
+    bytes.
+
+    Parameters:
+        data: The little endian bytes of the indices.
+    """
+    indices = array("I")
+    if indices.itemsize != 4:
+        indices = array("L")
+    indices.frombytes(data)
+    if sys.byteorder != "little":
+        indices.byteswap()
+    return indices
+
+
+class BinaryMap:
+    """
+    The contents of a binary map file: the map size, the number of entities
+    of each type and the sparse entity table.
+    """
+
+    def __init__(self, size: int, counts: Dict[str, int], indices: array,
+                 tokens: bytes):
+        """
+        Parameters:
+            size: The size of the map.
+            counts: The number of entities of each type, by token.
+            indices: The flat cell index of every entity, in row-major order.
+            tokens: The token of every entity, in the same order.
+        """
+        self._size = size
+        self._counts = counts
+        self._indices = indices
+        self._tokens = tokens
+
+    def get_size(self) -> int:
+        """Return the size of the map."""
+        return self._size
+
+    def get_counts(self) -> Dict[str, int]:
+        """Return the number of entities of each type, by token."""
+        return dict(self._counts)
+
+    def entities(self) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield the (x, y, token) of every entity, in the same order as the
+        entities appear in the text map.
+        """
+        size = self._size
+        for index, code in zip(self._indices, self._tokens):
+            y, x = divmod(index, size)
+            yield x, y, chr(code)
+
+
+def is_binary_map(filename: str) -> bool:
+    """
+    Return true if the file at the given path is a binary map file.
+
+    Parameters:
+        filename: Path of the file to check.
+    """
+    with open(filename, "rb") as map_file:
+        return map_file.read(len(MAGIC)) == MAGIC
+
+
+def read_binary_map(filename: str) -> BinaryMap:
+    """
+    Read a binary map file.
+
+    Parameters:
+        filename: Path where the binary map file should be found.
+
+    Raises:
+        ValueError: If the file is not a binary map of a supported version.
+    """
+    with open(filename, "rb") as map_file:
+        return parse_binary_map(map_file.read(), filename)
+
+
+def parse_binary_map(contents: bytes, filename: str) -> BinaryMap:
+    """
+    Parse the contents of a binary map file, e.g. a file already opened to
+    check its header. The returned map does not refer to the contents.
+
+    Parameters:
+        contents: The bytes of the binary map file.
+        filename: Path of the binary map file, for error messages.
+
+    Raises:
+        ValueError: If the file is not a binary map of a supported version.
+    """
+    if len(contents) < _HEADER.size:
+        raise ValueError(f"{filename} is not a binary map file")
+    magic, version, size, kinds = _HEADER.unpack_from(contents)
+    if magic != MAGIC:
+        raise ValueError(f"{filename} is not a binary map file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary map version {version}")
+
+    counts = {}
+    offset = _HEADER.size
+    for _ in range(kinds):
+        token, count = _COUNT.unpack_from(contents, offset)
+        counts[token.decode("ascii")] = count
+        offset += _COUNT.size
+
+    total = sum(counts.values())
+    indices = _index_array(contents[offset:offset + 4 * total])
+    offset += 4 * total
+    tokens = bytes(contents[offset:offset + total])
+    if len(indices) != total or len(tokens) != total:
+        raise ValueError(f"{filename} is truncated")
+
+    return BinaryMap(size, counts, indices, tokens)
+
+
+def write_binary_map(filename: str, size: int,
+                     entities: Iterable[Tuple[int, int, str]]) -> None:
+    """
+    Write a binary map file.
+
+    Entities outside of the map bounds are left out, as they would not be
+    added to the map's grid.
+
+    Parameters:
+        filename: Path of the binary map file to write.
+        size: The size of the map.
+        entities: The (x, y, token) of every entity, in row-major order.
+
+    Raises:
+        ValueError: If the map is too large for 32 bit cell indices.
+
+    Examples:
+        >>> import os, tempfile
+        >>> with tempfile.TemporaryDirectory() as directory:
+        ...     filename = os.path.join(directory, "small.map")
+        ...     write_binary_map(filename, 3, [(1, 0, "P"), (3, 1, "Z"),
+        ...                                    (0, 2, "Z"), (2, 2, "H")])
+        ...     binary = read_binary_map(filename)
+        >>> binary.get_size(), binary.get_counts()
+        (3, {'P': 1, 'Z': 1, 'H': 1})
+        >>> list(binary.entities())
+        [(1, 0, 'P'), (0, 2, 'Z'), (2, 2, 'H')]
+    """
+    if size * size > 1 << 32:
+        raise ValueError(f"Map size {size} is too large for a binary map")
+
+    counts: Dict[str, int] = {}
+    indices = _index_array()
+    tokens = bytearray()
+    for x, y, token in entities:
+        if 0 <= x < size and 0 <= y < size:
+            counts[token] = counts.get(token, 0) + 1
+            indices.append(y * size + x)
+            tokens += token.encode("ascii")
+
+    if sys.byteorder != "little":
+        indices.byteswap()
+
+    with open(filename, "wb") as map_file:
+        map_file.write(_HEADER.pack(MAGIC, VERSION, size, len(counts)))
+        for token, count in counts.items():
+            map_file.write(_COUNT.pack(token.encode("ascii"), count))
+        map_file.write(indices.tobytes())
+        map_file.write(tokens)
+
+
+def convert_text_map(source: str, destination: str) -> None:
+    """
+    Convert a text map file into a binary map file.
+
+    Parameters:
+        source: Path of the text map file to read.
+        destination: Path of the binary map file to write.
+    """
+    from a2_solution import MapFile
+
+    with MapFile(source) as map_file:
+        write_binary_map(destination, map_file.get_size(),
+                         map_file.entities())
+
+
+def main() -> None:
+    """Convert the text map file given on the command line."""
+    parser = argparse.ArgumentParser(
+        description="Convert a text map file into a binary map file.")
+    parser.add_argument("source", help="the text map file to read")
+    parser.add_argument("destination", help="the binary map file to write")
+    arguments = parser.parse_args()
+    convert_text_map(arguments.source, arguments.destination)
+
+
+if __name__ == "__main__":
+    main()
@@ -88,3 +88,21 @@ MAX_ALLOWED_HIGH_SCORES = 3
 
 # CSSE7030 Task Constants
 TIME_MACHINE = 'M'
+# Moves undone by the time machine, and moves kept in the game history.
+TIME_MACHINE_MOVES = 5
+HISTORY_DEPTH = 200
+# Ticks a headless game may run for before it is given up as unfinished.
+HEADLESS_MAX_TICKS = 1000
+# Milliseconds between the moves of the autopilot in the graphical interface.
+AUTOPILOT_DELAY = 250
+# Events of a replay log, see replay.py, and the log written by the game.
+RECORD_START = "start"
+RECORD_ACTION = "action"
+RECORD_MOVE = "move"
+RECORD_SHOT = "shot"
+RECORD_SELECT = "select"
+RECORD_TOGGLE = "toggle"
+RECORD_STEP = "step"
+RECORD_END = "end"
+# The default action log file of a session, formatted with time.strftime.
+REPLAY_FILE = 'replay-%Y%m%d-%H%M%S.log'
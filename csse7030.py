@@ -2,6 +2,9 @@
 
 from model_class import ImageMap, InventoryView, StatusBar
 from a2_solution import *
+from history import History
+from planner import Autopilot
+from replay import Recorder
 import tkinter as tk
 from tkinter import messagebox
 from constants import *
@@ -32,7 +35,7 @@ class MastersGraphicalInterface:
                                     *                  _status_bar_frame                 *
                                     *******************************************************
     """
-    def __init__(self, root, size: int) -> None:
+    def __init__(self, root, size: int, recorder: Optional[Recorder] = None) -> None:
         """
         The parameter root represents the root window and size represents the number of rows (= number of columns)
         in the game map. This method draw the title label, and instantiate and pack the BasicMap, InventoryView,
@@ -41,6 +44,7 @@ class MastersGraphicalInterface:
         Parameters:
             root: The root of the window.
             size: The size of the basic map.
+            recorder: The recorder to record the play session with, if any. It is closed with the window.
         """
         self._root = root
         self._size = size
@@ -100,6 +104,9 @@ class MastersGraphicalInterface:
         self._filemenu.add_command(label="Save game", command=self.save)
         self._filemenu.add_command(label="Load game", command=self.load)
         self._filemenu.add_command(label="High scores", command=self.display_high_scores)
+        self._autopilot_on = tk.BooleanVar(self._root, value=False)
+        self._filemenu.add_checkbutton(label="Autopilot", variable=self._autopilot_on,
+                                       command=self._toggle_autopilot)
         self._filemenu.add_separator()
         self._filemenu.add_command(label="Quit", command=self.quit)
         self._menubar.add_cascade(label="File", menu=self._filemenu)
@@ -115,7 +122,33 @@ class MastersGraphicalInterface:
             Position(0, 1): ImageTk.PhotoImage(Image.open(IMAGES[ARROW]).convert('RGBA').rotate(270))
         }
         self._background_images = ImageTk.PhotoImage(Image.open(IMAGES[BACK_GROUND]))
-        self._back5games = [None, None, None, None, None, None]
+        self._history = None
+        self._autopilot = Autopilot()
+        self._pilot = None
+        self._recorder = recorder
+        if recorder is not None:
+            self._root.bind("<Destroy>", self._root_destroyed, add="+")
+
+    def _root_destroyed(self, event) -> None:
+        """
+        Close the recorder when the root window is destroyed, however the window is closed.
+
+        Parameters:
+            event: <Destroy> event, reported for the root window and each of its children.
+        """
+        if event.widget is self._root:
+            self._recorder.close()
+
+    def _record(self, kind: str, *arguments) -> None:
+        """
+        Record an event of the play session, if it is being recorded.
+
+        Parameters:
+            kind: The kind of event, one of the RECORD_ constants.
+            arguments: The arguments of the event.
+        """
+        if self._recorder is not None:
+            self._recorder.record(kind, *arguments)
 
     def handler_adaptor(self, fun, **kwargs) -> None:
         """
@@ -142,24 +175,21 @@ class MastersGraphicalInterface:
         position = self._inventory_view.pixel_to_position(Position(pixel_x, pixel_y))
         row_index = position.get_y()
         if 0 < row_index <= len(inventory.get_items()):
-            item = inventory.get_items()[row_index - 1]
-            if not item.is_active():
-                for active_item in inventory.get_items():
-                    if active_item.is_active():
-                        active_item.toggle_active()
-                        break
-            item.toggle_active()
+            self._record(RECORD_SELECT, row_index - 1)
+            item = inventory.select(row_index - 1)
             if item.display() == TIME_MACHINE:
                 self._basic_map._basic_map_canvas.after_cancel(self._solve)
-                if self._game.get_moves() <= 5:
+                if self._game.get_moves() <= TIME_MACHINE_MOVES:
                     self._status_bar.change_move(0)
                     self._status_bar.change_timer(0)
                     self.play(advanced_game(MAP_FILE))
                     return
                 else:
-                    self._status_bar.change_move(self._back5games[0].get_moves())
-                    self._status_bar.change_timer(self._back5games[0].get_steps())
-                    self.play(self._back5games[0])
+                    self._history.rewind(TIME_MACHINE_MOVES)
+                    remove_time_machines(self._game)
+                    self._status_bar.change_move(self._game.get_moves())
+                    self._status_bar.change_timer(self._game.get_steps())
+                    self.play(self._game)
                     return
         self._inventory_view.draw(inventory)
 
@@ -180,6 +210,9 @@ class MastersGraphicalInterface:
             self._move(game, DOWN)
         elif event.char == 'd':
             self._move(game, RIGHT)
+        elif event.char == 'p':
+            self._autopilot_on.set(not self._autopilot_on.get())
+            self._toggle_autopilot()
         elif event.keysym == 'Up':
             self._fire(game, UP)
         elif event.keysym == 'Down':
@@ -191,6 +224,34 @@ class MastersGraphicalInterface:
         else:
             return
 
+    def _toggle_autopilot(self) -> None:
+        """
+        Start or stop the autopilot walking the player to the hospital, after the Autopilot menu item or the 'p'
+        key is toggled. The player can still move and fire while the autopilot is on.
+        """
+        if self._pilot is not None:
+            self._basic_map._basic_map_canvas.after_cancel(self._pilot)
+            self._pilot = None
+        if self._autopilot_on.get():
+            self._pilot = self._basic_map._basic_map_canvas.after(AUTOPILOT_DELAY, self._autopilot_move, self._game)
+
+    def _autopilot_move(self, game: Game) -> None:
+        """
+        Move the player one cell along the autopilot's route, waiting in place while every route is blocked,
+        until the game is over.
+
+        Parameters:
+            game: The game that the player is playing.
+        """
+        self._pilot = None
+        if game.has_won() or game.has_lost():
+            return
+        direction = self._autopilot(game)
+        if direction:
+            self._move(game, direction)
+        if not game.has_won() and not game.has_lost():
+            self._pilot = self._basic_map._basic_map_canvas.after(AUTOPILOT_DELAY, self._autopilot_move, game)
+
     def draw(self, game: Game) -> None:
         """
         This method can draw the basic map entities and inventory items.
@@ -202,20 +263,11 @@ class MastersGraphicalInterface:
         """
         draw entity
         """
-        self._basic_map._basic_map_canvas.delete("entity")
-        mapping = game.get_grid().serialize()
-        size = self._size
-
-        for y in range(size):
-            for x in range(size):
-                tile = mapping.get((x, y), " ") or " "
-                if tile is not " ":
-                    self._basic_map.draw_entity(Position(x, y), tile)
+        self._basic_map.render(game.get_grid())
 
         """
         draw inventory
         """
-        self._inventory_view._inventory_view_canvas.delete("pickup")
         self._inventory_view.draw(game.get_player().get_inventory())
 
     def _move(self, game: Game, direction: str) -> None:
@@ -227,11 +279,15 @@ class MastersGraphicalInterface:
             direction: The direction which the player will move to.
         """
         new_position = game.direction_to_offset(direction)
+        self._record(RECORD_MOVE, direction)
+        self._history.checkpoint()
         game.move_player(new_position)
         self._status_bar.change_move(game.get_moves())
         self.draw(game)
         self._basic_map._basic_map_canvas.update()
         if not game.has_lost() and game.has_won():
+            if self._recorder is not None:
+                self._recorder.finish(game)
             self._basic_map._basic_map_canvas.after_cancel(self._solve)
             score = game.get_steps()
             score_minute = int(score // 60)
@@ -265,15 +321,6 @@ class MastersGraphicalInterface:
                                           command=lambda: self.play_again_button_clicked(score))
             play_again_button.pack(side=tk.LEFT)
 
-        """
-        Save the back 5 steps game.
-        """
-        if game.get_moves() <= 6:
-            self._back5games[game.get_moves()-1] = self.get_no_time_machine_game_from_dict(self.get_duplication_dict(game.__dict__))
-        else:
-            self._back5games.pop(0)
-            self._back5games.append(self.get_no_time_machine_game_from_dict(self.get_duplication_dict(game.__dict__)))
-
     def _fire(self, game: Game, direction: str) -> None:
         """
         Fire takes the following actions:
@@ -351,10 +398,9 @@ class MastersGraphicalInterface:
                 self._basic_map._basic_map_canvas.after(100, self.crossbow_animations, game, now_position, next_position, offset)
 
             elif entity.display() in ZOMBIES:
+                self._record(RECORD_SHOT, now_position.get_x(), now_position.get_y())
                 game.get_grid().remove_entity(now_position)
-                self._basic_map._basic_map_canvas.create_image(bbox[0], bbox[1], image=self._background_images,
-                                                               anchor='nw',
-                                                               tags='entity')
+                self._basic_map.render(game.get_grid())
                 if game.get_grid().in_bounds(last_position):
                     self._basic_map._basic_map_canvas.delete(last_position.__repr__().replace(' ', ''))
             else:
@@ -373,10 +419,13 @@ class MastersGraphicalInterface:
             game: The game that the player is playing.
         """
         game.step()
+        self._record(RECORD_STEP)
         self._status_bar.change_timer(game.get_steps())
         self.draw(game)
         self._solve = self._basic_map._basic_map_canvas.after(1000, self._step, game)
         if not game.has_won() and game.has_lost():
+            if self._recorder is not None:
+                self._recorder.finish(game)
             self._basic_map._basic_map_canvas.after_cancel(self._solve)
             score = game.get_steps()
             score_minute = int(score // 60)
@@ -401,6 +450,12 @@ class MastersGraphicalInterface:
             game: The game that the player is playing.
         """
         self._game = game
+        if self._history is None or self._history.get_game() is not game:
+            if self._history is not None:
+                self._history.close()
+            self._history = History(game, HISTORY_DEPTH)
+            if self._recorder is not None:
+                self._recorder.start(game)
         self._inventory_view._inventory_view_canvas.bind("<Button-1>",
                                                          self.handler_adaptor(self._inventory_click,
                                                                               inventory=game.get_player().get_inventory()))
@@ -409,12 +464,18 @@ class MastersGraphicalInterface:
         self.draw(game)
         self._basic_map._basic_map_canvas.update()
         self._solve = self._basic_map._basic_map_canvas.after(1000, self._step, game)
+        self._toggle_autopilot()
 
     def quit(self) -> None:
         """
         This method can quit the game.
         """
         self._basic_map._basic_map_canvas.after_cancel(self._solve)
+        if self._pilot is not None:
+            self._basic_map._basic_map_canvas.after_cancel(self._pilot)
+            self._pilot = None
+        if self._recorder is not None:
+            self._recorder.close()
         self._root.quit()
 
     def restart(self) -> None:
@@ -574,134 +635,3 @@ class MastersGraphicalInterface:
             with open(HIGH_SCORES_FILE, mode='w+') as high_score_file:
                 for item in name_scores:
                     high_score_file.writelines(item[0] + ':' + str(item[1]) + '\n')
-
-    def get_duplication_dict(self, game_dict: Dict) -> Dict:
-        """
-        This method can get a duplication dict from the game which the player is playing.
-
-        Parameters:
-            game_dict: The game.__dict__ which the player is playing.
-        """
-        duplication_dict = {}
-        for key, item in game_dict.items():
-            if isinstance(item, int) or isinstance(item, str) or isinstance(item, bool):
-                duplication_dict[key] = item
-            elif isinstance(item, dict):
-                duplication_dict[key] = self.get_duplication_dict(item)
-            elif isinstance(item, list):
-                temp = []
-                for list_item in item:
-                    tmp = list_item.__dict__
-                    tmp['class_name'] = list_item.__class__.__name__
-                    temp.append(tmp)
-                duplication_dict[key] = temp
-            else:
-                duplication_dict[key] = self.get_duplication_dict(game_dict[key].__dict__)
-                duplication_dict[key]['class_name'] = game_dict[key].__class__.__name__
-        return duplication_dict
-
-    def get_complete_game_from_dict(self, game_dict: Dict) -> Game:
-        """
-        This method can get a complete copy of game from the game dict which the player saved.
-
-        Parameters:
-            game_dict: The game.__dict__ which the player saved.
-        """
-        grid = Grid(game_dict['_grid']['_size'])
-        for key, item in game_dict['_grid']['_tiles'].items():
-            if item['class_name'] == 'TimeMachine':
-                time_machine = TimeMachine()
-                time_machine._lifetime = item['_lifetime']
-                time_machine._using = item['_using']
-                grid._tiles[key] = time_machine
-            elif item['class_name'] == 'Crossbow':
-                crossbow = Crossbow()
-                crossbow._lifetime = item['_lifetime']
-                crossbow._using = item['_using']
-                grid._tiles[key] = crossbow
-            elif item['class_name'] == 'Garlic':
-                garlic = Garlic()
-                garlic._lifetime = item['_lifetime']
-                garlic._using = item['_using']
-                grid._tiles[key] = garlic
-            elif item['class_name'] == 'Zombie':
-                grid._tiles[key] = Zombie()
-            elif item['class_name'] == 'TrackingZombie':
-                grid._tiles[key] = TrackingZombie()
-            elif item['class_name'] == 'Hospital':
-                grid._tiles[key] = Hospital()
-            elif item['class_name'] == 'HoldingPlayer':
-                player = HoldingPlayer()
-                player._infected = item['_infected']
-                pickup_item_list = []
-                for pick in item['_inventory']['_items']:
-                    if pick['class_name'] == 'Crossbow':
-                        crossbow = Crossbow()
-                        crossbow._lifetime = pick['_lifetime']
-                        crossbow._using = pick['_using']
-                        pickup_item_list.append(crossbow)
-                    elif pick['class_name'] == 'Garlic':
-                        garlic = Garlic()
-                        garlic._lifetime = pick['_lifetime']
-                        garlic._using = pick['_using']
-                        pickup_item_list.append(garlic)
-                    elif pick['class_name'] == 'TimeMachine':
-                        time_machine = TimeMachine()
-                        time_machine._lifetime = pick['_lifetime']
-                        time_machine._using = pick['_using']
-                        pickup_item_list.append(time_machine)
-                player.get_inventory()._items = pickup_item_list
-                grid._tiles[key] = player
-        game = AdvancedGame(grid)
-        game._steps = game_dict['_steps']
-        game._moves = game_dict['_moves']
-        return game
-
-
-    def get_no_time_machine_game_from_dict(self, game_dict: Dict) -> Game:
-        """
-        This method can get a copy of game from the game dict which the player saved except time machine,
-        because time machine can only be applied to the player once
-
-        Parameters:
-            game_dict: The game.__dict__ which the player saved.
-        """
-        grid = Grid(game_dict['_grid']['_size'])
-        for key, item in game_dict['_grid']['_tiles'].items():
-            if item['class_name'] == 'Crossbow':
-                crossbow = Crossbow()
-                crossbow._lifetime = item['_lifetime']
-                crossbow._using = item['_using']
-                grid._tiles[key] = crossbow
-            elif item['class_name'] == 'Garlic':
-                garlic = Garlic()
-                garlic._lifetime = item['_lifetime']
-                garlic._using = item['_using']
-                grid._tiles[key] = garlic
-            elif item['class_name'] == 'Zombie':
-                grid._tiles[key] = Zombie()
-            elif item['class_name'] == 'TrackingZombie':
-                grid._tiles[key] = TrackingZombie()
-            elif item['class_name'] == 'Hospital':
-                grid._tiles[key] = Hospital()
-            elif item['class_name'] == 'HoldingPlayer':
-                player = HoldingPlayer()
-                player._infected = item['_infected']
-                pickup_item_list = []
-                for pick in item['_inventory']['_items']:
-                    if pick['class_name'] == 'Crossbow':
-                        crossbow = Crossbow()
-                        crossbow._lifetime = pick['_lifetime']
-                        crossbow._using = pick['_using']
-                        pickup_item_list.append(crossbow)
-                    elif pick['class_name'] == 'Garlic':
-                        garlic = Garlic()
-                        garlic._lifetime = pick['_lifetime']
-                        garlic._using = pick['_using']
-                        pickup_item_list.append(garlic)
-                player.get_inventory()._items = pickup_item_list
-                grid._tiles[key] = player
-        game = AdvancedGame(grid)
-        game._steps = game_dict['_steps']
-        game._moves = game_dict['_moves']
-        return game
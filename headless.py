@@ -0,0 +1,289 @@
+"""
+Headless simulation of advanced games, without Tk and without any I/O.
+
+A headless game is driven by an action source: a function given the game
+before every tick which returns the action to take, using the same actions
+as the text interface. A fire action is FIRE followed by the direction to
+fire in, e.g. 'FW'. Every tick performs the action and triggers the _step_
+event, just like one round of `TextInterface.play`, and the game runs as
+fast as it can until it is won, lost or runs out of ticks.
+
+Run with `python headless.py <map> [games]` to play random games on a map
+and print how many games are played per second, or add `--policy autopilot`
+to have the player walk to a hospital, see `planner`.
+
+One process plays roughly 450 to 750 random games of the bundled maps a
+second, at about 45 microseconds a tick. Almost all of a tick is the game's
+own _step_ event: stepping the zombies, drawing their random directions and
+updating the grid's indexes, which headless play shares with the
+interfaces. The loop here adds less than a tenth to that, so playing
+thousands of games a second takes several processes, see `batch_runner`.
+"""
+
+import argparse
+import random
+import time
+from typing import (Callable, Dict, Iterable, Iterator, NamedTuple, Optional,
+                    Type)
+
+from a2_solution import *
+from constants import *
+from planner import Autopilot
+
+WON = "won"
+LOST = "lost"
+UNFINISHED = "unfinished"
+
+# A function given the game before every tick, returning the action to take.
+ActionSource = Callable[[Game], str]
+
+
+class HeadlessResult(NamedTuple):
+    """The outcome of a headless game and how long it took to play."""
+    outcome: str
+    steps: int
+    moves: int
+    uses: int
+    ticks: int
+    elapsed: float
+    max_tick: float
+
+    def get_tick_time(self) -> float:
+        """Return the mean time taken by a tick, in seconds."""
+        return self.elapsed / self.ticks if self.ticks else 0.0
+
+
+def apply_action(game: Game, action: str) -> None:
+    """
+    Perform an action and trigger the _step_ event, like the text interface
+    does, but without any input or output.
+
+    A direction moves the player, and FIRE followed by a direction fires the
+    player's crossbow in that direction. Any other action only steps.
+
+    Parameters:
+        game: The game being played.
+        action: The action to take.
+    """
+    if action in DIRECTIONS:
+        offset = game.direction_to_offset(action)
+        if offset is not None:
+            game.move_player(offset)
+    elif action[:1] == FIRE:
+        fire_crossbow(game, action[1:])
+    game.step()
+
+
+def uses_pickup(game: Game, action: str) -> bool:
+    """
+    Return whether taking an action uses a pickup the player holds.
+
+    The actions of the text interface cannot select items, so the only pickup
+    an action can use is a crossbow, by firing it in a direction. Garlic and
+    time machines are picked up but never used.
+
+    Parameters:
+        game: The game being played, before the action is taken.
+        action: The action to take.
+
+    Examples:
+        >>> grid = Grid(3)
+        >>> player = HoldingPlayer()
+        >>> grid.add_entity(Position(0, 0), player)
+        >>> game = AdvancedGame(grid)
+        >>> uses_pickup(game, FIRE + RIGHT)
+        False
+        >>> player.get_inventory().add_item(Crossbow())
+        >>> uses_pickup(game, FIRE + RIGHT), uses_pickup(game, FIRE + "X")
+        (True, False)
+        >>> uses_pickup(game, RIGHT)
+        False
+    """
+    if action[:1] != FIRE or action[1:] not in DIRECTIONS:
+        return False
+    player = game.get_player()
+    return isinstance(player, HoldingPlayer) \
+        and player.get_inventory().contains(CROSSBOW)
+
+
+def get_outcome(game: Game) -> Optional[str]:
+    """
+    Return WON or LOST if the game is over, otherwise None. Winning is
+    checked first, as in `TextInterface.play`.
+
+    Parameters:
+        game: The game being played.
+    """
+    if game.has_won():
+        return WON
+    if game.has_lost():
+        return LOST
+    return None
+
+
+def scripted_actions(actions: Iterable[str]) -> ActionSource:
+    """
+    Return an action source taking the given actions in order, then only
+    stepping once they run out.
+
+    Parameters:
+        actions: The actions to take.
+    """
+    remaining: Iterator[str] = iter(actions)
+    return lambda game: next(remaining, "")
+
+
+def random_actions(rng: random.Random) -> ActionSource:
+    """
+    Return an action source choosing a random direction to move in, or to
+    fire in when the player holds a crossbow.
+
+    Parameters:
+        rng: The random number generator to choose actions with.
+    """
+    def choose(game: Game) -> str:
+        direction = rng.choice(DIRECTIONS)
+        player = game.get_player()
+        if isinstance(player, HoldingPlayer) and rng.random() < 0.25 \
+                and player.get_inventory().contains(CROSSBOW):
+            return FIRE + direction
+        return direction
+    return choose
+
+
+def random_policy(seed: int) -> ActionSource:
+    """
+    Return an action source of random actions, see `random_actions`.
+
+    Parameters:
+        seed: Seed for the actions chosen.
+    """
+    return random_actions(random.Random(seed))
+
+
+def idle_policy(seed: int) -> ActionSource:
+    """
+    Return an action source which never moves the player, as a baseline.
+
+    Parameters:
+        seed: Unused, every policy takes a seed.
+    """
+    return scripted_actions(())
+
+
+def autopilot_policy(seed: int) -> ActionSource:
+    """
+    Return an action source walking the player to a hospital, see
+    `planner.Autopilot`.
+
+    Parameters:
+        seed: Unused, every policy takes a seed.
+    """
+    return Autopilot()
+
+
+# Action sources by name, made from a seed, for running games by policy name,
+# e.g. in other processes.
+POLICIES: Dict[str, Callable[[int], ActionSource]] = {
+    "random": random_policy,
+    "idle": idle_policy,
+    "autopilot": autopilot_policy,
+}
+
+
+def run_game(game: Game, actions: ActionSource,
+             max_ticks: int = HEADLESS_MAX_TICKS) -> HeadlessResult:
+    """
+    Play a game headless until it is won, lost or has run for max_ticks,
+    counting the pickups used on the way, see `uses_pickup`.
+
+    Parameters:
+        game: The game to play.
+        actions: The source of the action to take on every tick.
+        max_ticks: The number of ticks after which the game is unfinished.
+
+    Examples:
+        >>> grid = Grid(3)
+        >>> grid.add_entity(Position(0, 0), HoldingPlayer())
+        >>> grid.add_entity(Position(2, 0), Hospital())
+        >>> result = run_game(AdvancedGame(grid),
+        ...                   scripted_actions([RIGHT, FIRE + LEFT, RIGHT]))
+        >>> result.outcome, result.steps, result.moves, result.uses
+        ('won', 3, 2, 0)
+    """
+    clock = time.perf_counter
+    outcome = get_outcome(game)
+    ticks = 0
+    uses = 0
+    max_tick = 0.0
+    started = clock()
+    while outcome is None and ticks < max_ticks:
+        tick_started = clock()
+        action = actions(game)
+        if uses_pickup(game, action):
+            uses += 1
+        apply_action(game, action)
+        outcome = get_outcome(game)
+        tick_time = clock() - tick_started
+        if tick_time > max_tick:
+            max_tick = tick_time
+        ticks += 1
+    elapsed = clock() - started
+    return HeadlessResult(outcome or UNFINISHED, game.get_steps(),
+                          game.get_moves(), uses, ticks, elapsed, max_tick)
+
+
+def run_headless(filename: str, actions: ActionSource,
+                 seed: Optional[int] = None,
+                 max_ticks: int = HEADLESS_MAX_TICKS,
+                 grid_class: Type[Grid] = Grid) -> HeadlessResult:
+    """
+    Play a game of the given map headless.
+
+    The map is cloned from the shared map cache, so playing the same map
+    many times only reads the map file once.
+
+    Parameters:
+        filename: Path where the map file should be found.
+        actions: The source of the action to take on every tick.
+        seed: The seed of the game's random number generator, see `Game`.
+        max_ticks: The number of ticks after which the game is unfinished.
+        grid_class: The Grid implementation to load the map into.
+    """
+    game = advanced_game(filename, grid_class, seed=seed)
+    return run_game(game, actions, max_ticks)
+
+
+def main() -> None:
+    """Play the games given on the command line."""
+    parser = argparse.ArgumentParser(
+        description="Play headless games on a map.")
+    parser.add_argument("map", help="the map file to play")
+    parser.add_argument("games", type=int, nargs="?", default=1000,
+                        help="the number of games to play")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="the seed of the first game")
+    parser.add_argument("--max-ticks", type=int, default=HEADLESS_MAX_TICKS,
+                        help="the ticks after which a game is unfinished")
+    parser.add_argument("--policy", default="random", choices=sorted(POLICIES),
+                        help="the policy to play with")
+    arguments = parser.parse_args()
+
+    outcomes = {WON: 0, LOST: 0, UNFINISHED: 0}
+    started = time.perf_counter()
+    for game in range(arguments.games):
+        seed = arguments.seed + game
+        result = run_headless(arguments.map,
+                              POLICIES[arguments.policy](seed), seed,
+                              arguments.max_ticks)
+        outcomes[result.outcome] += 1
+    elapsed = time.perf_counter() - started
+
+    print(f"{arguments.games} games in {elapsed:.2f}s"
+          f" ({arguments.games / elapsed:.0f} games/s)")
+    for outcome, count in outcomes.items():
+        print(f"{outcome:>10}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Move history for rewinding a game, used by the time machine.
+
+History records the changes made to a game as reversible deltas instead of
+copying the whole game after every move, so its cost depends on how much
+changes per move rather than on the size of the map.
+"""
+
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from a2_solution import *
+from constants import *
+
+
+# A change to a grid: the position an entity left (None if it was added),
+# the position it arrived at (None if it was removed), and the entity no
+# longer in the grid because of the change, if any, with a copy of its state.
+Change = Tuple[Optional[Position], Optional[Position],
+               Optional[Entity], Optional[Entity]]
+
+
+class Frame:
+    """
+    A Frame holds the changes made to a game from one checkpoint to the
+    next, together with the small amount of state needed to rewind it: the
+    game's counters, the state of its random number generator and a copy of
+    the player.
+    """
+
+    def __init__(self, steps: int, moves: int, random_state: tuple,
+                 player: Optional[Player]):
+        """
+        Parameters:
+            steps: The game's step counter at the checkpoint.
+            moves: The game's move counter at the checkpoint.
+            random_state: The state of the game's random number generator at
+                          the checkpoint.
+            player: The player at the checkpoint, if any.
+        """
+        self._steps = steps
+        self._moves = moves
+        self._random_state = random_state
+        self._player = player
+        self._player_state = None if player is None else player.clone()
+        self._changes: List[Change] = []
+
+    def record(self, start: Optional[Position], end: Optional[Position],
+               lost: Optional[Entity] = None) -> None:
+        """
+        Record a change made to the game's grid.
+
+        Parameters:
+            start: The position an entity left, None if it was added.
+            end: The position an entity arrived at, None if it was removed.
+            lost: The entity which is no longer in the grid after the
+                  change, i.e. the removed or replaced entity, if any.
+        """
+        state = None if lost is None else lost.clone()
+        self._changes.append((start, end, lost, state))
+
+    def get_change_count(self) -> int:
+        """Return the number of changes recorded in this frame."""
+        return len(self._changes)
+
+    def revert(self, game: Game) -> None:
+        """
+        Revert the changes recorded in this frame, latest first, and restore
+        the game's counters and player to their state at the checkpoint.
+
+        Parameters:
+            game: The game to rewind.
+        """
+        grid = game.get_grid()
+        for start, end, lost, state in reversed(self._changes):
+            if start is None:
+                grid.remove_entity(end)
+            elif end is not None:
+                grid.move_entity(end, start)
+            if lost is not None:
+                lost.restore(state)
+                grid.add_entity(start if end is None else end, lost)
+        if self._player is not None:
+            self._player.restore(self._player_state)
+        game.restore_counters(self._steps, self._moves)
+        game.get_random().setstate(self._random_state)
+
+
+class History(GridObserver):
+    """
+    History keeps the changes made to a game's grid, grouped into frames by
+    `checkpoint`, in a ring buffer of a fixed depth. Once the buffer is full
+    the oldest frame is dropped.
+
+    Entities and inventories changed outside of the grid are restored from
+    the player's state at each checkpoint. Rewinding puts entities back on
+    the positions they had, though the order in which the grid steps them
+    may differ from the order it had before.
+
+    Examples:
+        >>> grid = Grid(3)
+        >>> grid.add_entity(Position(0, 0), HoldingPlayer())
+        >>> grid.add_entity(Position(1, 0), Garlic())
+        >>> game = AdvancedGame(grid)
+        >>> history = History(game)
+        >>> history.checkpoint()
+        >>> game.move_player(Position(1, 0))
+        >>> game.step()
+        >>> grid.serialize(), game.get_player().get_inventory().get_items()
+        ({(1, 0): 'P'}, [Garlic(10)])
+        >>> history.rewind(1)
+        1
+        >>> grid.serialize(), game.get_player().get_inventory().get_items()
+        ({(0, 0): 'P', (1, 0): 'G'}, [])
+        >>> game.get_moves(), game.get_steps()
+        (0, 0)
+    """
+
+    def __init__(self, game: Game, depth: int = HISTORY_DEPTH):
+        """
+        A history starts recording the game's grid straight away. Changes
+        are only kept once the first checkpoint is made.
+
+        Parameters:
+            game: The game to record.
+            depth: The maximum number of frames to keep.
+        """
+        self._game = game
+        self._frames: Deque[Frame] = deque(maxlen=depth)
+        self._rewinding = False
+        game.get_grid().add_observer(self)
+
+    def get_game(self) -> Game:
+        """Return the game this history records."""
+        return self._game
+
+    def get_depth(self) -> int:
+        """Return the maximum number of frames kept."""
+        return self._frames.maxlen
+
+    def get_frame_count(self) -> int:
+        """Return the number of frames that can currently be rewound."""
+        return len(self._frames)
+
+    def checkpoint(self) -> None:
+        """
+        Start a new frame, e.g. just before the player moves. Rewinding the
+        frame returns the game to its state at this point.
+        """
+        game = self._game
+        self._frames.append(Frame(game.get_steps(), game.get_moves(),
+                                  game.get_random().getstate(),
+                                  game.get_player()))
+
+    def rewind(self, frames: int = 1) -> int:
+        """
+        Rewind the game by a number of frames, or by as many as are kept.
+
+        Parameters:
+            frames: The number of frames to rewind.
+
+        Returns:
+            The number of frames rewound.
+        """
+        rewound = 0
+        self._rewinding = True
+        try:
+            while rewound < frames and self._frames:
+                self._frames.pop().revert(self._game)
+                rewound += 1
+        finally:
+            self._rewinding = False
+        return rewound
+
+    def clear(self) -> None:
+        """Drop every recorded frame."""
+        self._frames.clear()
+
+    def close(self) -> None:
+        """Stop recording the game's grid."""
+        self._game.get_grid().remove_observer(self)
+
+    def _is_recording(self) -> bool:
+        """Return true if changes are currently kept in a frame."""
+        return bool(self._frames) and not self._rewinding
+
+    def entity_added(self, position: Position, entity: Entity,
+                     replaced: Optional[Entity]) -> None:
+        if self._is_recording():
+            self._frames[-1].record(None, position, replaced)
+
+    def entity_removed(self, position: Position, entity: Entity) -> None:
+        if self._is_recording():
+            self._frames[-1].record(position, None, entity)
+
+    def entity_moved(self, start: Position, end: Position, entity: Entity,
+                     replaced: Optional[Entity]) -> None:
+        if self._is_recording():
+            self._frames[-1].record(start, end, replaced)
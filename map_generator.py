@@ -0,0 +1,147 @@
+"""
+Seeded generation of large random maps, for measuring how the game scales.
+
+A generated map has one player, one hospital, and zombies, tracking
+zombies and pickups placed at random with the given densities. The same
+seed always generates the same map. Maps can be written in the text format
+read by `AdvancedMapLoader`, written as binary maps, or built straight into
+a Grid without a file.
+
+Run with `python map_generator.py <map> <size>` to write a map file.
+"""
+
+import argparse
+import random
+from typing import List, Optional, Tuple, Type
+
+from a2_solution import AdvancedMapLoader, Grid
+from binary_map import write_binary_map
+from constants import *
+
+
+def generate_entities(size: int, zombies: float = 0.05,
+                      tracking_zombies: float = 0.01, garlic: float = 0.002,
+                      crossbows: float = 0.002, time_machines: float = 0.0,
+                      seed: Optional[int] = None,
+                      ) -> List[Tuple[int, int, str]]:
+    """
+    Return the (x, y, token) of every entity of a random map, in row-major
+    order.
+
+    Each density is the fraction of the map's cells holding that type of
+    entity, rounded to a whole number of entities.
+
+    Parameters:
+        size: The size of the map.
+        zombies: The density of zombies.
+        tracking_zombies: The density of tracking zombies.
+        garlic: The density of garlic.
+        crossbows: The density of crossbows.
+        time_machines: The density of time machines.
+        seed: Seed for the placement of the entities.
+
+    Raises:
+        ValueError: If the entities do not fit on the map.
+
+    Examples:
+        >>> generate_entities(3, zombies=0.25, tracking_zombies=0, garlic=0,
+        ...                   crossbows=0, seed=1)
+        [(0, 0, 'Z'), (1, 0, 'H'), (2, 0, 'P'), (2, 2, 'Z')]
+    """
+    cells = size * size
+    tokens = [PLAYER, HOSPITAL]
+    for token, density in ((ZOMBIE, zombies),
+                           (TRACKING_ZOMBIE, tracking_zombies),
+                           (GARLIC, garlic), (CROSSBOW, crossbows),
+                           (TIME_MACHINE, time_machines)):
+        tokens.extend(token * round(cells * density))
+    if len(tokens) > cells:
+        raise ValueError(f"{len(tokens)} entities do not fit on a map of "
+                         f"size {size}")
+
+    # The sampled cells are in random order, so assigning them tokens in
+    # order places every type of entity at random.
+    placed = sorted(zip(random.Random(seed).sample(range(cells), len(tokens)),
+                        tokens))
+    return [(index % size, index // size, token) for index, token in placed]
+
+
+def write_text_map(filename: str, size: int,
+                   entities: List[Tuple[int, int, str]]) -> None:
+    """
+    Write entities as a text map file.
+
+    Parameters:
+        filename: Path of the text map file to write.
+        size: The size of the map.
+        entities: The (x, y, token) of every entity.
+    """
+    line = size + 1
+    contents = bytearray(b" " * size + b"\n") * size
+    for x, y, token in entities:
+        contents[y * line + x] = ord(token)
+    with open(filename, "wb") as map_file:
+        map_file.write(contents)
+
+
+def generate_map(filename: str, size: int, binary: bool = False,
+                 **densities) -> None:
+    """
+    Write a random map file. Densities and the seed are given as keyword
+    arguments, see `generate_entities`.
+
+    Parameters:
+        filename: Path of the map file to write.
+        size: The size of the map.
+        binary: If true, write a binary map instead of a text map.
+    """
+    entities = generate_entities(size, **densities)
+    if binary:
+        write_binary_map(filename, size, entities)
+    else:
+        write_text_map(filename, size, entities)
+
+
+def generate_grid(size: int, grid_class: Type[Grid] = Grid,
+                  **densities) -> Grid:
+    """
+    Return a Grid holding a random map, without writing a map file.
+    Densities and the seed are given as keyword arguments, see
+    `generate_entities`.
+
+    Parameters:
+        size: The size of the map.
+        grid_class: The Grid implementation to build the map into.
+    """
+    return AdvancedMapLoader(grid_class).build(
+        size, generate_entities(size, **densities))
+
+
+def main() -> None:
+    """Write the map given on the command line."""
+    parser = argparse.ArgumentParser(description="Generate a random map.")
+    parser.add_argument("map", help="the map file to write")
+    parser.add_argument("size", type=int, help="the size of the map")
+    parser.add_argument("--seed", type=int, help="the seed of the map")
+    parser.add_argument("--zombies", type=float, default=0.05,
+                        help="the density of zombies")
+    parser.add_argument("--tracking-zombies", type=float, default=0.01,
+                        help="the density of tracking zombies")
+    parser.add_argument("--garlic", type=float, default=0.002,
+                        help="the density of garlic")
+    parser.add_argument("--crossbows", type=float, default=0.002,
+                        help="the density of crossbows")
+    parser.add_argument("--time-machines", type=float, default=0.0,
+                        help="the density of time machines")
+    parser.add_argument("--binary", action="store_true",
+                        help="write a binary map instead of a text map")
+    arguments = parser.parse_args()
+    generate_map(arguments.map, arguments.size, arguments.binary,
+                 zombies=arguments.zombies,
+                 tracking_zombies=arguments.tracking_zombies,
+                 garlic=arguments.garlic, crossbows=arguments.crossbows,
+                 time_machines=arguments.time_machines, seed=arguments.seed)
+
+
+if __name__ == "__main__":
+    main()
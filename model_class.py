@@ -28,6 +28,104 @@ class InitError(Exception):
         return f'Wrong parameter!!!(Please check cols | width, rows | height)'
 
 
+class SpriteCache:
+    """
+    The SpriteCache class decodes each image file once per Tk interpreter and
+    shares the resulting tk.PhotoImage between every widget which draws it.
+
+    The images of an interpreter are dropped when its root window is
+    destroyed, as they cannot be drawn by any other interpreter.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initially the cache does not contain any images.
+        """
+        # Images by file name, for every Tk interpreter.
+        self._images: Dict[object, Dict[str, tk.PhotoImage]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, master, filename: str) -> tk.PhotoImage:
+        """
+        Return the image of the given file for the Tk interpreter of the master widget,
+        loading it from disk the first time it is requested.
+
+        Parameters:
+            master: A widget of the Tk interpreter the image is drawn with.
+            filename: The path of the image file.
+        """
+        images = self._images.get(master.tk)
+        if images is None:
+            images = self._images[master.tk] = {}
+            root = master.nametowidget(".")
+
+            def destroyed(event: tk.Event) -> None:
+                # Every child window's destruction is reported to the root.
+                if event.widget is root:
+                    self.release(root)
+
+            root.bind("<Destroy>", destroyed, add="+")
+        image = images.get(filename)
+        if image is None:
+            self._misses += 1
+            image = tk.PhotoImage(master=master, file=filename)
+            images[filename] = image
+        else:
+            self._hits += 1
+        return image
+
+    def release(self, master) -> None:
+        """
+        Drop the images of the Tk interpreter of the master widget.
+
+        Parameters:
+            master: A widget of the Tk interpreter whose images are dropped.
+        """
+        self._images.pop(master.tk, None)
+
+    def get_image_count(self) -> int:
+        """
+        Return the number of images held, over every Tk interpreter.
+        """
+        return sum(len(images) for images in self._images.values())
+
+    def get_hits(self) -> int:
+        """
+        Return the number of requests served from the cache.
+        """
+        return self._hits
+
+    def get_misses(self) -> int:
+        """
+        Return the number of requests which loaded the image from disk.
+        """
+        return self._misses
+
+    def get_hit_rate(self) -> float:
+        """
+        Return the fraction of requests served from the cache, 0 if there were none.
+        """
+        requests = self._hits + self._misses
+        return self._hits / requests if requests else 0.0
+
+    def clear(self) -> None:
+        """
+        Drop every cached image.
+        """
+        self._images.clear()
+
+
+_sprite_cache = SpriteCache()
+
+
+def get_sprite_cache() -> SpriteCache:
+    """
+    Return the sprite cache shared by every view.
+    """
+    return _sprite_cache
+
+
 class AbstractGrid(tk.Canvas):
     """
     The AbstractGrid class is used to represent the 2D grid of entities.
@@ -122,12 +220,185 @@ class AbstractGrid(tk.Canvas):
                 and 0 <= position.get_y() < self._rows_y)
 
 
-class BasicMap(AbstractGrid):
+class EntityMap(AbstractGrid):
+    """
+    EntityMap is the base class of the map views which draw the entities of a grid.
+
+    The map keeps the canvas items drawn for every occupied cell. Rendering a grid
+    only updates the cells which changed since the previous render, as reported by
+    the grid's journal: items of vacated cells are moved to newly occupied cells and
+    items of cells whose entity type changed are reconfigured.
+
+    Items which are no longer needed are hidden and kept in a pool instead of being
+    deleted, and new cells take their items from the pool before creating any, so
+    canvas items are only created when more cells are occupied than ever before.
+
+    Subclasses draw the items of a cell with `_create_cell`, `_configure_cell` and
+    `_place_cell`, on the canvas `_basic_map_canvas`.
+    """
+
+    def _init_cells(self) -> None:
+        """
+        Init the canvas items of the cells, initially no cell is drawn.
+        """
+        self._cells: Dict[Position, Tuple[str, Tuple[int, ...]]] = {}
+        self._pool: List[Tuple[str, Tuple[int, ...]]] = []
+        self._rendered_grid: Optional[Grid] = None
+        self._cursor: Optional[JournalCursor] = None
+
+    def render(self, grid: Grid) -> None:
+        """
+        Draw the entities of the grid, only updating the cells which changed since
+        the grid was last rendered. A grid which was not the last one rendered is
+        drawn from scratch.
+
+        Parameters:
+            grid: The grid to draw.
+        """
+        if grid is not self._rendered_grid:
+            self.reset()
+            self._rendered_grid = grid
+            self._cursor = grid.enable_journal().open_cursor()
+            for (x, y), tile_type in grid.serialize().items():
+                position = Position(x, y)
+                self._cells[position] = (tile_type, self._reuse_cell(position, tile_type))
+            return
+
+        dirty = set()
+        for entry in self._cursor.pull():
+            if entry.start is not None:
+                dirty.add(entry.start)
+            if entry.end is not None:
+                dirty.add(entry.end)
+
+        vacated = []
+        filled = []
+        for position in dirty:
+            entity = grid.get_entity(position)
+            tile_type = None if entity is None else entity.display()
+            drawn = self._cells.get(position)
+            if drawn is None:
+                if tile_type is not None:
+                    filled.append((position, tile_type))
+            elif tile_type is None:
+                vacated.append(self._cells.pop(position))
+            elif drawn[0] != tile_type:
+                self._configure_cell(drawn[1], tile_type)
+                self._cells[position] = (tile_type, drawn[1])
+
+        for position, tile_type in filled:
+            if vacated:
+                drawn_type, items = vacated.pop()
+                self._place_cell(items, position)
+                if drawn_type != tile_type:
+                    self._configure_cell(items, tile_type)
+            else:
+                items = self._reuse_cell(position, tile_type)
+            self._cells[position] = (tile_type, items)
+
+        for cell in vacated:
+            self._release_cell(cell)
+
+    def reset(self) -> None:
+        """
+        Release the items of every drawn cell to the pool and stop following the last
+        rendered grid, so the next render draws from scratch.
+        """
+        for cell in self._cells.values():
+            self._release_cell(cell)
+        self._cells.clear()
+        if self._cursor is not None:
+            self._cursor.close()
+        self._cursor = None
+        self._rendered_grid = None
+
+    def get_pool_size(self) -> int:
+        """
+        Return the number of hidden cells whose items are ready to be reused.
+        """
+        return len(self._pool)
+
+    def _reuse_cell(self, position: Position, tile_type: str) -> Tuple[int, ...]:
+        """
+        Return canvas items drawing an entity at the given position, taken from the
+        pool when possible and created otherwise.
+
+        Parameters:
+            position: An (col_x, row_y) position in the map to draw the entity.
+            tile_type: The tile type of the Entity.
+        """
+        if not self._pool:
+            return self._create_cell(position, tile_type)
+        pooled_type, items = self._pool.pop()
+        self._place_cell(items, position)
+        if pooled_type != tile_type:
+            self._configure_cell(items, tile_type)
+        for item in items:
+            self._basic_map_canvas.itemconfigure(item, state='normal')
+        return items
+
+    def _release_cell(self, cell: Tuple[str, Tuple[int, ...]]) -> None:
+        """
+        Hide the canvas items of a cell which is no longer drawn and keep them in the pool.
+
+        Parameters:
+            cell: The tile type and canvas items of the cell.
+        """
+        for item in cell[1]:
+            self._basic_map_canvas.itemconfigure(item, state='hidden')
+        self._pool.append(cell)
+
+    def _create_cell(self, position: Position, tile_type: str) -> Tuple[int, ...]:
+        """
+        Create and return the canvas items drawing an entity at the given position.
+
+        Parameters:
+            position: An (col_x, row_y) position in the map to draw the entity.
+            tile_type: The tile type of the Entity.
+        """
+        raise NotImplementedError()
+
+    def _configure_cell(self, items: Tuple[int, ...], tile_type: str) -> None:
+        """
+        Change the canvas items of a cell to draw another type of entity.
+
+        Parameters:
+            items: The canvas items of the cell.
+            tile_type: The tile type of the Entity.
+        """
+        raise NotImplementedError()
+
+    def _place_cell(self, items: Tuple[int, ...], position: Position) -> None:
+        """
+        Move the canvas items of a cell to another position.
+
+        Parameters:
+            items: The canvas items of the cell.
+            position: An (col_x, row_y) position in the map to move the items to.
+        """
+        raise NotImplementedError()
+
+
+class BasicMap(EntityMap):
     """
-    BasicMap is a view class which inherits from AbstractGrid.
+    BasicMap is a view class which inherits from EntityMap.
     Entities are drawn on the map using coloured rectangles at different (col_x, row_y) positions.
     """
 
+    _entity_bgcolor_dict = {ZOMBIE: ENTITY_COLOURS[ZOMBIE],
+                            TRACKING_ZOMBIE: ENTITY_COLOURS[TRACKING_ZOMBIE],
+                            CROSSBOW: ENTITY_COLOURS[CROSSBOW],
+                            GARLIC: ENTITY_COLOURS[GARLIC],
+                            PLAYER: ENTITY_COLOURS[PLAYER],
+                            HOSPITAL: ENTITY_COLOURS[HOSPITAL]}
+
+    _entity_textcolor_dict = {ZOMBIE: 'black',
+                              TRACKING_ZOMBIE: 'black',
+                              CROSSBOW: 'black',
+                              GARLIC: 'black',
+                              PLAYER: 'white',
+                              HOSPITAL: 'white'}
+
     def __init__(self, master, size: int, **kwargs) -> None:
         """
         A basicmap is constructed with size that dictates the length and width
@@ -152,6 +423,7 @@ class BasicMap(AbstractGrid):
         self._basic_map_canvas = tk.Canvas(master, bg=self._background, width=self._width,
                                            height=self._height, bd=0, highlightthickness=0)
         self._basic_map_canvas.pack(side=tk.TOP)
+        self._init_cells()
 
     def draw_entity(self, position: Position, title_type: str) -> None:
         """
@@ -162,27 +434,29 @@ class BasicMap(AbstractGrid):
             position: An (col_x, row_y) position in the map to draw the entity.
             title_type: The title type of the Entity.
         """
-        entity_bgcolor_dict = {ZOMBIE: ENTITY_COLOURS[ZOMBIE],
-                               TRACKING_ZOMBIE: ENTITY_COLOURS[TRACKING_ZOMBIE],
-                               CROSSBOW: ENTITY_COLOURS[CROSSBOW],
-                               GARLIC: ENTITY_COLOURS[GARLIC],
-                               PLAYER: ENTITY_COLOURS[PLAYER],
-                               HOSPITAL: ENTITY_COLOURS[HOSPITAL]}
-
-        entity_textcolor_dict = {ZOMBIE: 'black',
-                                 TRACKING_ZOMBIE: 'black',
-                                 CROSSBOW: 'black',
-                                 GARLIC: 'black',
-                                 PLAYER: 'white',
-                                 HOSPITAL: 'white'}
+        self._create_cell(position, title_type)
+
+    def _create_cell(self, position: Position, tile_type: str) -> Tuple[int, ...]:
         bbox = self.get_bbox(position)
-        self._basic_map_canvas.create_rectangle(bbox[0], bbox[1], bbox[2], bbox[3], outline='black',
-                                                fill=entity_bgcolor_dict[title_type], width=1)
+        rectangle = self._basic_map_canvas.create_rectangle(bbox[0], bbox[1], bbox[2], bbox[3], outline='black',
+                                                            fill=self._entity_bgcolor_dict[tile_type], width=1,
+                                                            tags='entity')
         center_piexl_position = self.get_position_center(position)
-        self._basic_map_canvas.create_text(center_piexl_position.get_x(), center_piexl_position.get_y(),
-                                           text=title_type,
-                                           fill=entity_textcolor_dict[title_type])
-        self._basic_map_canvas.pack(side=tk.TOP)
+        text = self._basic_map_canvas.create_text(center_piexl_position.get_x(), center_piexl_position.get_y(),
+                                                  text=tile_type,
+                                                  fill=self._entity_textcolor_dict[tile_type], tags='entity')
+        return rectangle, text
+
+    def _configure_cell(self, items: Tuple[int, ...], tile_type: str) -> None:
+        rectangle, text = items
+        self._basic_map_canvas.itemconfigure(rectangle, fill=self._entity_bgcolor_dict[tile_type])
+        self._basic_map_canvas.itemconfigure(text, text=tile_type, fill=self._entity_textcolor_dict[tile_type])
+
+    def _place_cell(self, items: Tuple[int, ...], position: Position) -> None:
+        rectangle, text = items
+        self._basic_map_canvas.coords(rectangle, *self.get_bbox(position))
+        center_piexl_position = self.get_position_center(position)
+        self._basic_map_canvas.coords(text, center_piexl_position.get_x(), center_piexl_position.get_y())
 
 
 class InventoryView(AbstractGrid):
@@ -215,48 +489,94 @@ class InventoryView(AbstractGrid):
                                                 text='Inventory', fill=DARK_PURPLE, font=('Purisa', 24),
                                                 tags='inventory_label')
         self._inventory_view_canvas.pack(side=tk.RIGHT)
+        self._init_rows()
+
+    def _init_rows(self) -> None:
+        """
+        Init the canvas items of the item rows, initially no row is drawn.
+        """
+        self._row_items: List[Tuple[int, int, int, int]] = []
+        self._row_values: List[Optional[Tuple[str, int, bool]]] = []
 
     def draw(self, inventory: Inventory) -> None:
         """
         Draws the inventory label and current items with their remaining lifetimes.
 
+        Every row keeps its canvas items, and only the rows whose item, lifetime or
+        activation changed since the last draw are updated. Rows without an item are
+        hidden.
+
         Parameters:
             inventory: The inventory that HoldingPlayer has.
         """
         items = inventory.get_items()
-        if len(items) == 0:
-            return
-        start_row = 1
-        for item in items:
-            item_position = Position(0, start_row)
-            item_bbox = self.get_bbox(item_position)
-            lifetime_position = Position(1, start_row)
-            lifetime_bbox = self.get_bbox(lifetime_position)
-
-            text_color = 'white' if item.is_active() else 'black'
-            background_color = DARK_PURPLE if item.is_active() else LIGHT_PURPLE
-
-            """
-            Create inventory item display text at Position(col_x=0, row_y)
-            """
-            self._inventory_view_canvas.create_rectangle(item_bbox[0], item_bbox[1], item_bbox[2], item_bbox[3],
-                                                         fill=background_color, outline=background_color, tags='pickup')
-            item_center_piexl_position = self.get_position_center(item_position)
-            self._inventory_view_canvas.create_text(item_center_piexl_position.get_x(),
-                                                    item_center_piexl_position.get_y(),
-                                                    text=item.__class__.__name__, fill=text_color, tags='pickup')
-            """
-            Create inventory item lifetime at Position(col_x=1, row_y)
-            """
-            self._inventory_view_canvas.create_rectangle(lifetime_bbox[0], lifetime_bbox[1], lifetime_bbox[2],
-                                                         lifetime_bbox[3],
-                                                         fill=background_color, outline=background_color, tags='pickup')
-            lifetime_center_piexl_position = self.get_position_center(lifetime_position)
-            self._inventory_view_canvas.create_text(lifetime_center_piexl_position.get_x(),
-                                                    lifetime_center_piexl_position.get_y(),
-                                                    text=item.get_lifetime(), fill=text_color, tags='pickup')
-            start_row += 1
-        self._inventory_view_canvas.pack(side=tk.TOP)
+        for row_index, item in enumerate(items):
+            value = (item.__class__.__name__, item.get_lifetime(), item.is_active())
+            if row_index == len(self._row_items):
+                self._row_items.append(self._create_row(row_index + 1, value))
+                self._row_values.append(value)
+            elif self._row_values[row_index] != value:
+                self._configure_row(self._row_items[row_index], value)
+                self._row_values[row_index] = value
+
+        for row_index in range(len(items), len(self._row_items)):
+            if self._row_values[row_index] is not None:
+                for canvas_item in self._row_items[row_index]:
+                    self._inventory_view_canvas.itemconfigure(canvas_item, state='hidden')
+                self._row_values[row_index] = None
+
+    def _create_row(self, row_y: int, value: Tuple[str, int, bool]) -> Tuple[int, int, int, int]:
+        """
+        Create and return the canvas items of an item row.
+
+        Parameters:
+            row_y: The row to draw the item at.
+            value: The name, lifetime and activation of the item.
+        """
+        item_position = Position(0, row_y)
+        item_bbox = self.get_bbox(item_position)
+        lifetime_position = Position(1, row_y)
+        lifetime_bbox = self.get_bbox(lifetime_position)
+
+        """
+        Create inventory item display text at Position(col_x=0, row_y)
+        """
+        item_rectangle = self._inventory_view_canvas.create_rectangle(item_bbox[0], item_bbox[1], item_bbox[2],
+                                                                      item_bbox[3], tags='pickup')
+        item_center_piexl_position = self.get_position_center(item_position)
+        item_text = self._inventory_view_canvas.create_text(item_center_piexl_position.get_x(),
+                                                            item_center_piexl_position.get_y(), tags='pickup')
+        """
+        Create inventory item lifetime at Position(col_x=1, row_y)
+        """
+        lifetime_rectangle = self._inventory_view_canvas.create_rectangle(lifetime_bbox[0], lifetime_bbox[1],
+                                                                          lifetime_bbox[2], lifetime_bbox[3],
+                                                                          tags='pickup')
+        lifetime_center_piexl_position = self.get_position_center(lifetime_position)
+        lifetime_text = self._inventory_view_canvas.create_text(lifetime_center_piexl_position.get_x(),
+                                                                lifetime_center_piexl_position.get_y(),
+                                                                tags='pickup')
+        canvas_items = (item_rectangle, item_text, lifetime_rectangle, lifetime_text)
+        self._configure_row(canvas_items, value)
+        return canvas_items
+
+    def _configure_row(self, canvas_items: Tuple[int, int, int, int], value: Tuple[str, int, bool]) -> None:
+        """
+        Show the canvas items of an item row with the given item.
+
+        Parameters:
+            canvas_items: The canvas items of the row.
+            value: The name, lifetime and activation of the item.
+        """
+        name, lifetime, active = value
+        text_color = 'white' if active else 'black'
+        background_color = DARK_PURPLE if active else LIGHT_PURPLE
+        item_rectangle, item_text, lifetime_rectangle, lifetime_text = canvas_items
+        for rectangle in (item_rectangle, lifetime_rectangle):
+            self._inventory_view_canvas.itemconfigure(rectangle, fill=background_color, outline=background_color,
+                                                      state='normal')
+        self._inventory_view_canvas.itemconfigure(item_text, text=name, fill=text_color, state='normal')
+        self._inventory_view_canvas.itemconfigure(lifetime_text, text=lifetime, fill=text_color, state='normal')
 
     def toggle_item_activation(self, pixel: Position, inventory: Inventory) -> None:
         """
@@ -272,10 +592,20 @@ class InventoryView(AbstractGrid):
             inventory.get_items()[row_y - 1].toggle_active()
 
 
-class ImageMap(AbstractGrid):
+class ImageMap(EntityMap):
     """
-
+    ImageMap is a view class which inherits from EntityMap.
+    Entities are drawn on the map using images at different (col_x, row_y) positions.
     """
+
+    _entity_image_dict = {ZOMBIE: IMAGES[ZOMBIE],
+                          TRACKING_ZOMBIE: IMAGES[TRACKING_ZOMBIE],
+                          CROSSBOW: IMAGES[CROSSBOW],
+                          GARLIC: IMAGES[GARLIC],
+                          PLAYER: IMAGES[PLAYER],
+                          HOSPITAL: IMAGES[HOSPITAL],
+                          TIME_MACHINE: 'images/time_machine.png'}
+
     def __init__(self, master, size: int, **kwargs) -> None:
         """
 
@@ -286,33 +616,48 @@ class ImageMap(AbstractGrid):
         self._rec_height = CELL_SIZE
         self._width = self._rec_width * size
         self._height = self._rec_height * size
-        self._images: Dict[Position, tk.PhotoImage] = {}
 
         self._basic_map_canvas = tk.Canvas(master, width=self._width, height=self._height, bd=0, highlightthickness=0)
 
-        self._back_ground = tk.PhotoImage(file=IMAGES[BACK_GROUND])
+        self._back_ground = _sprite_cache.get(self._basic_map_canvas, IMAGES[BACK_GROUND])
         for row in range(self._rows):
             for col in range(self._cols):
                 bbox = self.get_bbox(Position(col, row))
                 self._basic_map_canvas.create_image(bbox[0], bbox[1], image=self._back_ground, anchor='nw', tags='bg')
         self._basic_map_canvas.pack(side=tk.TOP)
+        self._init_cells()
 
     def draw_entity(self, position: Position, title_type: str) -> None:
         """
+        Draws the entity with tile type at the given position using its image.
+
+        Parameters:
+            position: An (col_x, row_y) position in the map to draw the entity.
+            title_type: The title type of the Entity.
+        """
+        self._create_cell(position, title_type)
 
+    def _get_image(self, tile_type: str) -> tk.PhotoImage:
         """
-        entity_image_dict = {ZOMBIE: IMAGES[ZOMBIE],
-                             TRACKING_ZOMBIE: IMAGES[TRACKING_ZOMBIE],
-                             CROSSBOW: IMAGES[CROSSBOW],
-                             GARLIC: IMAGES[GARLIC],
-                             PLAYER: IMAGES[PLAYER],
-                             HOSPITAL: IMAGES[HOSPITAL],
-                             TIME_MACHINE: 'images/time_machine.png'}
+        Return the image of the tile type from the shared sprite cache.
 
-        self._images[position] = tk.PhotoImage(file=entity_image_dict[title_type])
+        Parameters:
+            tile_type: The tile type of the Entity.
+        """
+        return _sprite_cache.get(self._basic_map_canvas, self._entity_image_dict[tile_type])
+
+    def _create_cell(self, position: Position, tile_type: str) -> Tuple[int, ...]:
         bbox = self.get_bbox(position)
-        self._basic_map_canvas.create_image(bbox[0], bbox[1], image=self._images[position], anchor='nw', tags='entity')
-        self._basic_map_canvas.pack(side=tk.TOP)
+        image = self._basic_map_canvas.create_image(bbox[0], bbox[1], image=self._get_image(tile_type),
+                                                    anchor='nw', tags='entity')
+        return (image,)
+
+    def _configure_cell(self, items: Tuple[int, ...], tile_type: str) -> None:
+        self._basic_map_canvas.itemconfigure(items[0], image=self._get_image(tile_type))
+
+    def _place_cell(self, items: Tuple[int, ...], position: Position) -> None:
+        bbox = self.get_bbox(position)
+        self._basic_map_canvas.coords(items[0], bbox[0], bbox[1])
 
 
 class StatusBar(tk.Frame):
@@ -354,7 +699,7 @@ class StatusBar(tk.Frame):
         self._chaser_frame.pack(side=tk.LEFT)
         self._chaser_canvas = tk.Canvas(self._chaser_frame, width=CELL_SIZE, height=CELL_SIZE, bd=0,
                                         highlightthickness=0)
-        self._chaser_image = tk.PhotoImage(file='images/chaser.png')
+        self._chaser_image = _sprite_cache.get(self._chaser_canvas, 'images/chaser.png')
         self._chaser_canvas.create_image(0, 0, image=self._chaser_image, anchor='nw')
         self._chaser_canvas.pack(side=tk.TOP)
 
@@ -377,7 +722,9 @@ class StatusBar(tk.Frame):
         self._timer_num_frame.pack(side=tk.TOP)
         self._timer_num_canvas = tk.Canvas(self._timer_num_frame, height=CELL_SIZE // 2,
                                            width=self._button_width // 3, bd=0, highlightthickness=0)
-        self._timer_num_canvas.create_text(self._button_width // 6, CELL_SIZE // 4, text='0 mins 0 seconds')
+        self._timer = 0
+        self._timer_text = self._timer_num_canvas.create_text(self._button_width // 6, CELL_SIZE // 4,
+                                                              text='0 mins 0 seconds')
         self._timer_num_canvas.pack(side=tk.TOP)
 
         """
@@ -399,7 +746,9 @@ class StatusBar(tk.Frame):
         self._moves_num_frame.pack(side=tk.TOP)
         self._moves_num_canvas = tk.Canvas(self._moves_num_frame, height=CELL_SIZE // 2,
                                            width=self._button_width // 3, bd=0, highlightthickness=0)
-        self._moves_num_canvas.create_text(self._button_width // 6, CELL_SIZE // 4, text='0 moves')
+        self._moves = 0
+        self._moves_text = self._moves_num_canvas.create_text(self._button_width // 6, CELL_SIZE // 4,
+                                                              text='0 moves')
         self._moves_num_canvas.pack(side=tk.TOP)
 
         """
@@ -429,32 +778,35 @@ class StatusBar(tk.Frame):
         self._chasee_frame.pack(side=tk.LEFT)
         self._chasee_canvas = tk.Canvas(self._chasee_frame, width=CELL_SIZE, height=CELL_SIZE, bd=0,
                                         highlightthickness=0)
-        self._chasee_image = tk.PhotoImage(file='images/chasee.png')
+        self._chasee_image = _sprite_cache.get(self._chasee_canvas, 'images/chasee.png')
         self._chasee_canvas.create_image(0, 0, image=self._chasee_image, anchor='nw')
         self._chasee_canvas.pack(side=tk.TOP)
 
     def change_timer(self, time: int) -> None:
         """
-        Change the timer number of StatusBar.
+        Change the timer number of StatusBar, if it changed.
 
         Parameters:
             time: The timer number now.
         """
-        self._timer_num_canvas.delete("all")
+        if time == self._timer:
+            return
+        self._timer = time
         minutes = str(time // 60)
         seconds = str(time % 60)
-        self._timer_num_canvas.create_text(self._button_width // 6, CELL_SIZE // 4,
-                                           text=minutes + ' mins ' + seconds + ' seconds')
+        self._timer_num_canvas.itemconfigure(self._timer_text, text=minutes + ' mins ' + seconds + ' seconds')
 
     def change_move(self, moves: int) -> None:
         """
-        Change the moves made number of StatusBar.
+        Change the moves made number of StatusBar, if it changed.
 
         Parameters:
             moves: The moves made now.
         """
-        self._moves_num_canvas.delete("all")
-        self._moves_num_canvas.create_text(self._button_width // 6, CELL_SIZE // 4, text=str(moves) + ' moves')
+        if moves == self._moves:
+            return
+        self._moves = moves
+        self._moves_num_canvas.itemconfigure(self._moves_text, text=str(moves) + ' moves')
 
     def get_quit_button(self) -> tk.Button:
         """
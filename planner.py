@@ -0,0 +1,520 @@
+"""
+Planning routes from the player to a hospital around the zombies.
+
+A route is found with an A* search over the flat cell indices of the grid,
+using a neighbour table computed once per map size. Zombies block their
+cells, and cells next to a zombie cost extra to walk through, since the
+zombie may step onto the player from there. Hospitals never cost extra, as
+reaching one wins the game straight away. A hospital shut in by zombies is
+found by looking around the hospital first, rather than by searching every
+cell the player can reach.
+
+The Autopilot follows a route move by move, reading the changes from the
+grid's journal. When a zombie moves onto or next to the next few cells of
+the route, or the player is not where the route expects, the route is
+repaired: only the cells around the start of the route are searched for a
+detour back onto it. A whole new route is only planned when there is no
+such detour. It is an action source for headless games, see
+`headless.POLICIES`.
+"""
+
+from array import array
+from heapq import heappop, heappush
+from typing import Dict, List, Optional, Set, Tuple
+
+from a2_solution import *
+from constants import *
+
+# The extra cost of walking through a cell next to a zombie.
+DANGER_COST = 2
+# The weight of the distance left to the hospital against the cost so far.
+# Weights above 1 find routes at most that many times the cheapest, while
+# searching far fewer cells when zombies are in the way.
+ROUTE_WEIGHT = 2
+# The number of cells ahead of the player the Autopilot watches for zombies.
+# Zombies further along the route will have moved again by the time the
+# player gets there, so they are left until the player is close.
+WATCH_CELLS = 6
+# The number of open cells around the hospitals searched for a way out before
+# planning. Hospitals shut in by zombies are found without searching the
+# whole map from the player's side.
+WALLED_CELLS = 16
+# The number of cells around the player and the cell a detour rejoins the
+# route at that the detour may walk through.
+REPAIR_MARGIN = 2
+
+_ZOMBIE_CELLS = bytes(1 if chr(code) in ZOMBIES else 0 for code in range(256))
+
+_neighbour_tables: Dict[int, List[Tuple[int, ...]]] = {}
+_column_masks: Dict[int, Tuple[int, int]] = {}
+# Larger than the cost of any walk, as a walk visits a cell at most once.
+_UNREACHED = 2 ** 31 - 1
+_unreached_arrays: Dict[int, array] = {}
+
+
+def neighbour_table(size: int) -> List[Tuple[int, ...]]:
+    """
+    Return the flat indices of the neighbours of every cell of a map of the
+    given size, computed once per size.
+
+    Parameters:
+        size: The size of the map.
+
+    Examples:
+        >>> neighbour_table(2)
+        [(1, 2), (0, 3), (3, 0), (2, 1)]
+    """
+    table = _neighbour_tables.get(size)
+    if table is None:
+        table = []
+        for index in range(size * size):
+            y, x = divmod(index, size)
+            neighbours = []
+            if x + 1 < size:
+                neighbours.append(index + 1)
+            if x > 0:
+                neighbours.append(index - 1)
+            if y + 1 < size:
+                neighbours.append(index + size)
+            if y > 0:
+                neighbours.append(index - size)
+            table.append(tuple(neighbours))
+        _neighbour_tables[size] = table
+    return table
+
+
+def danger_cells(zombies: bytes, size: int) -> bytes:
+    """
+    Return a flat array holding DANGER_COST for every cell next to a zombie,
+    and 0 for every other cell.
+
+    The cells are shifted as one big integer, a byte per cell, so the whole
+    map is done at once: shifting by 8 bits moves every cell one column and
+    shifting by 8 * size bits moves it one row. Cells shifted across the
+    edge of a row are masked out.
+
+    Parameters:
+        zombies: A flat array holding 1 for every zombie and 0 elsewhere.
+        size: The size of the map.
+
+    Examples:
+        >>> list(danger_cells(bytes([0, 0, 0, 1, 0, 0, 0, 0, 0]), 3))
+        [2, 0, 0, 0, 2, 0, 2, 0, 0]
+    """
+    masks = _column_masks.get(size)
+    if masks is None:
+        # Cells in the big integer run from the last cell, in the lowest
+        # byte, to the first cell, so the last column has the lowest byte
+        # of each row and the first column the highest.
+        last_column = 0xFF
+        first_column = last_column << 8 * (size - 1)
+        rows = sum(1 << 8 * size * row for row in range(size))
+        everything = (1 << 8 * size * size) - 1
+        masks = (everything ^ (first_column * rows),
+                 everything ^ (last_column * rows))
+        _column_masks[size] = masks
+    not_first_column, not_last_column = masks
+
+    cells = int.from_bytes(zombies, "big")
+    row = 8 * size
+    near = ((cells << 8) & not_last_column | (cells >> 8) & not_first_column
+            | cells << row | cells >> row) & ((1 << 8 * size * size) - 1)
+    return (near * DANGER_COST).to_bytes(size * size, "big")
+
+
+def unreached_array(size: int) -> array:
+    """
+    Return a flat array holding _UNREACHED for every cell of a map of the
+    given size, computed once per size. Searches copy it rather than filling
+    their own.
+
+    Parameters:
+        size: The size of the map.
+    """
+    unreached = _unreached_arrays.get(size)
+    if unreached is None:
+        unreached = array("i", [_UNREACHED]) * (size * size)
+        _unreached_arrays[size] = unreached
+    return unreached
+
+
+def walled_in(goals: Set[int], start: int, zombies: bytes,
+              neighbours: List[Tuple[int, ...]]) -> bool:
+    """
+    Return true if zombies shut the goals into a pocket of fewer than
+    WALLED_CELLS open cells, away from the start. Return false if the pocket
+    holds the start or is too big to tell.
+
+    Parameters:
+        goals: The flat indices of the goals.
+        start: The flat index of the start.
+        zombies: A flat array holding 1 for every zombie and 0 elsewhere.
+        neighbours: The neighbour table of the map, see `neighbour_table`.
+
+    Examples:
+        >>> zombies = bytes([0, 1, 0,
+        ...                  1, 0, 0,
+        ...                  0, 0, 0])
+        >>> walled_in({0}, 8, zombies, neighbour_table(3))
+        True
+        >>> walled_in({2}, 8, zombies, neighbour_table(3))
+        False
+    """
+    pocket = set(goals)
+    unvisited = list(goals)
+    while unvisited:
+        for neighbour in neighbours[unvisited.pop()]:
+            if neighbour == start:
+                return False
+            if neighbour not in pocket and not zombies[neighbour]:
+                if len(pocket) == WALLED_CELLS:
+                    return False
+                pocket.add(neighbour)
+                unvisited.append(neighbour)
+    return True
+
+
+def plan_route(grid: Grid) -> Optional[List[Position]]:
+    """
+    Return the cells the player walks through to reach the nearest hospital,
+    ending with the hospital, going around zombies and preferring to keep
+    away from them. Return None if there is no player, no hospital, or every
+    route is blocked by zombies.
+
+    Parameters:
+        grid: The grid to plan a route through.
+
+    Examples:
+        >>> grid = Grid(3)
+        >>> grid.add_entity(Position(0, 0), Player())
+        >>> grid.add_entity(Position(2, 0), Hospital())
+        >>> grid.add_entity(Position(1, 0), Zombie())
+        >>> plan_route(grid)
+        [Position(0, 1), Position(1, 1), Position(2, 1), Position(2, 0)]
+        >>> grid.add_entity(Position(1, 1), Zombie())
+        >>> grid.add_entity(Position(1, 2), Zombie())
+        >>> plan_route(grid)
+    """
+    player = grid.find_player()
+    hospitals = grid.find_entities(HOSPITAL)
+    if player is None or not hospitals:
+        return None
+
+    size = grid.get_size()
+    neighbours = neighbour_table(size)
+    zombies = grid.get_occupancy().translate(_ZOMBIE_CELLS)
+    start = player.get_y() * size + player.get_x()
+    goals = {position.get_y() * size + position.get_x()
+             for position in hospitals}
+    if walled_in(goals, start, zombies, neighbours):
+        return None
+    danger = bytearray(danger_cells(zombies, size))
+    for goal in goals:
+        # Reaching a hospital wins before any zombie can step.
+        danger[goal] = 0
+    # The search heads for the hospital nearest the player, and stops at
+    # whichever hospital it reaches first.
+    goal_x, goal_y = min(
+        ((position.get_x(), position.get_y()) for position in hospitals),
+        key=lambda goal: (abs(goal[0] - player.get_x())
+                          + abs(goal[1] - player.get_y())))
+
+    # Zombie cells start closed, as they are never walked through.
+    route = search(size, start, goals, goal_y * size + goal_x,
+                   bytearray(zombies), danger)
+    if route is None:
+        return None
+    return [Position(index % size, index // size) for index in route]
+
+
+def search(size: int, start: int, goals: Set[int], heading: int,
+           closed: bytearray, danger: bytes) -> Optional[List[int]]:
+    """
+    Return the flat indices of the cells walked through from the start to the
+    first goal reached, found with an A* search heading for one of the goals.
+    Return None if no goal can be reached.
+
+    Parameters:
+        size: The size of the map.
+        start: The flat index of the start.
+        goals: The flat indices of the goals.
+        heading: The flat index of the goal the search heads for.
+        closed: A flat array holding 1 for every cell never to walk through,
+                updated as the search closes cells.
+        danger: The extra cost of walking through every cell.
+
+    Examples:
+        >>> search(3, 0, {2}, 2, bytearray([0, 1, 0] + [0] * 6), bytes(9))
+        [3, 4, 5, 2]
+    """
+    neighbours = neighbour_table(size)
+    goal_y, goal_x = divmod(heading, size)
+    # The cost of the cheapest walk found to every cell, and the cell it
+    # comes from.
+    costs = unreached_array(size)[:]
+    costs[start] = 0
+    previous = array("i", bytes(4 * size * size))
+    # Ties are broken towards the deepest cell, which keeps the search
+    # heading straight for the goal on open ground.
+    frontier = [(0, 0, start)]
+    while frontier:
+        _, negative_depth, index = heappop(frontier)
+        if closed[index]:
+            continue
+        if index in goals:
+            route = []
+            while index != start:
+                route.append(index)
+                index = previous[index]
+            route.reverse()
+            return route
+        closed[index] = 1
+        cost = costs[index] + 1
+        for neighbour in neighbours[index]:
+            if closed[neighbour]:
+                continue
+            step_cost = cost + danger[neighbour]
+            if step_cost < costs[neighbour]:
+                costs[neighbour] = step_cost
+                previous[neighbour] = index
+                y, x = divmod(neighbour, size)
+                estimate = abs(x - goal_x) + abs(y - goal_y)
+                heappush(frontier, (step_cost + ROUTE_WEIGHT * estimate,
+                                    negative_depth - 1, neighbour))
+    return None
+
+
+def is_clear(grid: Grid, position: Position) -> bool:
+    """
+    Return true if there is no zombie at or next to a position.
+
+    Parameters:
+        grid: The grid to look in.
+        position: The position to look at.
+    """
+    for offset in [(0, 0)] + OFFSETS:
+        entity = grid.get_entity(position.add(Position(*offset)))
+        if entity is not None and entity.display() in ZOMBIES:
+            return False
+    return True
+
+
+def repair_route(grid: Grid, route: List[Position],
+                 ) -> Optional[List[Position]]:
+    """
+    Return a route to a hospital which takes a detour from the player around
+    the zombies in the way and rejoins the given route at its first cell
+    clear of zombies past the next WATCH_CELLS cells, or at its end.
+
+    Only the cells within REPAIR_MARGIN of the player and of that cell are
+    searched, so repairing a long route costs about the same as repairing a
+    short one. Return None if the route cannot be repaired there, in which
+    case a new route has to be planned with `plan_route`.
+
+    Parameters:
+        grid: The grid to find the detour in.
+        route: The route to a hospital to repair.
+
+    Examples:
+        >>> grid = Grid(5)
+        >>> grid.add_entity(Position(0, 0), Player())
+        >>> grid.add_entity(Position(4, 0), Hospital())
+        >>> route = plan_route(grid)
+        >>> [(position.get_x(), position.get_y()) for position in route]
+        [(1, 0), (2, 0), (3, 0), (4, 0)]
+        >>> grid.add_entity(Position(2, 0), Zombie())
+        >>> [(position.get_x(), position.get_y())
+        ...  for position in repair_route(grid, route)]
+        [(0, 1), (1, 1), (2, 1), (3, 1), (4, 1), (4, 0)]
+
+        A player already on the cell the route is rejoined at needs no
+        detour, e.g. after moving ahead along the route by hand.
+
+        >>> grid = Grid(10)
+        >>> grid.add_entity(Position(0, 0), Player())
+        >>> grid.add_entity(Position(9, 0), Hospital())
+        >>> route = plan_route(grid)
+        >>> grid.move_entity(Position(0, 0), Position(7, 0))
+        >>> repair_route(grid, route)
+        [Position(8, 0), Position(9, 0)]
+    """
+    player = grid.find_player()
+    if player in route:
+        # The player has moved along the route, e.g. by hand, so only the
+        # rest of it is rejoined.
+        route = route[route.index(player) + 1:]
+    if player is None or not route:
+        return None
+    rejoin = min(WATCH_CELLS, len(route) - 1)
+    while rejoin < len(route) - 1 and not is_clear(grid, route[rejoin]):
+        rejoin += 1
+    target = route[rejoin]
+
+    # The detour stays within a box around the player and the target. The
+    # local map also holds a ring of cells around the box, which is never
+    # walked through but whose zombies make the edge of the box dangerous.
+    size = grid.get_size()
+    left = max(min(player.get_x(), target.get_x()) - REPAIR_MARGIN, 0)
+    top = max(min(player.get_y(), target.get_y()) - REPAIR_MARGIN, 0)
+    right = min(max(player.get_x(), target.get_x()) + REPAIR_MARGIN, size - 1)
+    bottom = min(max(player.get_y(), target.get_y()) + REPAIR_MARGIN,
+                 size - 1)
+    local_size = max(right - left, bottom - top) + 3
+    zombies = bytearray(local_size * local_size)
+    closed = bytearray(b"\x01") * (local_size * local_size)
+    goals = set()
+    for y in range(top - 1, bottom + 2):
+        for x in range(left - 1, right + 2):
+            if not (0 <= x < size and 0 <= y < size):
+                continue
+            index = (y - top + 1) * local_size + x - left + 1
+            entity = grid.get_entity(Position(x, y))
+            if entity is not None and entity.display() in ZOMBIES:
+                zombies[index] = 1
+            elif left <= x <= right and top <= y <= bottom:
+                closed[index] = 0
+                if entity is not None and entity.display() == HOSPITAL:
+                    goals.add(index)
+    danger = bytearray(danger_cells(zombies, local_size))
+
+    def local(position: Position) -> int:
+        return ((position.get_y() - top + 1) * local_size
+                + position.get_x() - left + 1)
+
+    heading = local(target)
+    goals.add(heading)
+    for goal in goals:
+        danger[goal] = 0
+    detour = search(local_size, local(player), goals, heading, closed, danger)
+    if detour is None:
+        return None
+    repaired = [Position(index % local_size + left - 1,
+                         index // local_size + top - 1) for index in detour]
+    if not detour or detour[-1] == heading:
+        repaired.extend(route[rejoin + 1:])
+    return repaired
+
+
+def direction_of(start: Position, end: Position) -> str:
+    """
+    Return the direction to move in to get from a position to a neighbouring
+    position.
+
+    Parameters:
+        start: The position to move from.
+        end: The neighbouring position to move to.
+    """
+    offset = (end.get_x() - start.get_x(), end.get_y() - start.get_y())
+    return {(0, -1): UP, (0, 1): DOWN, (-1, 0): LEFT, (1, 0): RIGHT}[offset]
+
+
+class Autopilot:
+    """
+    An Autopilot is an action source which walks the player to the nearest
+    hospital along a planned route, waiting in place while every route is
+    blocked.
+
+    Examples:
+        >>> grid = Grid(3)
+        >>> grid.add_entity(Position(0, 0), HoldingPlayer())
+        >>> grid.add_entity(Position(2, 2), Hospital())
+        >>> game = AdvancedGame(grid, seed=0)
+        >>> autopilot = Autopilot()
+        >>> actions = []
+        >>> while not game.has_won():
+        ...     actions.append(autopilot(game))
+        ...     game.move_player(game.direction_to_offset(actions[-1]))
+        >>> actions, autopilot.get_plans()
+        (['D', 'D', 'S', 'S'], 1)
+    """
+
+    def __init__(self):
+        self._grid: Optional[Grid] = None
+        self._cursor: Optional[JournalCursor] = None
+        self._route: List[Position] = []
+        self._plans = 0
+        self._repairs = 0
+
+    def get_plans(self) -> int:
+        """Return the number of routes planned so far."""
+        return self._plans
+
+    def get_repairs(self) -> int:
+        """Return the number of routes repaired so far."""
+        return self._repairs
+
+    def get_route(self) -> List[Position]:
+        """Return the rest of the route being followed."""
+        return list(self._route)
+
+    def __call__(self, game: Game) -> str:
+        """
+        Return the direction to move in next, or an empty action to wait.
+
+        Parameters:
+            game: The game being played.
+        """
+        grid = game.get_grid()
+        if grid is not self._grid:
+            self.close()
+            self._grid = grid
+            self._cursor = grid.enable_journal().open_cursor()
+            self._replan()
+        elif self._needs_plan(grid):
+            self._repair()
+
+        player = grid.find_player()
+        if not self._route or player is None:
+            return ""
+        return direction_of(player, self._route[0])
+
+    def _needs_plan(self, grid: Grid) -> bool:
+        """
+        Return true if the route has to be repaired or planned again, and
+        drop the part of the route the player has walked.
+        """
+        player = grid.find_player()
+        entries = self._cursor.pull()
+        if not self._route or player != self._route[0]:
+            # The route is blocked, or the player did not move along it.
+            return True
+        self._route.pop(0)
+        if len(self._route) >= WATCH_CELLS:
+            # The cell coming into view is checked directly, as zombies may
+            # have moved onto it unwatched.
+            entity = grid.get_entity(self._route[WATCH_CELLS - 1])
+            if entity is not None and entity.display() in ZOMBIES:
+                return True
+
+        size = grid.get_size()
+        neighbours = neighbour_table(size)
+        ahead = {position.get_y() * size + position.get_x()
+                 for position in self._route[:WATCH_CELLS]}
+        for entry in entries:
+            if entry.token not in ZOMBIES or entry.end is None:
+                continue
+            index = entry.end.get_y() * size + entry.end.get_x()
+            if index in ahead or not ahead.isdisjoint(neighbours[index]):
+                return True
+        return False
+
+    def _repair(self) -> None:
+        """Repair the route, or plan a new route if it cannot be repaired."""
+        route = repair_route(self._grid, self._route)
+        if route is None:
+            self._replan()
+        else:
+            self._repairs += 1
+            self._route = route
+
+    def _replan(self) -> None:
+        """Plan a new route."""
+        self._plans += 1
+        self._route = plan_route(self._grid) or []
+
+    def close(self) -> None:
+        """Stop reading the journal of the grid being played."""
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+        self._grid = None
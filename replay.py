@@ -0,0 +1,273 @@
+"""
+Recording play sessions as action logs, and replaying them headless.
+
+A Recorder logs the seed of every game played and every action taken by
+the player, as the interfaces see them, together with a hash of the game's
+state when a game ends. Replaying a log plays the same games again without
+Tk, as fast as possible, and checks that every game ends in the same state.
+
+A log file holds one JSON value per line: a header with the map file,
+followed by the events. Every event is a list starting with its kind:
+
+* [RECORD_START, seed]: a new game of the map starts with the given seed.
+* [RECORD_ACTION, action]: a text interface action, see `apply_action`.
+* [RECORD_MOVE, direction]: the player moves, without stepping the game.
+* [RECORD_SHOT, x, y]: a crossbow bolt kills the zombie at (x, y).
+* [RECORD_SELECT, index]: the inventory item at the index is clicked, and
+  a time machine clicked is used.
+* [RECORD_TOGGLE, index]: the inventory item at the index is clicked, in an
+  interface where clicking an item only toggles it.
+* [RECORD_STEP]: the game steps.
+* [RECORD_END, hash]: the game ends in the state with the given hash.
+
+Run with `python replay.py <log> ...` to replay and check logs. Play
+sessions are recorded with `python a3.py --record`.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from typing import IO, List, NamedTuple, Optional, Type
+
+from a2_solution import *
+from constants import *
+from headless import apply_action
+from history import History
+
+LOG_VERSION = 1
+
+
+def state_hash(game: Game) -> str:
+    """
+    Return a hash of the state of a game: its entities, counters and the
+    player's infection and inventory.
+
+    Parameters:
+        game: The game to hash.
+    """
+    player = game.get_player()
+    if isinstance(player, HoldingPlayer):
+        inventory = [(item.display(), item.get_lifetime(), item.is_active())
+                     for item in player.get_inventory().get_items()]
+    else:
+        inventory = []
+    infected = isinstance(player, VulnerablePlayer) and player.is_infected()
+    state = (sorted(game.get_grid().serialize().items()), game.get_steps(),
+             game.get_moves(), infected, inventory)
+    return hashlib.blake2b(repr(state).encode(), digest_size=16).hexdigest()
+
+
+class ActionLog(NamedTuple):
+    """The map file of a recorded session and the events recorded."""
+    map_file: str
+    events: List[list]
+
+
+def load_log(filename: str) -> ActionLog:
+    """
+    Read an action log file.
+
+    Parameters:
+        filename: Path of the log file.
+
+    Raises:
+        ValueError: If the file is not an action log of a supported version.
+    """
+    with open(filename) as log_file:
+        lines = [line for line in log_file if line.strip()]
+    if not lines:
+        raise ValueError(f"{filename} is empty")
+    header = json.loads(lines[0])
+    if not isinstance(header, dict) or header.get("version") != LOG_VERSION:
+        raise ValueError(f"{filename} is not an action log of version "
+                         f"{LOG_VERSION}")
+    return ActionLog(header["map"], [json.loads(line) for line in lines[1:]])
+
+
+class Recorder:
+    """
+    A Recorder keeps the events of a play session, and writes each event to
+    a log file as soon as it is recorded, if given one, so the log survives
+    the game crashing.
+
+    The Recorder remembers the game being played between `start` and
+    `finish`, so closing the Recorder mid-game records the end of that game.
+    """
+
+    def __init__(self, map_file: str, filename: Optional[str] = None):
+        """
+        Parameters:
+            map_file: Path of the map file the session plays.
+            filename: Path of the log file to write, if any.
+        """
+        self._map_file = map_file
+        self._events: List[list] = []
+        self._game: Optional[Game] = None
+        self._log_file: Optional[IO[str]] = None
+        if filename is not None:
+            self._log_file = open(filename, "w")
+            self._write({"map": map_file, "version": LOG_VERSION})
+
+    def _write(self, value: object) -> None:
+        self._log_file.write(json.dumps(value) + "\n")
+        self._log_file.flush()
+
+    def record(self, kind: str, *arguments) -> None:
+        """
+        Record an event.
+
+        Parameters:
+            kind: The kind of event, one of the RECORD_ constants.
+            arguments: The arguments of the event.
+        """
+        event = [kind, *arguments]
+        self._events.append(event)
+        if self._log_file is not None:
+            self._write(event)
+
+    def start(self, game: Game) -> None:
+        """
+        Record the start of a new game, and the end of the game being
+        played, if any.
+
+        Parameters:
+            game: The game starting.
+        """
+        if self._game is not None:
+            self.finish(self._game)
+        self.record(RECORD_START, game.get_seed())
+        self._game = game
+
+    def finish(self, game: Game) -> None:
+        """
+        Record the end of a game, with the hash of its state, unless its end
+        is already recorded.
+
+        Parameters:
+            game: The game ending.
+        """
+        if game is self._game:
+            self.record(RECORD_END, state_hash(game))
+            self._game = None
+
+    def get_log(self) -> ActionLog:
+        """Return the log of the events recorded so far."""
+        return ActionLog(self._map_file, list(self._events))
+
+    def close(self) -> None:
+        """
+        Record the end of the game being played, if any, and close the log
+        file, if any.
+        """
+        if self._game is not None:
+            self.finish(self._game)
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+
+class ReplayResult(NamedTuple):
+    """
+    The outcome of replaying a log: the number of games and events played,
+    the indices of the end events whose state did not match, the last game
+    played and how long the replay took.
+    """
+    games: int
+    events: int
+    mismatches: List[int]
+    game: Optional[Game]
+    elapsed: float
+
+
+def replay(log: ActionLog, grid_class: Type[Grid] = Grid) -> ReplayResult:
+    """
+    Play the games of an action log again, checking the state of every game
+    that ended against the hash recorded for it.
+
+    Examples:
+        >>> recorder = Recorder("maps/basic3.txt")
+        >>> game = advanced_game("maps/basic3.txt", seed=7)
+        >>> recorder.start(game)
+        >>> for action in (RIGHT, DOWN, DOWN):
+        ...     recorder.record(RECORD_ACTION, action)
+        ...     apply_action(game, action)
+        >>> recorder.finish(game)
+        >>> result = replay(recorder.get_log())
+        >>> result.games, result.events, result.mismatches
+        (1, 5, [])
+
+    Parameters:
+        log: The action log to replay.
+        grid_class: The Grid implementation to load the map into.
+    """
+    started = time.perf_counter()
+    game: Optional[Game] = None
+    history: Optional[History] = None
+    games = 0
+    mismatches = []
+    for index, event in enumerate(log.events):
+        kind = event[0]
+        if kind == RECORD_START:
+            if history is not None:
+                history.close()
+            game = advanced_game(log.map_file, grid_class, seed=event[1])
+            history = History(game, HISTORY_DEPTH)
+            games += 1
+        elif kind == RECORD_ACTION:
+            apply_action(game, event[1])
+        elif kind == RECORD_MOVE:
+            history.checkpoint()
+            game.move_player(game.direction_to_offset(event[1]))
+        elif kind == RECORD_SHOT:
+            game.get_grid().remove_entity(Position(event[1], event[2]))
+        elif kind == RECORD_TOGGLE:
+            game.get_player().get_inventory().select(event[1])
+        elif kind == RECORD_SELECT:
+            item = game.get_player().get_inventory().select(event[1])
+            # Using the time machine early restarts the game, which is
+            # recorded as the start of the next game.
+            if item.display() == TIME_MACHINE \
+                    and game.get_moves() > TIME_MACHINE_MOVES:
+                history.rewind(TIME_MACHINE_MOVES)
+                remove_time_machines(game)
+        elif kind == RECORD_STEP:
+            game.step()
+        elif kind == RECORD_END:
+            if state_hash(game) != event[1]:
+                mismatches.append(index)
+        else:
+            raise ValueError(f"Unknown event {event!r}")
+    if history is not None:
+        history.close()
+    return ReplayResult(games, len(log.events), mismatches, game,
+                        time.perf_counter() - started)
+
+
+def main() -> None:
+    """Replay the logs given on the command line."""
+    parser = argparse.ArgumentParser(
+        description="Replay action logs and check the games end the same.")
+    parser.add_argument("logs", nargs="+", help="the log files to replay")
+    arguments = parser.parse_args()
+
+    games = events = failed = 0
+    elapsed = 0.0
+    for filename in arguments.logs:
+        result = replay(load_log(filename))
+        games += result.games
+        events += result.events
+        elapsed += result.elapsed
+        if result.mismatches:
+            failed += 1
+            print(f"{filename}: state differs at events {result.mismatches}")
+
+    print(f"{len(arguments.logs)} logs, {games} games, {events} events in "
+          f"{elapsed:.3f}s ({events / max(elapsed, 1e-9):.0f} events/s), "
+          f"{failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
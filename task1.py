@@ -2,9 +2,11 @@
 
 from model_class import BasicMap, InventoryView
 from a2_solution import Position, Game, Inventory, Garlic, Crossbow, HoldingPlayer, first_in_direction, advanced_game
+from replay import Recorder
 import tkinter as tk
 from tkinter import messagebox
 from constants import *
+from typing import Optional
 
 
 class BasicGraphicalInterface:
@@ -27,7 +29,7 @@ class BasicGraphicalInterface:
                                 *******************************************************
     """
 
-    def __init__(self, root, size: int) -> None:
+    def __init__(self, root, size: int, recorder: Optional[Recorder] = None) -> None:
         """
         The parameter root represents the root window and size represents the number of rows (= number of columns)
         in the game map. This method draw the title label, and instantiate and pack the BasicMap and InventoryView.
@@ -35,6 +37,7 @@ class BasicGraphicalInterface:
         Parameters:
             root: The root of the window.
             size: The size of the basic map.
+            recorder: The recorder to record the play session with, if any. It is closed with the window.
         """
         self._root = root
         self._size = size
@@ -74,6 +77,30 @@ class BasicGraphicalInterface:
         self._inventory_frame.pack(side=tk.RIGHT)
         self._basic_map = BasicMap(self._map_frame, size)
         self._inventory_view = InventoryView(self._inventory_frame, size)
+        self._recorder = recorder
+        if recorder is not None:
+            self._root.bind("<Destroy>", self._root_destroyed, add="+")
+
+    def _root_destroyed(self, event) -> None:
+        """
+        Close the recorder when the root window is destroyed, however the window is closed.
+
+        Parameters:
+            event: <Destroy> event, reported for the root window and each of its children.
+        """
+        if event.widget is self._root:
+            self._recorder.close()
+
+    def _record(self, kind: str, *arguments) -> None:
+        """
+        Record an event of the play session, if it is being recorded.
+
+        Parameters:
+            kind: The kind of event, one of the RECORD_ constants.
+            arguments: The arguments of the event.
+        """
+        if self._recorder is not None:
+            self._recorder.record(kind, *arguments)
 
     def handler_adaptor(self, fun, **kwargs) -> None:
         """
@@ -98,13 +125,8 @@ class BasicGraphicalInterface:
         position = self._inventory_view.pixel_to_position(Position(pixel_x, pixel_y))
         row_index = position.get_y()
         if row_index > 0 and row_index <= len(inventory.get_items()):
-            item = inventory.get_items()[row_index - 1]
-            if not item.is_active():
-                for active_item in inventory.get_items():
-                    if active_item.is_active():
-                        active_item.toggle_active()
-                        break
-            item.toggle_active()
+            self._record(RECORD_TOGGLE, row_index - 1)
+            inventory.select(row_index - 1)
         self._inventory_view.draw(inventory)
 
     def _key_press(self, event, game: Game) -> None:
@@ -146,19 +168,10 @@ class BasicGraphicalInterface:
         """
         draw entity
         """
-        self._basic_map._basic_map_canvas.delete("all")
-        mapping = game.get_grid().serialize()
-        size = self._size
-
-        for y in range(size):
-            for x in range(size):
-                tile = mapping.get((x, y), " ") or " "
-                if tile is not " ":
-                    self._basic_map.draw_entity(Position(x, y), tile)
+        self._basic_map.render(game.get_grid())
         """
         draw inventory
         """
-        self._inventory_view._inventory_view_canvas.delete("pickup")
         self._inventory_view.draw(game.get_player().get_inventory())
 
     def _move(self, game: Game, direction: str) -> None:
@@ -170,10 +183,13 @@ class BasicGraphicalInterface:
             direction: The direction which the player will move to.
         """
         new_position = game.direction_to_offset(direction)
+        self._record(RECORD_MOVE, direction)
         game.move_player(new_position)
         self.draw(game)
         self._basic_map._basic_map_canvas.update()
         if not game.has_lost() and game.has_won():
+            if self._recorder is not None:
+                self._recorder.finish(game)
             self._basic_map._basic_map_canvas.after_cancel(self._solve)
             if not messagebox.askyesno(WIN_MESSAGE, 'Play again?'):
                 self._root.quit()
@@ -228,6 +244,7 @@ class BasicGraphicalInterface:
                 # If the entity is a zombie, kill it.
                 if first is not None and first[1].display() in ZOMBIES:
                     position, entity = first
+                    self._record(RECORD_SHOT, position.get_x(), position.get_y())
                     game.get_grid().remove_entity(position)
                 break
         self.draw(game)
@@ -240,9 +257,12 @@ class BasicGraphicalInterface:
             game: The game that the player is playing.
         """
         game.step()
+        self._record(RECORD_STEP)
         self.draw(game)
         self._solve = self._basic_map._basic_map_canvas.after(1000, self._step, game)
         if not game.has_won() and game.has_lost():
+            if self._recorder is not None:
+                self._recorder.finish(game)
             self._basic_map._basic_map_canvas.after_cancel(self._solve)
             if not messagebox.askyesno(LOSE_MESSAGE, 'Play again?'):
                 self._root.quit()
@@ -258,6 +278,8 @@ class BasicGraphicalInterface:
         Parameters:
             game: The game that the player is playing.
         """
+        if self._recorder is not None:
+            self._recorder.start(game)
         self._inventory_view._inventory_view_canvas.bind("<Button-1>",
                                                          self.handler_adaptor(self._inventory_click,
                                                                               inventory=game.get_player().get_inventory()))
@@ -2,6 +2,7 @@
 
 from model_class import ImageMap, InventoryView, StatusBar
 from a2_solution import *
+from replay import Recorder
 from typing import Tuple, Optional, Dict, List
 import tkinter as tk
 from tkinter import messagebox
@@ -32,7 +33,7 @@ class ImageGraphicalInterface:
                                     *                  _status_bar_frame                 *
                                     *******************************************************
     """
-    def __init__(self, root, size: int) -> None:
+    def __init__(self, root, size: int, recorder: Optional[Recorder] = None) -> None:
         """
         The parameter root represents the root window and size represents the number of rows (= number of columns)
         in the game map. This method draw the title label, and instantiate and pack the BasicMap, InventoryView,
@@ -41,6 +42,7 @@ class ImageGraphicalInterface:
         Parameters:
             root: The root of the window.
             size: The size of the basic map.
+            recorder: The recorder to record the play session with, if any. It is closed with the window.
         """
         self._root = root
         self._size = size
@@ -105,6 +107,30 @@ class ImageGraphicalInterface:
         self._menubar.add_cascade(label="File", menu=self._filemenu)
 
         self._root.config(menu=self._menubar)
+        self._recorder = recorder
+        if recorder is not None:
+            self._root.bind("<Destroy>", self._root_destroyed, add="+")
+
+    def _root_destroyed(self, event) -> None:
+        """
+        Close the recorder when the root window is destroyed, however the window is closed.
+
+        Parameters:
+            event: <Destroy> event, reported for the root window and each of its children.
+        """
+        if event.widget is self._root:
+            self._recorder.close()
+
+    def _record(self, kind: str, *arguments) -> None:
+        """
+        Record an event of the play session, if it is being recorded.
+
+        Parameters:
+            kind: The kind of event, one of the RECORD_ constants.
+            arguments: The arguments of the event.
+        """
+        if self._recorder is not None:
+            self._recorder.record(kind, *arguments)
 
     def handler_adaptor(self, fun, **kwargs) -> None:
         """
@@ -129,13 +155,8 @@ class ImageGraphicalInterface:
         position = self._inventory_view.pixel_to_position(Position(pixel_x, pixel_y))
         row_index = position.get_y()
         if row_index > 0 and row_index <= len(inventory.get_items()):
-            item = inventory.get_items()[row_index - 1]
-            if not item.is_active():
-                for active_item in inventory.get_items():
-                    if active_item.is_active():
-                        active_item.toggle_active()
-                        break
-            item.toggle_active()
+            self._record(RECORD_TOGGLE, row_index - 1)
+            inventory.select(row_index - 1)
         self._inventory_view.draw(inventory)
 
     def _key_press(self, event, game: Game) -> None:
@@ -177,20 +198,11 @@ class ImageGraphicalInterface:
         """
         draw entity
         """
-        self._basic_map._basic_map_canvas.delete("entity")
-        mapping = game.get_grid().serialize()
-        size = self._size
-
-        for y in range(size):
-            for x in range(size):
-                tile = mapping.get((x, y), " ") or " "
-                if tile is not " ":
-                    self._basic_map.draw_entity(Position(x, y), tile)
+        self._basic_map.render(game.get_grid())
 
         """
         draw inventory
         """
-        self._inventory_view._inventory_view_canvas.delete("pickup")
         self._inventory_view.draw(game.get_player().get_inventory())
 
     def _move(self, game: Game, direction: str) -> None:
@@ -202,11 +214,14 @@ class ImageGraphicalInterface:
             direction: The direction which the player will move to.
         """
         new_position = game.direction_to_offset(direction)
+        self._record(RECORD_MOVE, direction)
         game.move_player(new_position)
         self._status_bar.change_move(game.get_moves())
         self.draw(game)
         self._basic_map._basic_map_canvas.update()
         if not game.has_lost() and game.has_won():
+            if self._recorder is not None:
+                self._recorder.finish(game)
             self._basic_map._basic_map_canvas.after_cancel(self._solve)
             score = game.get_steps()
             score_minute = int(score // 60)
@@ -287,6 +302,7 @@ class ImageGraphicalInterface:
                 # If the entity is a zombie, kill it.
                 if first is not None and first[1].display() in ZOMBIES:
                     position, entity = first
+                    self._record(RECORD_SHOT, position.get_x(), position.get_y())
                     game.get_grid().remove_entity(position)
                 break
         self.draw(game)
@@ -299,10 +315,13 @@ class ImageGraphicalInterface:
             game: The game that the player is playing.
         """
         game.step()
+        self._record(RECORD_STEP)
         self._status_bar.change_timer(game.get_steps())
         self.draw(game)
         self._solve = self._basic_map._basic_map_canvas.after(1000, self._step, game)
         if not game.has_won() and game.has_lost():
+            if self._recorder is not None:
+                self._recorder.finish(game)
             self._basic_map._basic_map_canvas.after_cancel(self._solve)
             score = game.get_steps()
             score_minute = int(score // 60)
@@ -327,6 +346,8 @@ class ImageGraphicalInterface:
             game: The game that the player is playing.
         """
         self._game = game
+        if self._recorder is not None:
+            self._recorder.start(game)
         self._inventory_view._inventory_view_canvas.bind("<Button-1>",
                                                          self.handler_adaptor(self._inventory_click,
                                                                               inventory=game.get_player().get_inventory()))
@@ -341,6 +362,8 @@ class ImageGraphicalInterface:
         This method can quit the game.
         """
         self._basic_map._basic_map_canvas.after_cancel(self._solve)
+        if self._recorder is not None:
+            self._recorder.close()
         self._root.quit()
 
     def restart(self) -> None:
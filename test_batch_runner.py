@@ -0,0 +1,78 @@
+"""
+Tests for playing batches of headless games over a pool of processes.
+"""
+
+import pytest
+
+from batch_runner import RunningStats, Summary, make_jobs, run_batch
+
+MAPS = ["maps/basic2.txt", "maps/basic4.txt"]
+POLICIES = ["random", "autopilot"]
+
+
+def results(summaries):
+    """Return everything summarised apart from the play time."""
+    return {key: (summary.get_outcomes(),
+                  [(stats.get_count(), stats.get_mean(), stats.get_variance(),
+                    stats.get_min(), stats.get_max())
+                   for stats in map(summary.get_stats,
+                                    ("steps", "moves", "uses"))])
+            for key, summary in summaries.items()}
+
+
+@pytest.fixture(scope="module")
+def serial():
+    jobs = make_jobs(MAPS, range(50), POLICIES)
+    return run_batch(jobs, processes=1, chunk_size=16)
+
+
+def test_serial_batch_plays_every_job(serial):
+    assert sorted(serial) == sorted((map_file, policy) for map_file in MAPS
+                                    for policy in POLICIES)
+    assert all(summary.get_games() == 50 for summary in serial.values())
+
+
+@pytest.mark.parametrize("processes", [2, 3])
+def test_pooled_batch_matches_serial(serial, processes):
+    jobs = make_jobs(MAPS, range(50), POLICIES)
+    pooled = run_batch(jobs, processes=processes, chunk_size=16)
+    assert results(pooled) == results(serial)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_chunk_size_does_not_change_results(serial, chunk_size):
+    jobs = make_jobs(MAPS, range(50), POLICIES)
+    chunked = results(run_batch(jobs, processes=1, chunk_size=chunk_size))
+    expected = results(serial)
+    assert chunked.keys() == expected.keys()
+    for key, (outcomes, stats) in chunked.items():
+        # Merging chunks of other sizes sums in another order.
+        assert outcomes == expected[key][0]
+        for actual, wanted in zip(stats, expected[key][1]):
+            assert actual == pytest.approx(wanted)
+
+
+def test_merged_stats_match_stats_of_all_values():
+    values = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+    whole = RunningStats()
+    parts = [RunningStats() for _ in range(3)]
+    for index, value in enumerate(values):
+        whole.add(value)
+        parts[index % 3].add(value)
+    merged = RunningStats()
+    for part in parts + [RunningStats()]:
+        merged.merge(part)
+    assert merged.get_count() == whole.get_count()
+    assert merged.get_mean() == pytest.approx(whole.get_mean())
+    assert merged.get_variance() == pytest.approx(whole.get_variance())
+    assert (merged.get_min(), merged.get_max()) == (1, 9)
+
+
+def test_summary_merge_adds_outcomes():
+    first, second = Summary(), Summary()
+    first.add("won", 3, 2, 0, 0.1)
+    second.add("won", 5, 4, 1, 0.2)
+    second.add("lost", 1, 1, 0, 0.1)
+    first.merge(second)
+    assert first.get_outcomes() == {"won": 2, "lost": 1}
+    assert first.get_stats("uses").get_max() == 1
@@ -0,0 +1,63 @@
+"""
+Tests for converting text map files into binary map files and reading them
+back.
+"""
+
+import os
+
+import pytest
+
+from a2_solution import AdvancedMapLoader, MapFile, load_map
+from binary_map import convert_text_map, read_binary_map, write_binary_map
+
+MAPS = sorted(os.listdir("maps"))
+
+
+@pytest.mark.parametrize("name", MAPS)
+def test_converted_map_round_trips(tmp_path, name):
+    source = os.path.join("maps", name)
+    destination = str(tmp_path / (name + ".bin"))
+    convert_text_map(source, destination)
+
+    binary = read_binary_map(destination)
+    with MapFile(source) as map_file:
+        assert list(binary.entities()) == list(map_file.entities())
+    assert binary.get_size() == load_map(source)[1]
+
+    loader = AdvancedMapLoader()
+    assert (loader.load(destination).serialize()
+            == loader.load(source).serialize())
+
+
+@pytest.mark.parametrize("name", MAPS)
+def test_counts_match_entities(tmp_path, name):
+    destination = str(tmp_path / (name + ".bin"))
+    convert_text_map(os.path.join("maps", name), destination)
+
+    binary = read_binary_map(destination)
+    tokens = [token for _, _, token in binary.entities()]
+    assert binary.get_counts() == {token: tokens.count(token)
+                                   for token in set(tokens)}
+
+
+def test_entities_out_of_bounds_are_left_out(tmp_path):
+    destination = str(tmp_path / "small.map")
+    write_binary_map(destination, 2, [(0, 0, "P"), (2, 0, "Z"), (1, 1, "H")])
+    assert list(read_binary_map(destination).entities()) == [(0, 0, "P"),
+                                                             (1, 1, "H")]
+
+
+def test_text_map_is_not_a_binary_map():
+    with pytest.raises(ValueError, match="not a binary map file"):
+        read_binary_map("maps/basic.txt")
+
+
+def test_truncated_map_is_rejected(tmp_path):
+    destination = str(tmp_path / "basic.map")
+    convert_text_map("maps/basic.txt", destination)
+    with open(destination, "rb") as map_file:
+        contents = map_file.read()
+    with open(destination, "wb") as map_file:
+        map_file.write(contents[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        read_binary_map(destination)
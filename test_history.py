@@ -0,0 +1,66 @@
+"""
+Tests for rewinding random games with History.
+"""
+
+import random
+
+import pytest
+
+from a2_solution import DenseGrid, Grid, advanced_game, fire_crossbow
+from constants import DIRECTIONS
+from history import History
+
+
+def game_state(game):
+    player = game.get_player()
+    items = player.get_inventory().get_items()
+    return (game.get_grid().serialize(), game.get_steps(), game.get_moves(),
+            player.is_infected(),
+            [(repr(item), item.is_active()) for item in items])
+
+
+def play(game, history, rng, moves):
+    """
+    Make random moves, item toggles, shots and steps, checkpointing before
+    every move. Returns the state of the game at every checkpoint.
+    """
+    states = []
+    for _ in range(moves):
+        history.checkpoint()
+        states.append(game_state(game))
+        direction = rng.choice(DIRECTIONS)
+        game.move_player(game.direction_to_offset(direction))
+        items = game.get_player().get_inventory().get_items()
+        if items and rng.random() < 0.5:
+            rng.choice(items).toggle_active()
+        fire_crossbow(game, direction)
+        for _ in range(rng.randrange(3)):
+            game.step()
+    return states
+
+
+@pytest.mark.parametrize("grid_class", [Grid, DenseGrid])
+@pytest.mark.parametrize("seed", range(10))
+def test_rewind_restores_checkpoints(grid_class, seed):
+    game = advanced_game("maps/basic4.txt", grid_class, seed=seed)
+    history = History(game, depth=10)
+    states = play(game, history, random.Random(seed), 12)
+
+    assert history.rewind(4) == 4
+    assert game_state(game) == states[-4]
+    # Only the last 10 of the 12 checkpoints are kept.
+    assert history.rewind(20) == 6
+    assert game_state(game) == states[2]
+    assert history.get_frame_count() == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rewind_one_frame_at_a_time(seed):
+    game = advanced_game("maps/basic5.txt", seed=seed)
+    history = History(game)
+    states = play(game, history, random.Random(seed), 8)
+
+    for state in reversed(states):
+        assert history.rewind() == 1
+        assert game_state(game) == state
+    assert history.rewind() == 0
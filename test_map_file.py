@@ -0,0 +1,51 @@
+"""
+Tests for reading text and binary map files through MapFile and MapLoader.
+"""
+
+import pytest
+
+from a2_solution import (AdvancedMapLoader, BasicMapLoader, MapFile,
+                         load_map)
+from binary_map import convert_text_map
+
+
+def write_map(directory, text: str) -> str:
+    path = directory / "map.txt"
+    path.write_text(text)
+    return str(path)
+
+
+def test_unrecognised_entity_raises_value_error(tmp_path):
+    filename = write_map(tmp_path, "P  \nQ H\n   \n")
+    with pytest.raises(ValueError, match="Unrecognised entity 'Q'"):
+        BasicMapLoader().load(filename)
+
+
+def test_file_closes_while_reading_entities(tmp_path):
+    filename = write_map(tmp_path, "P  \n H \n  H\n")
+    with MapFile(filename) as map_file:
+        entities = map_file.entities()
+        assert next(entities) == (0, 0, "P")
+    assert map_file.get_height() == 3
+
+
+def test_trailing_spaces_do_not_count_toward_size(tmp_path):
+    filename = write_map(tmp_path, "P  \n H          \n  H\n")
+    with MapFile(filename) as map_file:
+        assert (map_file.get_size(), map_file.get_width()) == (3, 3)
+    assert BasicMapLoader().load(filename).get_size() == 3
+
+
+def test_size_is_line_count_as_in_load_map(tmp_path):
+    filename = write_map(tmp_path, "P\n\nH    Z\n")
+    grid = AdvancedMapLoader().load(filename)
+    assert grid.get_size() == load_map(filename)[1] == 3
+    assert grid.serialize() == {(0, 0): "P", (0, 2): "H"}
+
+
+def test_binary_map_loads_like_text_map(tmp_path):
+    binary = str(tmp_path / "basic2.map")
+    convert_text_map("maps/basic2.txt", binary)
+    loader = AdvancedMapLoader()
+    assert (loader.load(binary).serialize()
+            == loader.load("maps/basic2.txt").serialize())
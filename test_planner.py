@@ -0,0 +1,95 @@
+"""
+Tests for planning and repairing routes to the hospital on random maps.
+"""
+
+import random
+
+import pytest
+
+from a2_solution import DenseGrid, Grid, Hospital, Player, Position, Zombie
+from constants import *
+from map_generator import generate_grid
+from planner import DANGER_COST, danger_cells, plan_route, repair_route
+
+DENSITIES = [0.05, 0.2, 0.4]
+
+
+def is_zombie(grid, position):
+    entity = grid.get_entity(position)
+    return entity is not None and entity.display() in ZOMBIES
+
+
+def assert_walk(grid, route):
+    """Assert the route walks from the player to a hospital around zombies."""
+    cells = [grid.find_player()] + route
+    for start, end in zip(cells, cells[1:]):
+        assert start.distance(end) == 1
+    assert not any(is_zombie(grid, position) for position in route)
+    assert grid.get_entity(route[-1]).display() == HOSPITAL
+
+
+def reaches_hospital(grid):
+    """Return true if a hospital can be walked to without meeting a zombie."""
+    seen = {grid.find_player()}
+    unvisited = list(seen)
+    while unvisited:
+        position = unvisited.pop()
+        for offset in OFFSETS:
+            cell = position.add(Position(*offset))
+            if (grid.in_bounds(cell) and cell not in seen
+                    and not is_zombie(grid, cell)):
+                seen.add(cell)
+                unvisited.append(cell)
+    return any(cell in seen for cell in grid.find_entities(HOSPITAL))
+
+
+@pytest.mark.parametrize("grid_class", [Grid, DenseGrid])
+@pytest.mark.parametrize("density", DENSITIES)
+@pytest.mark.parametrize("seed", range(20))
+def test_route_found_exactly_when_hospital_reachable(grid_class, density,
+                                                     seed):
+    grid = generate_grid(30, grid_class, zombies=density, garlic=0,
+                         crossbows=0, seed=seed)
+    route = plan_route(grid)
+    assert (route is not None) == reaches_hospital(grid)
+    if route is not None:
+        assert_walk(grid, route)
+
+
+@pytest.mark.parametrize("density", DENSITIES)
+@pytest.mark.parametrize("seed", range(20))
+def test_repaired_route_avoids_new_zombie(density, seed):
+    grid = generate_grid(30, zombies=density, garlic=0, crossbows=0,
+                         seed=seed)
+    route = plan_route(grid)
+    if route is None or len(route) < 3:
+        pytest.skip("no route long enough to block")
+    grid.add_entity(route[0], Zombie())
+    repaired = repair_route(grid, route)
+    if repaired is not None:
+        assert_walk(grid, repaired)
+
+
+@pytest.mark.parametrize("ahead", range(1, 9))
+def test_repair_after_moving_along_route(ahead):
+    grid = Grid(10)
+    grid.add_entity(Position(0, 0), Player())
+    grid.add_entity(Position(9, 0), Hospital())
+    route = plan_route(grid)
+    grid.move_entity(Position(0, 0), route[ahead - 1])
+    repaired = repair_route(grid, route)
+    assert repaired == route[ahead:]
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 9])
+@pytest.mark.parametrize("seed", range(5))
+def test_danger_cells_mark_neighbours_of_zombies(size, seed):
+    rng = random.Random(seed)
+    zombies = bytes(rng.random() < 0.2 for _ in range(size * size))
+    danger = danger_cells(zombies, size)
+    for index in range(size * size):
+        y, x = divmod(index, size)
+        near = any(zombies[(y + dy) * size + x + dx]
+                   for dx, dy in OFFSETS
+                   if 0 <= x + dx < size and 0 <= y + dy < size)
+        assert danger[index] == (DANGER_COST if near else 0)
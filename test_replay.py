@@ -0,0 +1,121 @@
+"""
+Tests for recording play sessions and replaying them headless.
+"""
+
+import builtins
+import random
+
+import pytest
+
+import a2_solution
+from a2_solution import (AdvancedTextInterface, DenseGrid, Grid,
+                         advanced_game, remove_time_machines)
+from constants import *
+from history import History
+from replay import ActionLog, Recorder, load_log, replay
+
+MAP_FILE = "maps/basic5.txt"
+
+
+def play_session(seed, filename):
+    """
+    Play random events as the graphical interfaces do, with the time machine
+    rewinding or restarting games, recording them to a log file.
+    """
+    rng = random.Random(seed)
+    recorder = Recorder(MAP_FILE, filename)
+    game = advanced_game(MAP_FILE, seed=seed)
+    history = History(game)
+    recorder.start(game)
+    for _ in range(80):
+        inventory = game.get_player().get_inventory()
+        items = len(inventory.get_items())
+        zombies = list(game.get_grid().find_entities(ZOMBIE))
+        chance = rng.random()
+        restart = False
+        if chance < 0.4:
+            direction = rng.choice(DIRECTIONS)
+            recorder.record(RECORD_MOVE, direction)
+            history.checkpoint()
+            game.move_player(game.direction_to_offset(direction))
+        elif chance < 0.5 and items:
+            index = rng.randrange(items)
+            recorder.record(RECORD_TOGGLE, index)
+            inventory.select(index)
+        elif chance < 0.6 and items:
+            index = rng.randrange(items)
+            recorder.record(RECORD_SELECT, index)
+            if inventory.select(index).display() == TIME_MACHINE:
+                if game.get_moves() > TIME_MACHINE_MOVES:
+                    history.rewind(TIME_MACHINE_MOVES)
+                    remove_time_machines(game)
+                else:
+                    restart = True
+        elif chance < 0.65 and zombies:
+            shot = zombies[0]
+            recorder.record(RECORD_SHOT, shot.get_x(), shot.get_y())
+            game.get_grid().remove_entity(shot)
+        else:
+            game.step()
+            recorder.record(RECORD_STEP)
+        if restart or game.has_won() or game.has_lost():
+            recorder.finish(game)
+            history.close()
+            game = advanced_game(MAP_FILE, seed=rng.randrange(1000))
+            history = History(game)
+            recorder.start(game)
+    recorder.close()
+    return load_log(filename)
+
+
+@pytest.mark.parametrize("grid_class", [Grid, DenseGrid])
+@pytest.mark.parametrize("seed", range(20))
+def test_session_replays_to_same_states(tmp_path, grid_class, seed):
+    log = play_session(seed, str(tmp_path / "session.log"))
+    ends = [event for event in log.events if event[0] == RECORD_END]
+    result = replay(log, grid_class)
+    assert result.games == len(ends) > 0
+    assert result.mismatches == []
+
+
+def test_missing_event_is_a_mismatch(tmp_path):
+    log = play_session(0, str(tmp_path / "session.log"))
+    step = log.events.index([RECORD_STEP])
+    tampered = ActionLog(log.map_file,
+                         log.events[:step] + log.events[step + 1:])
+    assert replay(tampered).mismatches
+
+
+def answer(monkeypatch, answers):
+    """Answer every prompt for input with the given answers in turn."""
+    answers = iter(answers)
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_text_interface_session_replays(monkeypatch, seed):
+    rng = random.Random(seed)
+    answer(monkeypatch, [rng.choice([UP, LEFT, DOWN, RIGHT, FIRE,
+                                     FIRE + UP, FIRE + RIGHT])
+                         for _ in range(1000)])
+    recorder = Recorder("maps/basic4.txt")
+    app = AdvancedTextInterface(10)
+    app.set_recorder(recorder)
+    app.play(advanced_game("maps/basic4.txt", seed=seed))
+    recorder.close()
+
+    result = replay(recorder.get_log())
+    assert (result.games, result.mismatches) == (1, [])
+
+
+def test_main_records_to_log_file(monkeypatch, tmp_path):
+    filename = str(tmp_path / "session.log")
+    monkeypatch.setattr("sys.argv", ["a2_solution.py", "--record", filename])
+    answer(monkeypatch, ["maps/basic.txt", RIGHT, DOWN, RIGHT, DOWN, DOWN,
+                         RIGHT, RIGHT])
+    a2_solution.main()
+
+    log = load_log(filename)
+    assert log.map_file == "maps/basic.txt"
+    assert log.events[1] == [RECORD_ACTION, RIGHT]
+    assert replay(log).mismatches == []